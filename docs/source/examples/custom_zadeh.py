@@ -1,8 +1,9 @@
 from yvain.logical_systems import LogicalSystem
-from yvain.membership_functions import MembershipFunction
+from yvain.membership_functions import Numeric
+
+import numpy as np
 
 
 class MyZadeh(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
-        return lambda x: min(membership_a(x), membership_b(x))
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        return np.minimum(a, b)
@@ -10,8 +10,8 @@ if __name__ == '__main__':
     rancid = Trapezoid(-2, 0, 2, 4)
     delicious = Trapezoid(7, 9, 11, 13)
 
-    plt.plot(universe, [rancid(x) for x in universe], label="rancid")
-    plt.plot(universe, [delicious(x) for x in universe], label="delicious")
+    plt.plot(universe, rancid(universe), label="rancid")
+    plt.plot(universe, delicious(universe), label="delicious")
 
     plt.legend()
     plt.xlabel("x")
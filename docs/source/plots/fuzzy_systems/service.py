@@ -11,9 +11,9 @@ if __name__ == '__main__':
     good = Gaussian(5, 1.5)
     excellent = Gaussian(10, 1.5)
 
-    plt.plot(universe, [poor(x) for x in universe], label="poor")
-    plt.plot(universe, [good(x) for x in universe], label="good")
-    plt.plot(universe, [excellent(x) for x in universe], label="excellent")
+    plt.plot(universe, poor(universe), label="poor")
+    plt.plot(universe, good(universe), label="good")
+    plt.plot(universe, excellent(universe), label="excellent")
 
     plt.legend()
     plt.xlabel("x")
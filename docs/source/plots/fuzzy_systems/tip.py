@@ -11,9 +11,9 @@ if __name__ == '__main__':
     average = Triangle(7.5, 12.5, 17.5)
     generous = Triangle(15, 20, 25)
 
-    plt.plot(universe, [cheap(x) for x in universe], label="cheap")
-    plt.plot(universe, [average(x) for x in universe], label="average")
-    plt.plot(universe, [generous(x) for x in universe], label="generous")
+    plt.plot(universe, cheap(universe), label="cheap")
+    plt.plot(universe, average(universe), label="average")
+    plt.plot(universe, generous(universe), label="generous")
 
     plt.legend()
     plt.xlabel("x")
@@ -11,8 +11,8 @@ if __name__ == '__main__':
     mf_negated = logic.complement(mf)
 
     universe = np.linspace(0, 10, 1000)
-    plt.plot(universe, [mf(x) for x in universe], label="gaussian mf")
-    plt.plot(universe, [mf_negated(x) for x in universe], "--", label="complementary mf")
+    plt.plot(universe, mf(universe), label="gaussian mf")
+    plt.plot(universe, mf_negated(universe), "--", label="complementary mf")
 
     plt.xlabel("x")
     plt.ylabel(r"$\mu$(x)")
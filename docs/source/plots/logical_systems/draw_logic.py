@@ -14,11 +14,11 @@ def draw_system(logic, title):
 
     universe = np.linspace(0, 10, 1000)
 
-    plt.plot(universe, [mf1(x) for x in universe], "--")
-    plt.plot(universe, [mf2(x) for x in universe], "--")
-    plt.plot(universe, [mf3(x) for x in universe], "--")
-    plt.plot(universe, [mf1_or2_or3(x) for x in universe], label="T-Conorm")
-    plt.plot(universe, [mf1_and2_and3(x) for x in universe], label="T-Norm")
+    plt.plot(universe, mf1(universe), "--")
+    plt.plot(universe, mf2(universe), "--")
+    plt.plot(universe, mf3(universe), "--")
+    plt.plot(universe, mf1_or2_or3(universe), label="T-Conorm")
+    plt.plot(universe, mf1_and2_and3(universe), label="T-Norm")
 
     plt.xlabel("x")
     plt.ylabel(r"$\mu$(x)")
@@ -8,7 +8,7 @@ def draw_mf(mf: Callable[[float, ], float], start: float, end: float,
             title: str):
     universe = np.linspace(start, end, 1000)
 
-    plt.plot(universe, [mf(x) for x in universe])
+    plt.plot(universe, mf(universe))
 
     plt.xlabel("x")
     plt.ylabel(r"$\mu$(x)")
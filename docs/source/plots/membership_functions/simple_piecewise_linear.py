@@ -0,0 +1,8 @@
+from docs.source.plots.membership_functions.membership_plot import draw_mf
+from yvain.membership_functions import PiecewiseLinear
+import matplotlib.pyplot as plt
+
+if __name__ == '__main__':
+    xs, ys = [1, 2, 4, 5, 7, 9], [0, 0.4, 0.6, 1, 1, 0]
+    draw_mf(PiecewiseLinear(xs, ys), 0, 10, f"PiecewiseLinear(xs={xs}, ys={ys})")
+    plt.scatter(xs, ys, color="gray")
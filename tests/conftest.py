@@ -0,0 +1,74 @@
+from typing import Callable
+
+import pytest
+
+from yvain.fuzzy_system import MamdaniSystem, SugenoSystem, when, Linear
+from yvain.logical_systems import LogicalSystem, Zadeh
+from yvain.membership_functions import Gaussian, Trapezoid, Triangle
+
+
+def _tipping_system(logic: LogicalSystem = Zadeh()) -> MamdaniSystem:
+    system = MamdaniSystem.empty(logic)
+    system.add_input("service", {
+        "poor": Gaussian(0, 1.5),
+        "good": Gaussian(5, 1.5),
+        "excellent": Gaussian(10, 1.5),
+    })
+    system.add_input("food", {
+        "rancid": Trapezoid(-2, 0, 2, 4),
+        "delicious": Trapezoid(7, 9, 11, 13),
+    })
+
+    system.add_output("tip", {
+        "cheap": Triangle(0, 5, 10),
+        "average": Triangle(7.5, 12.5, 17.5),
+        "generous": Triangle(15, 20, 25),
+    })
+    system.add_rule(
+        when("service", "poor").or_is("food", "rancid").then("tip", "cheap")
+    )
+    system.add_rule(
+        when("service", "good").then("tip", "average")
+    )
+    system.add_rule(
+        when("service", "excellent").or_is("food", "delicious").then("tip", "generous")
+    )
+    return system
+
+
+def _linear_sugeno_system() -> SugenoSystem:
+    system = SugenoSystem.empty()
+    system.add_input("service", {
+        "poor": Triangle(-3, 0, 3),
+        "good": Triangle(1.5, 4.5, 7.5),
+        "excellent": Triangle(6, 9, 13),
+    })
+    system.add_input("food", {
+        "rancid": Trapezoid(-2, 0, 2, 4),
+        "delicious": Trapezoid(7, 9, 11, 13),
+    })
+    system.add_rule(when("service", "poor").or_is("food", "rancid").compute(
+        Linear(1, {"service": 0.5})))
+    system.add_rule(when("service", "good").compute(Linear(5, {"service": 1, "food": 0.5})))
+    system.add_rule(when("service", "excellent").and_is("food", "delicious").compute(
+        lambda values: values["service"] + values["food"]))
+    return system
+
+
+@pytest.fixture
+def tipping_system() -> Callable[..., MamdaniSystem]:
+    """
+    :return: Function building Mamdani system computing tip from service and food,
+             with logic given as argument
+    """
+
+    return _tipping_system
+
+
+@pytest.fixture
+def linear_sugeno_system() -> Callable[[], SugenoSystem]:
+    """
+    :return: Function building Sugeno system with `Linear` and plain python output functions
+    """
+
+    return _linear_sugeno_system
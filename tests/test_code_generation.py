@@ -0,0 +1,37 @@
+from yvain.code_generation import SourceBuilder
+from yvain.logical_systems import Zadeh, Product, Lukasiewicz
+from yvain.membership_functions import Triangle, Trapezoid, Gaussian, Bell, Sigmoid, \
+    PiecewiseLinear, Tabulated
+
+import pytest
+
+
+@pytest.mark.parametrize("function", [
+    Triangle(-1, 2, 4),
+    Trapezoid(0, 1, 3, 7),
+    Gaussian(2, 1.5),
+    Bell(1, 2, 3),
+    Sigmoid(2, -3),
+    PiecewiseLinear([-1, 0, 2.5, 4], [0, 0.4, 1, 0]),
+    Tabulated(Gaussian(2, 1.5), 0, 4, 101),
+])
+def test_inlined_membership_is_equal_to_function(function):
+    builder = SourceBuilder()
+    builder.line(f"return {builder.membership(function, 'x')}")
+    generated = builder.build("membership", ["x"])
+
+    for x in [-5, -1, -0.5, 0, 1, 2, 2.5, 3.3, 4, 7, 20]:
+        assert generated(x) == pytest.approx(function(x), abs=1e-9)
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Lukasiewicz()])
+def test_inlined_norms_are_equal_to_logic(logic):
+    builder = SourceBuilder()
+    t_norm = builder.t_norm(logic, ["a", "b", "c"])
+    t_conorm = builder.t_conorm(logic, ["a", "b", "c"])
+    builder.line(f"return {t_norm}, {t_conorm}")
+    generated = builder.build("norms", ["a", "b", "c"])
+
+    for a, b, c in [(0.2, 0.5, 0.9), (0, 0.3, 1), (0.7, 0.7, 0.1)]:
+        assert generated(a, b, c) == pytest.approx(
+            (logic.t_norm_many([a, b, c]), logic.t_conorm_many([a, b, c])))
@@ -0,0 +1,79 @@
+import pickle
+
+from yvain.control_surface import ControlSurface, tabulate
+from yvain.fuzzy_system import SugenoSystem, when, Linear
+from yvain.membership_functions import Triangle
+
+import numpy as np
+import pytest
+
+
+def _bilinear(batch):
+    return {"z": 1 + 2 * batch["x"] - batch["y"] + 0.5 * batch["x"] * batch["y"]}
+
+
+def test_multilinear_function_is_interpolated_exactly():
+    surface = tabulate(_bilinear, {"x": (0, 4, 5), "y": (-1, 1, 3)})["z"]
+
+    assert surface.error == pytest.approx(0, abs=1e-12)
+    for x, y in [(0, -1), (1.3, 0.2), (4, 1), (3.99, -0.7)]:
+        assert surface({"x": x, "y": y}) == pytest.approx(_bilinear({"x": x, "y": y})["z"])
+
+
+def test_batch_interpolation_is_equal_to_single_one():
+    surface = tabulate(lambda batch: {"z": np.sin(batch["x"]) * batch["y"] ** 2},
+                       {"x": (0, 3, 7), "y": (0, 2, 5)})["z"]
+    x, y = np.linspace(-1, 4, 50), np.linspace(-1, 3, 50)
+
+    assert surface({"x": x, "y": y}) == pytest.approx(
+        [surface({"x": xi, "y": yi}) for xi, yi in zip(x, y)])
+    assert surface.error > 0
+
+
+def test_values_out_of_grid_are_clamped():
+    surface = tabulate(lambda batch: {"z": batch["x"] ** 2}, {"x": (0, 2, 3)})["z"]
+
+    assert surface({"x": -5}) == pytest.approx(0)
+    assert surface({"x": 7}) == pytest.approx(4)
+
+
+def test_surface_is_saved_and_loaded_as_flat_array(tmp_path):
+    surface = tabulate(_bilinear, {"x": (0, 4, 5), "y": (-1, 1, 3)})["z"]
+    path = str(tmp_path / "surface.bin")
+
+    surface.save(path)
+    loaded = ControlSurface.load(path, ["x", "y"])
+
+    assert len(surface.to_array()) == 1 + 2 * 3 + 1 + 15
+    assert loaded.error == surface.error
+    assert loaded({"x": 1.7, "y": 0.3}) == surface({"x": 1.7, "y": 0.3})
+
+
+def test_malformed_flat_array_raises_value_error():
+    flat = tabulate(_bilinear, {"x": (0, 4, 5), "y": (-1, 1, 3)})["z"].to_array()
+
+    with pytest.raises(ValueError):
+        ControlSurface.from_array(flat, ["x"])
+    with pytest.raises(ValueError):
+        ControlSurface.from_array(flat[:-1], ["x", "y"])
+
+
+def test_sugeno_system_surface_approximates_system():
+    system = SugenoSystem.empty()
+    system.add_input("x", {"low": Triangle(-10, 0, 10), "high": Triangle(0, 10, 20)})
+    system.add_rule(when("x", "low").compute(Linear(1, {"x": 2})))
+    system.add_rule(when("x", "high").compute(Linear(3, {"x": -1})))
+
+    surface = system.tabulate({"x": (0, 10, 101)})
+
+    for x in [0.05, 3.33, 9.1]:
+        assert surface({"x": x}) == pytest.approx(system.run({"x": x}), abs=surface.error + 1e-9)
+
+
+def test_pickled_surface_shares_single_table():
+    surface = tabulate(_bilinear, {"x": (0, 4, 5), "y": (-1, 1, 3)})["z"]
+
+    restored = pickle.loads(pickle.dumps(surface))
+
+    assert np.shares_memory(restored.values, np.frombuffer(restored.table))
+    assert restored({"x": 1.7, "y": 0.3}) == surface({"x": 1.7, "y": 0.3})
@@ -0,0 +1,205 @@
+from yvain.fuzzy_set import FuzzySet, Centroid, Simpson, AdaptiveSimpson, centroid, \
+    piecewise_linear_centroid, DiscreteFuzzySet, bisector, mean_of_maxima, smallest_of_maxima, \
+    largest_of_maxima, weighted_average, defuzzify_many, SampledCentroid
+from yvain.logical_systems import Zadeh, Product, Lukasiewicz
+from yvain.membership_functions import Triangle, Gaussian, Trapezoid
+
+import numpy as np
+import pytest
+
+_SETS = [
+    FuzzySet(Triangle(0, 5, 10)),
+    FuzzySet(Triangle(2, 3, 9)),
+    FuzzySet(Trapezoid(1, 2, 4, 9)),
+    FuzzySet(Gaussian(5, 1)) | FuzzySet(Triangle(0, 1, 3)),
+]
+
+
+@pytest.mark.parametrize("fuzzy_set", _SETS)
+@pytest.mark.parametrize("integrator", [Simpson(), Simpson(n=1000), AdaptiveSimpson(1e-9)])
+def test_centroid_does_not_depend_on_integrator(fuzzy_set, integrator):
+    assert Centroid(integrator)(fuzzy_set, 0, 10) == pytest.approx(centroid(fuzzy_set, 0, 10), 1e-4)
+
+
+def test_centroid_of_symmetric_set_is_its_center():
+    fuzzy_set = FuzzySet(Triangle(20, 25, 30))
+
+    assert centroid(fuzzy_set, 0, 50) == pytest.approx(25)
+    assert Centroid(AdaptiveSimpson())(fuzzy_set, 0, 50) == pytest.approx(25)
+
+
+def test_adaptive_simpson_cost_does_not_grow_with_universe_width():
+    calls = []
+
+    def membership(x):
+        calls.append(x)
+        return Triangle(40000, 50000, 60000)(x)
+
+    assert Centroid(AdaptiveSimpson(1e-3))(FuzzySet(membership), 0, 100000) == pytest.approx(50000)
+    assert len(calls) < 10000
+
+
+def test_area_and_moment_of_triangle():
+    area, moment = AdaptiveSimpson().moments(Triangle(0, 1, 2), -1, 3)
+
+    assert area == pytest.approx(1)
+    assert moment == pytest.approx(1)
+
+
+def test_simpson_requires_even_number_of_parabolas():
+    with pytest.raises(ValueError):
+        Simpson(n=11)
+
+
+@pytest.mark.parametrize("integrator", [Simpson(), AdaptiveSimpson()])
+def test_integrator_raises_when_bounds_are_reversed(integrator):
+    with pytest.raises(ValueError):
+        integrator.moments(Triangle(0, 1, 2), 3, 1)
+
+
+_IMPLIED = [
+    (0.3, Triangle(0, 5, 10)),
+    (0.8, Triangle(7.5, 12.5, 17.5)),
+    (0.1, Trapezoid(15, 20, 22, 25)),
+    (0.5, Triangle(0, 5, 10)),
+]
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product()])
+def test_piecewise_linear_centroid_is_equal_to_integrated_one(logic):
+    union = None
+    for strength, membership in _IMPLIED:
+        implied = FuzzySet(lambda x, s=strength: s, logic) & FuzzySet(membership, logic)
+        union = implied if union is None else union | implied
+
+    exact = piecewise_linear_centroid(
+        [(strength, membership.breakpoints()) for strength, membership in _IMPLIED], logic, 0, 25)
+
+    assert exact == pytest.approx(Centroid(AdaptiveSimpson(1e-10))(union, 0, 25))
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product()])
+def test_piecewise_linear_centroid_of_many_implied_sets(logic):
+    shapes = [Triangle(0, 5, 10), Triangle(7.5, 12.5, 17.5), Trapezoid(15, 20, 22, 25)] + \
+             [Triangle(i / 10, i / 10 + 1, i / 10 + 2) for i in range(200)]
+    implied = [(((i * 7919) % 1000) / 100000, shapes[i % len(shapes)]) for i in range(2000)]
+    grid = np.linspace(0, 25, 25001)
+    union = np.zeros_like(grid)
+    for strength, membership in implied:
+        union = logic.t_conorm_values(union, logic.t_norm_values(strength, membership(grid)))
+
+    exact = piecewise_linear_centroid(
+        [(strength, membership.breakpoints()) for strength, membership in implied], logic, 0, 25)
+
+    assert exact == pytest.approx(np.sum(union * grid) / np.sum(union), abs=1e-4)
+
+
+def test_centroid_over_supports_is_equal_to_centroid_over_universe():
+    union = FuzzySet(Triangle(2, 4, 6)) | FuzzySet(Triangle(5, 7, 9)) \
+        | FuzzySet(Triangle(15, 16, 17))
+    supports = [(2, 6), (5, 9), (15, 17)]
+
+    assert centroid.over(union, supports, 0, 25) == pytest.approx(centroid(union, 0, 25), abs=1e-6)
+    assert centroid.over(union, supports, 0, 10) == pytest.approx(centroid(union, 0, 10), abs=1e-6)
+
+
+def test_tabulated_fuzzy_set_approximates_composed_one():
+    composed = (FuzzySet(Gaussian(5, 2)) | FuzzySet(Triangle(2, 3, 9))) & ~FuzzySet(Gaussian(4, 1))
+
+    tabulated = composed.tabulated(0, 10, max_error=1e-4)
+
+    assert tabulated.logic is composed.logic
+    for x in [0, 0.5, 3.3, 7.1, 10]:
+        assert tabulated.membership(x) == pytest.approx(composed.membership(x), abs=1e-3)
+
+
+def test_piecewise_linear_centroid_is_limited_to_universe():
+    exact = piecewise_linear_centroid([(1, Triangle(0, 5, 10).breakpoints())], Zadeh(), 5, 10)
+
+    assert exact == pytest.approx(5 + 5 / 3)
+
+
+def test_piecewise_linear_centroid_rejects_other_logics():
+    with pytest.raises(ValueError):
+        piecewise_linear_centroid([(1, Triangle(0, 5, 10).breakpoints())], Lukasiewicz(), 0, 10)
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product()])
+def test_operations_on_discrete_sets_are_equal_to_operations_on_functional_ones(logic):
+    universe = np.linspace(0, 25, 2501)
+    a, b = FuzzySet(Gaussian(5, 2), logic), FuzzySet(Triangle(2, 3, 9), logic)
+
+    discrete = (a.discretize(universe) | ~b.discretize(universe)) & b.discretize(universe)
+    functional = (a | ~b) & b
+
+    assert discrete.memberships == pytest.approx(functional.discretize(universe).memberships)
+    assert discrete.centroid() == pytest.approx(centroid(functional, 0, 25), abs=1e-4)
+    assert discrete.membership(4.123) == pytest.approx(functional.membership(4.123), abs=1e-4)
+
+
+def test_discrete_set_converts_back_to_functional_one():
+    universe = np.linspace(0, 10, 11)
+    discrete = FuzzySet(Triangle(2, 4, 8)).discretize(universe)
+
+    fuzzy_set = discrete.to_fuzzy_set()
+
+    assert fuzzy_set.membership(3.5) == pytest.approx(0.75)
+    assert fuzzy_set.membership(11) == 0
+    assert centroid(fuzzy_set, 0, 10) == pytest.approx(discrete.centroid(), abs=1e-6)
+
+
+def test_discrete_sets_on_different_universes_cannot_be_combined():
+    a = FuzzySet(Triangle(2, 4, 8)).discretize(np.linspace(0, 10, 11))
+    b = FuzzySet(Triangle(2, 4, 8)).discretize(np.linspace(0, 10, 21))
+
+    with pytest.raises(ValueError):
+        a | b
+
+
+def test_maxima_based_defuzzifications_of_trapezoid():
+    fuzzy_set = FuzzySet(Trapezoid(2, 4, 6, 10))
+
+    assert smallest_of_maxima(fuzzy_set, 0, 20) == pytest.approx(4)
+    assert largest_of_maxima(fuzzy_set, 0, 20) == pytest.approx(6)
+    assert mean_of_maxima(fuzzy_set, 0, 20) == pytest.approx(5)
+
+
+def test_bisector_divides_area_into_equal_parts():
+    fuzzy_set = FuzzySet(Triangle(0, 0.1, 10))
+
+    # Right part is triangle with area equal to half of the whole one: (10 - x)^2 / 9.9 = 5
+    assert bisector(fuzzy_set, 0, 10) == pytest.approx(10 - (5 * 9.9) ** 0.5, abs=1e-3)
+
+
+def test_weighted_average_of_symmetric_set_is_its_center():
+    assert weighted_average(FuzzySet(Gaussian(5, 1)), 0, 10) == pytest.approx(5)
+
+
+def test_many_defuzzifications_share_single_evaluation():
+    calls = []
+
+    def membership(x):
+        calls.append(x)
+        return Trapezoid(2, 4, 6, 10)(x)
+
+    results = defuzzify_many(FuzzySet(membership), 0, 20, {
+        "centroid": SampledCentroid(), "mom": mean_of_maxima, "bisector": bisector})
+
+    assert len(calls) == 1
+    assert results["centroid"] == pytest.approx(centroid(FuzzySet(Trapezoid(2, 4, 6, 10)), 0, 20))
+    assert results["mom"] == pytest.approx(5)
+    assert results["bisector"] == pytest.approx(bisector(FuzzySet(Trapezoid(2, 4, 6, 10)), 0, 20))
+
+
+def test_empty_set_cannot_be_defuzzified():
+    with pytest.raises(ValueError):
+        mean_of_maxima(FuzzySet(Triangle(20, 21, 22)), 0, 10)
+
+
+def test_empty_discrete_set_has_no_centroid():
+    sampled = DiscreteFuzzySet(np.linspace(0, 10, 11), np.zeros(11))
+
+    with pytest.raises(ValueError):
+        sampled.centroid()
+    with pytest.raises(ValueError):
+        SampledCentroid()(FuzzySet(Triangle(20, 21, 22)), 0, 10)
@@ -1,10 +1,16 @@
-from math import isclose
+import pickle
+from math import isclose, exp
 
+import numpy as np
 import pytest
 
-from yvain.fuzzy_set import FuzzySet
-from yvain.fuzzy_system import MamdaniSystem, when, FuzzyVariable, SugenoSystem
-from yvain.membership_functions import Gaussian, Trapezoid, Triangle
+from yvain.fuzzy_set import FuzzySet, Centroid, AdaptiveSimpson, mean_of_maxima, bisector, \
+    SampledCentroid, Simpson
+from yvain.fuzzy_system import MamdaniSystem, when, FuzzyVariable, SugenoSystem, InvalidRuleError, \
+    Linear, And, Or, Is, IntervalIndex
+from yvain.logical_systems import LogicalSystem, Zadeh, Product, Frank, Drastic
+from yvain.membership_functions import Gaussian, Trapezoid, Triangle, PiecewiseLinear, \
+    MembershipBank, Tabulated
 
 
 def test_when_then_rule_cuts_output_at_input_membership():
@@ -28,34 +34,10 @@ def test_when_then_rule_cuts_output_at_input_membership():
     assert rule({"size": 140}).membership(cheap_center) == pytest.approx(small_mf(140))
 
 
-def test_r_sets_example():
+def test_r_sets_example(tipping_system):
     #  R Sets is R library
 
-    system = MamdaniSystem.empty()
-    system.add_input("service", {
-        "poor": Gaussian(0, 1.5),
-        "good": Gaussian(5, 1.5),
-        "excellent": Gaussian(10, 1.5),
-    })
-    system.add_input("food", {
-        "rancid": Trapezoid(-2, 0, 2, 4),
-        "delicious": Trapezoid(7, 9, 11, 13),
-    })
-
-    system.add_output("tip", {
-        "cheap": Triangle(0, 5, 10),
-        "average": Triangle(7.5, 12.5, 17.5),
-        "generous": Triangle(15, 20, 25),
-    })
-    system.add_rule(
-        when("service", "poor").or_is("food", "rancid").then("tip", "cheap")
-    )
-    system.add_rule(
-        when("service", "good").then("tip", "average")
-    )
-    system.add_rule(
-        when("service", "excellent").or_is("food", "delicious").then("tip", "generous")
-    )
+    system = tipping_system()
 
     system_output = system.run({"service": 3, "food": 8}, (0, 25))
     assert system_output["tip"] == pytest.approx(14.89, 0.1)
@@ -82,3 +64,540 @@ def test_sugeno_output_is_result_of_output_function():
             assert system.run(entry) == 0
         else:
             assert system.run(entry) == pytest.approx(output_function(entry))
+
+
+def test_compiled_mamdani_engine_gives_same_results_as_system(tipping_system):
+    system = tipping_system()
+    engine = system.compile()
+
+    for service, food in [(3, 8), (0, 0), (10, 10), (5, 2)]:
+        values = {"service": service, "food": food}
+        assert engine.run(values, (0, 25)) == pytest.approx(system.run(values, (0, 25)))
+
+
+def test_compiled_engine_is_not_affected_by_later_system_changes(tipping_system):
+    system = tipping_system()
+    engine = system.compile()
+    expected = engine.run({"service": 3, "food": 8}, (0, 25))
+
+    system.add_rule(when("service", "poor").then("tip", "generous"))
+
+    assert engine.run({"service": 3, "food": 8}, (0, 25)) == pytest.approx(expected)
+    assert len(engine.implications) == 3
+
+
+def test_compile_raises_on_unknown_variable(tipping_system):
+    system = tipping_system()
+    system.add_rule(when("ambience", "poor").then("tip", "cheap"))
+
+    with pytest.raises(InvalidRuleError):
+        system.compile()
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Frank(2)])
+def test_mamdani_batch_run_is_equal_to_run_of_each_sample(logic, tipping_system):
+    system = tipping_system(logic)
+    service = np.array([3, 0, 10, 5, 7.5])
+    food = np.array([8, 0, 10, 2, 4])
+
+    results = system.run_batch({"service": service, "food": food}, (0, 25), chunk_size=2)
+
+    expected = [system.run({"service": s, "food": f}, (0, 25))["tip"]
+                for s, f in zip(service, food)]
+    assert results["tip"] == pytest.approx(expected)
+
+
+def test_mamdani_batch_accepts_2d_array_with_column_names(tipping_system):
+    system = tipping_system()
+    samples = np.array([[3, 8], [5, 2]])
+
+    results = system.run_batch(samples, (0, 25), columns=["service", "food"])
+
+    assert results["tip"] == pytest.approx(
+        system.run_batch({"service": samples[:, 0], "food": samples[:, 1]}, (0, 25))["tip"])
+
+
+def test_mamdani_batch_rejects_arrays_of_different_length(tipping_system):
+    system = tipping_system()
+
+    with pytest.raises(ValueError):
+        system.run_batch({"service": [1, 2, 3], "food": [1, 2]}, (0, 25))
+
+
+def test_sugeno_batch_run_is_equal_to_run_of_each_sample(linear_sugeno_system):
+    system = linear_sugeno_system()
+    service = np.array([0, 3, 4.5, 7, 9, 12, 20])
+    food = np.array([1, 8, 3, 10, 10, 5, 20])
+
+    results = system.run_batch({"service": service, "food": food})
+
+    expected = [system.run({"service": s, "food": f}) for s, f in zip(service, food)]
+    assert results == pytest.approx(expected)
+
+
+def test_sugeno_batch_reads_and_calls_the_same_as_run(linear_sugeno_system):
+    system = linear_sugeno_system()
+    system.add_input("ambience", {"nice": Triangle(0, 5, 10)})
+    calls = []
+    system.rule_set[2] = when("service", "excellent").and_is("food", "delicious").compute(
+        lambda values: calls.append(values["service"]) or values["service"] + values["food"])
+    engine = system.compile()
+    service = np.array([0, 3, 4.5, 7, 9, 12, 20])
+    food = np.array([1, 8, 3, 10, 10, 5, 20])
+
+    results = engine.run_batch({"service": service, "food": food})
+    batch_calls, calls[:] = list(calls), []
+
+    assert results == pytest.approx(
+        [engine.run({"service": s, "food": f}) for s, f in zip(service, food)])
+    assert batch_calls == calls == [7, 9]
+
+
+def test_linear_output_function_is_weighted_sum_of_inputs():
+    linear = Linear(1.5, {"service": 2, "food": -1})
+
+    assert linear({"service": 3, "food": 4, "ambience": 10}) == pytest.approx(3.5)
+
+
+def test_sugeno_compile_raises_when_linear_output_refers_to_unknown_variable(linear_sugeno_system):
+    system = linear_sugeno_system()
+    system.add_rule(when("service", "good").compute(Linear(0, {"ambience": 1})))
+
+    with pytest.raises(InvalidRuleError):
+        system.compile()
+
+
+def test_mamdani_falls_back_to_integration_for_not_piecewise_linear_outputs(tipping_system):
+    system = tipping_system()
+    system.add_output("tip", {
+        "cheap": Gaussian(5, 2),
+        "average": Triangle(7.5, 12.5, 17.5),
+        "generous": Triangle(15, 20, 25),
+    })
+    engine = system.compile()
+
+    assert not engine.breakpoints
+    assert engine.run({"service": 3, "food": 8}, (0, 25))["tip"] == pytest.approx(
+        system.run_batch({"service": [3], "food": [8]}, (0, 25))["tip"][0])
+
+
+def test_mamdani_runs_rule_base_larger_than_recursion_limit():
+    system = MamdaniSystem.empty()
+    system.add_input("x", {str(i): Triangle(i - 1, i, i + 1) for i in range(100)})
+    system.add_output("y", {str(i): Gaussian(i, 1) for i in range(100)})
+    for i in range(5000):
+        system.add_rule(when("x", str(i % 100)).then("y", str((i * 7) % 100)))
+
+    result = system.run({"x": 10.5}, (0, 100))["y"]
+
+    assert result == pytest.approx(system.run_batch({"x": [10.5]}, (0, 100))["y"][0])
+
+
+def test_each_input_term_is_fuzzified_once_per_sample():
+    calls = []
+
+    def small(x):
+        calls.append(x)
+        return Triangle(0, 5, 10)(x)
+
+    system = SugenoSystem.empty()
+    system.add_input("size", {"small": small, "large": Triangle(5, 10, 15)})
+    for i in range(40):
+        system.add_rule(when("size", "small").and_is("size", "large").compute(Linear(i, {})))
+    engine = system.compile()
+
+    engine.run({"size": 7})
+
+    assert calls == [7]
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product()])
+def test_compiled_antecedent_evaluates_to_firing_strength(logic):
+    small, large = Gaussian(150, 4), Gaussian(180, 4)
+    inputs = {"size": FuzzyVariable("size", {"small": FuzzySet(small), "large": FuzzySet(large)})}
+
+    rule = when("size", "small").or_is("size", "large").rule.compile(inputs, logic)
+
+    for size in [140, 150, 165, 180]:
+        strength = rule({"size": size})
+        assert isinstance(strength, float)
+        assert strength == pytest.approx(logic.t_conorm_values(small(size), large(size)))
+
+
+def test_nested_rules_of_same_type_are_flattened_to_n_ary_rule():
+    a, b, c, d = (Is("x", state) for state in "abcd")
+    rule = And(And(a, b), And(c, Or(a, d)))
+    inputs = {"x": FuzzyVariable("x", {
+        state: FuzzySet(Triangle(i, i + 2, i + 4)) for i, state in enumerate("abcd")
+    })}
+
+    assert [type(operand) for operand in rule.operands()] == [Is, Is, Is, Or]
+    assert rule.compile(inputs, Zadeh())({"x": 3.5}) == pytest.approx(0.25)
+
+
+def test_interval_index_returns_overlapping_intervals():
+    index = IntervalIndex([(0, 10), (5, 15), (10, 20), (-float("inf"), 3)])
+
+    assert index(-100) == (3,)
+    assert index(2) == (0, 3)
+    assert index(7) == (0, 1)
+    assert index(10) == (0, 1, 2)
+    assert index(25) == ()
+
+
+def _grid_partitioned_system(terms: int, calls: list) -> SugenoSystem:
+    def term(center):
+        def membership(x):
+            calls.append(center)
+            return Triangle(center - 1, center, center + 1)(x)
+        membership.support = lambda epsilon: (center - 1, center + 1)
+        return membership
+
+    system = SugenoSystem.empty()
+    for name in ["x", "y"]:
+        system.add_input(name, {str(i): term(i) for i in range(terms)})
+    for i in range(terms):
+        for j in range(terms):
+            system.add_rule(when("x", str(i)).and_is("y", str(j)).compute(Linear(i + j, {})))
+    return system
+
+
+def test_only_terms_and_rules_containing_input_are_evaluated():
+    calls = []
+    engine = _grid_partitioned_system(50, calls).compile()
+
+    result = engine.run({"x": 10.25, "y": 20.5})
+
+    assert sorted(calls) == [10, 11, 20, 21]
+    assert result == pytest.approx((0.5 * 30 + 0.5 * 31 + 0.25 * 31 + 0.25 * 32) / 1.5)
+
+
+def test_skipping_not_fired_rules_does_not_change_mamdani_output(tipping_system):
+    system = tipping_system()
+    engine = system.compile()
+
+    for service, food in [(3, 8), (0, 0), (9, 12), (5, 5)]:
+        batch = engine.run_batch({"service": [service], "food": [food]}, (0, 30))["tip"][0]
+        assert engine.run({"service": service, "food": food}, (0, 30))["tip"] == \
+            pytest.approx(batch, rel=1e-3)
+
+
+def test_piecewise_linear_outputs_are_defuzzified_exactly(tipping_system):
+    system = tipping_system()
+    reference = system.run({"service": 3, "food": 8}, (0, 30))["tip"]
+    system.add_output("tip", {
+        state: PiecewiseLinear(*fuzzy_set.membership_function.breakpoints())
+        for state, fuzzy_set in system.outputs["tip"].fuzzy_set.items()
+    })
+
+    engine = system.compile()
+
+    assert len(engine.breakpoints) == 3
+    assert engine.run({"service": 3, "food": 8}, (0, 30))["tip"] == pytest.approx(reference)
+
+
+def test_input_built_from_arrays_gives_the_same_results_for_batch_and_single_samples():
+    centers = np.arange(0., 101.)
+    system = SugenoSystem.empty()
+    system.add_input_from_arrays("x", [str(i) for i in range(101)], Triangle,
+                                 centers - 1, centers, centers + 1)
+    for i in range(101):
+        system.add_rule(when("x", str(i)).compute(Linear(0, {"x": i % 3})))
+    engine = system.compile()
+    samples = np.linspace(0, 100, 333)
+
+    results = engine.run_batch({"x": samples})
+
+    assert results == pytest.approx([engine.run({"x": x}) for x in samples])
+
+
+def test_tabulated_term_is_not_skipped_next_to_its_support():
+    system = SugenoSystem.empty()
+    system.add_input("x", {"low": Tabulated(Triangle(0.05, 1, 2), -10, 10, resolution=21)})
+    system.add_input("y", {"any": Triangle(-1, 0, 1)})
+    system.add_rule(when("x", "low").compute(Linear(3, {"x": 1})))
+    system.add_rule(when("y", "any").compute(Linear(0, {})))
+    engine = system.compile()
+
+    result = engine.run({"x": 0.02, "y": 0.5})
+
+    assert result == pytest.approx(
+        engine.run_batch({"x": np.array([0.02]), "y": np.array([0.5])})[0])
+    assert result == pytest.approx(3.02 * 0.02 / (0.02 + 0.5))
+
+
+def test_bank_of_input_built_from_arrays_is_reused(monkeypatch):
+    centers = np.arange(0., 11.)
+    system = SugenoSystem.empty()
+    system.add_input_from_arrays("x", [str(i) for i in range(11)], Trapezoid,
+                                 centers - 1, centers, centers + .5, centers + 1)
+    system.add_input("y", {"low": Triangle(0, 0.1, 10)})
+    for i in reversed(range(11)):
+        system.add_rule(when("x", str(i)).and_is("y", "low").compute(Linear(i % 4, {"x": 1})))
+    built = []
+    monkeypatch.setattr("yvain.fuzzy_system.MembershipBank",
+                        lambda functions: built.append(functions) or MembershipBank(functions))
+    engine = system.compile()
+    samples = np.linspace(0, 10, 77)
+
+    results = engine.run_batch({"x": samples, "y": np.full(77, 2.)})
+
+    assert len(built) == 1
+    assert results == pytest.approx([engine.run({"x": x, "y": 2.}) for x in samples])
+
+
+def test_consequents_are_sampled_once_per_universe(tipping_system):
+    calls = []
+
+    def generous(x):
+        calls.append(x)
+        return Gaussian(20, 3)(x)
+
+    system = tipping_system()
+    system.add_output("tip", {
+        "cheap": Gaussian(5, 3), "average": Gaussian(12.5, 3), "generous": generous})
+    engine = system.compile()
+
+    results = [engine.run({"service": service, "food": 8}, (0, 30))["tip"] for service in [3, 6, 9]]
+    engine.run_batch({"service": [3, 6, 9], "food": [8, 8, 8]}, (0, 30))
+
+    assert len(calls) == 1
+    assert list(engine.grids) == [(0, 30, 3000)]
+    assert results == pytest.approx(
+        engine.run_batch({"service": [3, 6, 9], "food": [8, 8, 8]}, (0, 30))["tip"])
+    system.defuzzify = Centroid(AdaptiveSimpson(1e-9))
+    assert results == pytest.approx(
+        [system.run({"service": service, "food": 8}, (0, 30))["tip"] for service in [3, 6, 9]])
+
+
+def test_additive_system_output_is_centroid_of_sum_of_scaled_consequents(tipping_system):
+    system = tipping_system(Product())
+    system.additive = True
+    system.add_output("tip", {"cheap": Triangle(0, 5, 10), "average": Gaussian(12.5, 2),
+                              "generous": Trapezoid(15, 18, 22, 25)})
+    engine = system.compile()
+    values = {"service": 3, "food": 8}
+
+    memberships = engine.fuzzification(values)
+    scaled = [(strength(memberships), state.membership_function)
+              for _, strength, state in engine.implications]
+    area, moment = AdaptiveSimpson(1e-10).moments(
+        lambda x: sum(strength * membership(x) for strength, membership in scaled), 0, 30)
+
+    assert engine.run(values, (0, 30))["tip"] == pytest.approx(moment / area)
+    assert engine.run_batch({"service": [3], "food": [8]}, (0, 30))["tip"] == \
+        pytest.approx([moment / area])
+
+
+def test_additive_system_uses_moments_of_consequents_within_universe():
+    system = MamdaniSystem.empty(Product(), additive=True)
+    system.add_input("x", {"low": Triangle(-1, 0, 1)})
+    system.add_output("y", {"wide": Triangle(0, 10, 20)})
+    system.add_rule(when("x", "low").then("y", "wide"))
+
+    assert system.run({"x": 0.5}, (0, 20))["y"] == pytest.approx(10)
+    assert system.run({"x": 0.5}, (0, 10))["y"] == pytest.approx(20 / 3)
+
+
+def test_mamdani_system_can_be_defuzzified_with_mean_of_maxima(tipping_system):
+    system = tipping_system()
+    system.defuzzify = mean_of_maxima
+
+    result = system.run({"service": 5, "food": 5}, (0, 30))["tip"]
+
+    assert result == pytest.approx(12.5)
+    assert system.run_batch({"service": [5], "food": [5]}, (0, 30))["tip"] == pytest.approx([12.5])
+
+
+def test_mamdani_surface_approximates_system(tipping_system):
+    system = tipping_system()
+
+    surface = system.tabulate({"service": (0, 10, 41), "food": (0, 10, 41)}, (0, 30))["tip"]
+
+    assert surface.error < 1
+    assert surface({"service": 3, "food": 8}) == \
+        pytest.approx(system.run({"service": 3, "food": 8}, (0, 30))["tip"], abs=surface.error)
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Frank(2)])
+def test_systems_and_engines_can_be_pickled(logic, tipping_system):
+    system = tipping_system(logic)
+    system.add_output("tip", {
+        "cheap": (FuzzySet(Triangle(0, 5, 10), logic)
+                  | FuzzySet(Gaussian(3, 1), logic)).membership_function,
+        "average": Triangle(7.5, 12.5, 17.5),
+        "generous": Triangle(15, 20, 25),
+    })
+    values = {"service": 3, "food": 8}
+
+    restored_system = pickle.loads(pickle.dumps(system))
+    restored_engine = pickle.loads(pickle.dumps(system.compile()))
+
+    expected = system.run(values, (0, 30))["tip"]
+    assert restored_system.run(values, (0, 30))["tip"] == pytest.approx(expected)
+    assert restored_engine.run(values, (0, 30))["tip"] == pytest.approx(expected)
+
+
+def test_batch_sharded_across_processes_is_equal_to_single_process_one(tipping_system,
+                                                                     linear_sugeno_system):
+    mamdani = tipping_system().compile()
+    sugeno = linear_sugeno_system()
+    sugeno.rule_set.pop()
+    sugeno = sugeno.compile()
+    batch = {"service": np.linspace(0, 10, 101), "food": np.linspace(10, 0, 101)}
+
+    assert mamdani.run_batch(batch, (0, 30), workers=3)["tip"] == \
+        pytest.approx(mamdani.run_batch(batch, (0, 30))["tip"])
+    assert sugeno.run_batch(batch, workers=3) == pytest.approx(sugeno.run_batch(batch))
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Frank(2)])
+@pytest.mark.parametrize("additive", [False, True])
+def test_generated_mamdani_function_is_equal_to_engine(logic, additive, tipping_system):
+    system = tipping_system(logic)
+    system.additive = additive
+    engine = system.compile()
+
+    generated = system.generate((0, 30))
+
+    for service in [0, 1.5, 3, 5, 7.5, 10]:
+        for food in [0, 2.5, 5, 8, 10]:
+            values = {"service": service, "food": food}
+            assert generated.run(values)["tip"] == pytest.approx(engine.run(values, (0, 30))["tip"])
+
+
+def test_generated_sugeno_function_is_equal_to_engine(linear_sugeno_system):
+    system = linear_sugeno_system()
+    engine = system.compile()
+
+    generated = system.generate()
+
+    assert "def run(values):" in generated.source
+    for service in [-1, 0, 3, 4.5, 7, 9, 12, 20]:
+        for food in [0, 2, 5, 8, 10, 20]:
+            values = {"service": service, "food": food}
+            assert generated(values) == pytest.approx(engine.run(values))
+
+
+def test_generated_function_can_be_pickled(linear_sugeno_system):
+    system = linear_sugeno_system()
+    system.rule_set.pop()
+    generated = system.generate()
+
+    restored = pickle.loads(pickle.dumps(generated))
+
+    assert restored.source == generated.source
+    assert restored({"service": 4, "food": 3}) == pytest.approx(
+        generated({"service": 4, "food": 3}))
+
+
+def test_far_tail_of_gaussian_term_is_not_skipped():
+    system = SugenoSystem.empty()
+    system.add_input("x", {"low": Gaussian(0, 1), "high": Gaussian(10, 1)})
+    system.add_rule(when("x", "low").compute(Linear(3, {})))
+    system.add_rule(when("x", "high").compute(Linear(7, {})))
+    low, high = exp(-0.5 * 17 ** 2), exp(-0.5 * 7 ** 2)
+    expected = (3 * low + 7 * high) / (low + high)
+
+    assert system.run({"x": 17}) == pytest.approx(expected)
+    assert system.run_batch({"x": np.array([17.])})[0] == pytest.approx(expected)
+    assert system.generate()({"x": 17}) == pytest.approx(expected)
+
+
+def test_tiny_memberships_are_not_skipped_in_drastic_logic(tipping_system):
+    system = tipping_system(Drastic())
+    values = {"service": 10, "food": 2.5}
+
+    # Drastic union of rancid food and tiny membership of poor service is full
+    result = system.run(values, (0, 25))["tip"]
+
+    assert result == pytest.approx(12.5)
+    assert system.run_batch({name: np.array([value]) for name, value in values.items()},
+                            (0, 25))["tip"][0] == pytest.approx(result, abs=1e-3)
+
+
+def test_batch_over_wide_universe_is_equal_to_single_runs(tipping_system):
+    engine = tipping_system().compile()
+    service, food = np.linspace(0, 10, 7), np.linspace(10, 0, 7)
+
+    results = engine.run_batch({"service": service, "food": food}, (0, 1000))["tip"]
+
+    assert results == pytest.approx(
+        [engine.run({"service": s, "food": f}, (0, 1000))["tip"] for s, f in zip(service, food)])
+
+
+def test_batch_chunks_are_limited_by_grid_size(monkeypatch, tipping_system):
+    # Grid of universe (0, 1000) holds 100001 points, so chunks have single sample
+    monkeypatch.setattr("yvain.fuzzy_system.SAMPLES_BUDGET", 150000)
+    system = tipping_system()
+    system.add_output("tip", {
+        "cheap": Gaussian(5, 2),
+        "average": Gaussian(12.5, 2),
+        "generous": Gaussian(20, 2),
+    })
+    engine = system.compile()
+    service, food = np.linspace(0, 10, 7), np.linspace(10, 0, 7)
+
+    results = engine.run_batch({"service": service, "food": food}, (0, 1000))["tip"]
+
+    assert results == pytest.approx(
+        [engine.run({"service": s, "food": f}, (0, 1000))["tip"] for s, f in zip(service, food)])
+
+
+def _narrow_system(logic: LogicalSystem = Zadeh()) -> MamdaniSystem:
+    system = MamdaniSystem.empty(logic)
+    system.add_input("x", {"low": Triangle(0, 2, 4), "high": Triangle(6, 8, 10)})
+    system.add_output("y", {"small": Triangle(0, 5, 10), "large": Triangle(10, 15, 20)})
+    system.add_rule(when("x", "low").then("y", "small"))
+    system.add_rule(when("x", "high").then("y", "large"))
+    return system
+
+
+@pytest.mark.parametrize("integrator, universe", [
+    (Simpson(), (0, 25)), (Simpson(), (0, 200)), (AdaptiveSimpson(1e-6), (0, 25))
+])
+def test_batch_sample_without_fired_rules_is_nan(integrator, universe):
+    system = _narrow_system()
+    system.defuzzify = Centroid(integrator)
+    engine = system.compile()
+
+    results = engine.run_batch({"x": np.array([2., 5., 8.])}, universe)["y"]
+
+    assert np.isnan(results[1])
+    assert results[[0, 2]] == pytest.approx(
+        [engine.run({"x": x}, universe)["y"] for x in (2., 8.)], abs=1e-4)
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Frank(2)])
+def test_batch_of_rule_base_much_larger_than_output_is_equal_to_single_runs(logic):
+    system = MamdaniSystem.empty(logic)
+    centers = np.linspace(0, 10, 30)
+    for name in ("x", "y"):
+        system.add_input_from_arrays(name, [str(i) for i in range(30)], Triangle,
+                                     centers - 0.5, centers, centers + 0.5)
+    system.add_output("z", {str(i): Triangle(5 * i - 5, 5 * i, 5 * i + 5) for i in range(6)})
+    for i in range(30):
+        for j in range(30):
+            system.add_rule(when("x", str(i)).and_is("y", str(j)).then("z", str((i + j) % 6)))
+    system.defuzzify = Centroid(Simpson(per_unit=20))
+    engine = system.compile()
+    rng = np.random.default_rng(7)
+    x, y = rng.uniform(0, 10, 300), rng.uniform(0, 10, 300)
+
+    results = engine.run_batch({"x": x, "y": y}, (0, 25), chunk_size=64)["z"]
+
+    assert results == pytest.approx(
+        [engine.run({"x": a, "y": b}, (0, 25))["z"] for a, b in zip(x, y)], abs=1e-3)
+
+
+def test_many_crisp_values_are_computed_from_single_pass(tipping_system):
+    system = tipping_system()
+    values = {"service": 3, "food": 8}
+    methods = {"centroid": SampledCentroid(), "bisector": bisector, "mom": mean_of_maxima}
+
+    results = system.run_many(values, (0, 30), methods)["tip"]
+
+    for name, method in methods.items():
+        single = MamdaniSystem(system.inputs, system.outputs, system.rule_set, system.logic, method)
+        assert results[name] == pytest.approx(single.run(values, (0, 30))["tip"])
+    assert results["centroid"] == pytest.approx(system.run(values, (0, 30))["tip"], abs=1e-3)
@@ -1,5 +1,6 @@
 from yvain.logical_systems import *
 from yvain.membership_functions import Triangle, Gaussian
+import numpy as np
 import pytest
 
 _TRIANGLE_UNIVERSE = [
@@ -42,3 +43,141 @@ def test_sum_of_fx_and_complemented_fx_should_be_equal_to_one(logic):
 
         for i in range(20):
             assert (mf(i) + complement_mf(i)) == pytest.approx(1)
+
+
+_MEMBERSHIPS = np.array([0, 0.1, 0.25, 0.5, 0.75, 0.9, 1])
+
+
+@pytest.mark.parametrize("logic", _LOGICS)
+def test_array_norms_are_equal_to_scalar_norms(logic):
+    a, b = np.meshgrid(_MEMBERSHIPS[1:], _MEMBERSHIPS[1:])
+    a, b = a.ravel(), b.ravel()
+
+    assert logic.t_norm_values(a, b) == pytest.approx(
+        [logic.t_norm_values(x, y) for x, y in zip(a, b)])
+    assert logic.t_conorm_values(a, b) == pytest.approx(
+        [logic.t_conorm_values(x, y) for x, y in zip(a, b)])
+    assert logic.complement_values(a) == pytest.approx(
+        [logic.complement_values(x) for x in a])
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Drastic(), Product(), Lukasiewicz(), Fodor(), Dombi(2)])
+def test_array_norms_handle_full_and_empty_memberships(logic):
+    a, b = np.meshgrid(_MEMBERSHIPS, _MEMBERSHIPS)
+    a, b = a.ravel(), b.ravel()
+
+    assert logic.t_norm_values(a, b) == pytest.approx(
+        [logic.t_norm_values(x, y) for x, y in zip(a, b)])
+    assert logic.t_conorm_values(a, b) == pytest.approx(
+        [logic.t_conorm_values(x, y) for x, y in zip(a, b)])
+
+
+def _gaussians(x):
+    return np.exp(-0.5 * ((x - 5) / 2) ** 2), np.exp(-0.5 * (x - 7) ** 2)
+
+
+@pytest.mark.parametrize("logic", _LOGICS)
+def test_norms_of_membership_functions_accept_arrays(logic):
+    universe = np.linspace(0, 20, 101)
+    union = logic.t_conorm(_GAUSSIAN_UNIVERSE[0], _GAUSSIAN_UNIVERSE[1])
+    intersection = logic.t_norm(_GAUSSIAN_UNIVERSE[0], _GAUSSIAN_UNIVERSE[1])
+    a, b = _gaussians(universe)
+
+    assert union(universe) == pytest.approx(
+        [logic.t_conorm_values(float(x), float(y)) for x, y in zip(a, b)])
+    assert intersection(universe) == pytest.approx(
+        [logic.t_norm_values(float(x), float(y)) for x, y in zip(a, b)])
+
+
+@pytest.mark.parametrize("logic, t_norm, t_conorm", [
+    (Zadeh(), np.minimum, np.maximum),
+    (Product(), lambda a, b: a * b, lambda a, b: a + b - a * b),
+    (Lukasiewicz(), lambda a, b: np.maximum(a + b - 1, 0), lambda a, b: np.minimum(a + b, 1)),
+])
+def test_norms_of_membership_functions_are_equal_to_formulas(logic, t_norm, t_conorm):
+    universe = np.linspace(0, 20, 101)
+    a, b = _gaussians(universe)
+
+    union = logic.t_conorm(_GAUSSIAN_UNIVERSE[0], _GAUSSIAN_UNIVERSE[1])
+    intersection = logic.t_norm(_GAUSSIAN_UNIVERSE[0], _GAUSSIAN_UNIVERSE[1])
+    complement = logic.complement(_GAUSSIAN_UNIVERSE[0])
+
+    assert union(universe) == pytest.approx(t_conorm(a, b))
+    assert intersection(universe) == pytest.approx(t_norm(a, b))
+    assert complement(universe) == pytest.approx(1 - a)
+    assert union(6.) == pytest.approx(t_conorm(np.exp(-0.125), np.exp(-0.5)))
+
+
+class _MembershipFunctionZadeh(LogicalSystem):
+    def t_norm(self, membership_a, membership_b):
+        return lambda x: min(membership_a(x), membership_b(x))
+
+
+def test_logic_defining_only_membership_function_norm_provides_value_norms():
+    logic = _MembershipFunctionZadeh()
+
+    assert logic.t_norm_values(0.3, 0.6) == pytest.approx(0.3)
+    assert logic.t_conorm_values(0.3, 0.6) == pytest.approx(0.6)
+    assert logic.t_conorm_values(np.array([0.3, 0.8]), 0.6) == pytest.approx([0.6, 0.8])
+
+
+@pytest.mark.parametrize("logic", [Frank(0.5), Frank(2), ShweizerSklar(-2), ShweizerSklar(2),
+                                   Yager(0.5), Yager(2), Dombi(0.5), Dombi(2)])
+def test_closed_form_t_conorm_is_dual_to_t_norm(logic):
+    a, b = np.meshgrid(_MEMBERSHIPS, _MEMBERSHIPS)
+    a, b = a.ravel(), b.ravel()
+
+    dual = 1 - logic.t_norm_values(1 - a, 1 - b)
+
+    assert logic.t_conorm_values(a, b) == pytest.approx(dual)
+    assert [logic.t_conorm_values(x, y) for x, y in zip(a, b)] == pytest.approx(dual)
+
+
+@pytest.mark.parametrize("logic_type, ps", [
+    (Frank, [0, 0.5, 1, 2, 10, float("inf")]),
+    (ShweizerSklar, [float("-inf"), -2, 0, 0.5, 2, float("inf")]),
+    (Yager, [0, 0.5, 2, float("inf")]),
+    (Dombi, [0, 0.5, 2, float("inf")]),
+])
+def test_sweep_is_equal_to_norms_of_each_parameter(logic_type, ps):
+    a, b = np.meshgrid(_MEMBERSHIPS, _MEMBERSHIPS)
+
+    t_norms = logic_type.t_norm_sweep(ps, a, b)
+    t_conorms = logic_type.t_conorm_sweep(ps, a, b)
+
+    assert t_norms.shape == (len(ps),) + a.shape
+    for i, p in enumerate(ps):
+        assert t_norms[i] == pytest.approx(logic_type(p).t_norm_values(a, b))
+        assert t_conorms[i] == pytest.approx(logic_type(p).t_conorm_values(a, b))
+
+
+@pytest.mark.parametrize("logic", [Zadeh(), Product(), Lukasiewicz(), Frank(2), Dombi(2)])
+def test_n_ary_norms_are_equal_to_chained_binary_norms(logic):
+    values = [0.9, 0.7, 0.8, 0.6]
+
+    t_norm, t_conorm = values[0], values[0]
+    for value in values[1:]:
+        t_norm = logic.t_norm_values(t_norm, value)
+        t_conorm = logic.t_conorm_values(t_conorm, value)
+
+    assert logic.t_norm_many(values) == pytest.approx(t_norm)
+    assert logic.t_conorm_many(values) == pytest.approx(t_conorm)
+    assert logic.t_norm_many(np.array([v, v]) for v in values) == pytest.approx([t_norm, t_norm])
+    assert logic.t_norm_many([]) == 1
+    assert logic.t_conorm_many([]) == 0
+
+
+def test_n_ary_norms_stop_at_absorbing_element():
+    consumed = []
+
+    def values(*memberships):
+        for membership in memberships:
+            consumed.append(membership)
+            yield membership
+
+    assert Product().t_norm_many(values(0.5, 0., 0.3)) == 0
+    assert consumed == [0.5, 0.]
+    consumed.clear()
+    assert Zadeh().t_conorm_many(
+        values(np.array([1., 1.]), np.array([0.2, 0.3]))) == pytest.approx([1, 1])
+    assert len(consumed) == 1
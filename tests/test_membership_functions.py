@@ -1,5 +1,6 @@
 from yvain.membership_functions import *
 
+import numpy as np
 import pytest
 
 _Triangle_VERTEXES = [
@@ -185,3 +186,163 @@ def test_sigmoid_changing_b_symbol_reverses_function(a, b):
 
     assert mf(a - 10) == pytest.approx(mf2(a + 10))
     assert mf(a - 10) == pytest.approx(1 - mf2(a - 10))
+
+
+_VECTORIZED_FUNCTIONS = [
+    Triangle(0, 5, 10), Triangle(-3.14, 3.14, 6.28),
+    Trapezoid(0, 2, 4, 6), Trapezoid(-10, -5, 5, 10),
+    Gaussian(0, 1), Gaussian(10, 4),
+    Bell(0, 1, 2), Bell(-0.1, 2, 6),
+    Sigmoid(5, -0.1), Sigmoid(0, 10),
+    PiecewiseLinear([-5, 0, 1, 2, 8], [0, 0.3, 1, 1, 0]), PiecewiseLinear([0, 10], [1, 1])
+]
+
+
+@pytest.mark.parametrize("mf", _VECTORIZED_FUNCTIONS)
+def test_array_membership_is_equal_to_scalar_membership(mf):
+    universe = np.linspace(-20, 20, 401)
+
+    memberships = mf(universe)
+
+    assert memberships.shape == universe.shape
+    assert memberships == pytest.approx([mf(x) for x in universe])
+
+
+@pytest.mark.parametrize("mf", _VECTORIZED_FUNCTIONS)
+def test_membership_out_of_support_is_lower_than_epsilon(mf):
+    low, high = mf.support(1e-6)
+    universe = np.linspace(-1000, 1000, 20001)
+
+    outside = universe[(universe < low) | (universe > high)]
+
+    assert np.all(mf(outside) < 1e-6)
+
+
+@pytest.mark.parametrize("mf", _VECTORIZED_FUNCTIONS)
+def test_membership_in_core_is_full(mf):
+    core = mf.core()
+
+    if core is not None:
+        assert mf(np.linspace(*core, 11)) == pytest.approx(1)
+
+
+def test_support_of_custom_function_is_whole_line():
+    assert support(lambda x: 0.5) == (-float("inf"), float("inf"))
+
+
+def test_piecewise_linear_is_equal_to_triangle_with_the_same_breakpoints():
+    triangle = Triangle(-3.14, 3.14, 6.28)
+    mf = PiecewiseLinear(*triangle.breakpoints())
+
+    for x in np.linspace(-10, 10, 201):
+        assert mf(x) == pytest.approx(triangle(x))
+
+
+def test_piecewise_linear_is_zero_out_of_breakpoints():
+    mf = PiecewiseLinear([0, 5, 10], [1, 0.5, 1])
+
+    assert mf(-0.001) == 0
+    assert mf(0) == 1
+    assert mf(10) == 1
+    assert mf(10.001) == 0
+    assert mf.support() == (0, 10)
+    assert mf.core() == (0, 0)
+
+
+@pytest.mark.parametrize("xs, ys", [
+    ([0], [1]), ([0, 1], [1]), ([0, 0, 1], [0, 1, 0]), ([0, 1, 2], [0, 1.5, 0])
+])
+def test_invalid_piecewise_linear_raises_value_error(xs, ys):
+    with pytest.raises(ValueError):
+        PiecewiseLinear(xs, ys)
+
+
+def test_tabulated_function_does_not_exceed_measured_error():
+    mf = Gaussian(0, 1)
+    table = Tabulated(mf, -5, 5, max_error=1e-6)
+    universe = np.linspace(-5, 5, 10007)
+
+    assert table.error <= 1e-6
+    assert np.max(np.abs(table(universe) - mf(universe))) <= 1.5 * table.error
+    assert table(0.3) == pytest.approx(table(np.array([0.3]))[0])
+
+
+def test_tabulated_function_calls_original_one_out_of_range():
+    mf = Sigmoid(0, 2)
+    table = Tabulated(mf, -1, 1, resolution=11)
+
+    assert len(table.table) == 11
+    assert table(3) == mf(3)
+    assert table(np.array([-3., 3.])) == pytest.approx([mf(-3), mf(3)])
+    assert table.support() == mf.support()
+
+
+def test_support_of_tabulated_function_covers_interpolated_samples():
+    table = Tabulated(Triangle(0.05, 1, 2.5), -10, 10, resolution=21)
+    universe = np.linspace(-10, 10, 4001)
+
+    low, high = table.support()
+    nonzero = universe[table(universe) > 0]
+
+    assert (low, high) == (0., 3.)
+    assert low <= nonzero.min() and nonzero.max() <= high
+
+
+@pytest.mark.parametrize("x", [-3., 0.3, 3.])
+def test_tabulated_function_accepts_zero_dimensional_arrays(x):
+    mf = Sigmoid(0, 2)
+    table = Tabulated(mf, -1, 1, resolution=101)
+
+    assert table(np.array(x)) == table(x)
+
+
+@pytest.mark.parametrize("resolution, max_error", [
+    (None, None), (11, 1e-3), (1, None), (None, 1e-30)
+])
+def test_tabulated_raises_when_resolution_is_invalid(resolution, max_error):
+    with pytest.raises(ValueError):
+        Tabulated(Gaussian(0, 1), -5, 5, resolution, max_error, max_resolution=2 ** 12 + 1)
+
+
+def test_bank_rows_are_equal_to_memberships_of_each_function():
+    bank = MembershipBank(_VECTORIZED_FUNCTIONS)
+    universe = np.linspace(-20, 20, 401)
+
+    memberships = bank(universe)
+
+    assert memberships.shape == (len(_VECTORIZED_FUNCTIONS), len(universe))
+    for row, mf in zip(memberships, _VECTORIZED_FUNCTIONS):
+        assert row == pytest.approx(mf(universe))
+    assert bank(3.5) == pytest.approx([mf(3.5) for mf in _VECTORIZED_FUNCTIONS])
+
+
+def test_bank_from_arrays_builds_functions_of_given_kind():
+    bank = MembershipBank.from_arrays(Trapezoid, [0, 1], [1, 2], [2, 3], [3, 4])
+
+    assert [type(mf) for mf in bank.functions] == [Trapezoid, Trapezoid]
+    assert bank(np.array([1.5, 2.5])) == pytest.approx(np.array([[1, 0.5], [0.5, 1]]))
+
+
+@pytest.mark.parametrize("kind, parameters", [
+    (Sigmoid, ([0], [1])), (Gaussian, ([0, 1], [1])), (Triangle, ([0], [1])),
+    (Triangle, ([0], [2], [1]))
+])
+def test_bank_from_invalid_arrays_raises_value_error(kind, parameters):
+    with pytest.raises(ValueError):
+        MembershipBank.from_arrays(kind, *parameters)
+
+
+@pytest.mark.parametrize("mf", [Triangle(0, 5, 10), Trapezoid(-10, -5, 5, 10), Gaussian(10, 4),
+                                PiecewiseLinear([-5, 0, 1, 2, 8], [0, 0.3, 1, 1, 0])])
+def test_analytic_moments_are_equal_to_integrated_ones(mf):
+    x = np.linspace(-50, 50, 200001)
+    memberships = mf(x)
+    step = x[1] - x[0]
+
+    area, moment = mf.moments()
+
+    assert area == pytest.approx(
+        step * (memberships.sum() - (memberships[0] + memberships[-1]) / 2), rel=1e-6)
+    assert moment == pytest.approx(step * (memberships @ x - (memberships[0] * x[0]
+                                                              + memberships[-1] * x[-1]) / 2),
+                                   rel=1e-6, abs=1e-6)
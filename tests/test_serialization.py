@@ -0,0 +1,149 @@
+import json
+import os
+
+from yvain.fuzzy_set import Centroid, AdaptiveSimpson, mean_of_maxima
+from yvain.fuzzy_system import MamdaniSystem, SugenoSystem, when
+from yvain.logical_systems import Product, Yager
+from yvain.membership_functions import Triangle, Gaussian, PiecewiseLinear, Tabulated
+from yvain.serialization import to_definition, from_definition, save, load, definition_hash, \
+    compile_cached, FORMAT_VERSION
+
+import pytest
+
+
+@pytest.fixture
+def serializable_sugeno_system(linear_sugeno_system) -> SugenoSystem:
+    system = linear_sugeno_system()
+    system.rule_set.pop()
+    return system
+
+
+def test_mamdani_system_is_restored_from_definition(tipping_system):
+    system = tipping_system(Yager(2))
+    system.add_input("mood", {
+        "bad": PiecewiseLinear([0, 2, 5], [1, 1, 0]),
+        "good": Tabulated(Gaussian(8, 2), 0, 10, 101),
+    })
+    system.add_rule(when("mood", "bad").and_is("service", "poor").and_is("food", "rancid")
+                    .then("tip", "cheap"))
+    system.add_rule(when("mood", "good").then("tip", "generous"))
+
+    restored = from_definition(json.loads(json.dumps(to_definition(system))))
+
+    assert isinstance(restored.logic, Yager) and restored.logic.p == 2
+    for values in [{"service": 3, "food": 8, "mood": 1}, {"service": 9, "food": 2, "mood": 7}]:
+        assert restored.run(values, (0, 25))["tip"] == pytest.approx(
+            system.run(values, (0, 25))["tip"])
+
+
+def test_defuzzification_and_additive_mode_are_restored(tipping_system):
+    system = tipping_system(Product())
+    system.defuzzify = Centroid(AdaptiveSimpson(1e-8))
+    restored = from_definition(to_definition(system))
+    assert isinstance(restored.defuzzify.integrator, AdaptiveSimpson)
+    assert restored.defuzzify.integrator.tolerance == 1e-8
+
+    system = MamdaniSystem(system.inputs, system.outputs, system.rule_set, Product(),
+                           mean_of_maxima, additive=True)
+    restored = from_definition(to_definition(system))
+    assert restored.additive
+    assert type(restored.defuzzify) is type(mean_of_maxima)
+
+
+def test_sugeno_system_is_saved_and_loaded(tmp_path, serializable_sugeno_system):
+    system = serializable_sugeno_system
+    path = str(tmp_path / "system.json")
+    save(system, path)
+
+    restored = load(path)
+
+    for values in [{"service": 0, "food": 1}, {"service": 4.5, "food": 3},
+                   {"service": 7, "food": 10}]:
+        assert restored.run(values) == pytest.approx(system.run(values))
+
+
+def test_unserializable_system_is_rejected(linear_sugeno_system):
+    with pytest.raises(ValueError):
+        to_definition(linear_sugeno_system())
+
+    system = MamdaniSystem.empty()
+    system.add_input("x", {"low": lambda x: 1 - x})
+    with pytest.raises(ValueError):
+        to_definition(system)
+
+
+def test_definition_of_newer_version_is_rejected(tipping_system):
+    definition = to_definition(tipping_system())
+    definition["version"] = FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError):
+        from_definition(definition)
+
+
+def test_hash_depends_only_on_content(tipping_system):
+    first, second = tipping_system(), tipping_system()
+    assert definition_hash(to_definition(first)) == definition_hash(to_definition(second))
+
+    second.add_output("wage", {"low": Triangle(0, 1, 2)})
+    assert definition_hash(to_definition(first)) != definition_hash(to_definition(second))
+
+
+def test_compiled_engine_is_cached(tmp_path, tipping_system, serializable_sugeno_system):
+    system = tipping_system()
+    directory = str(tmp_path / "cache")
+
+    engine = compile_cached(system, directory).model
+    assert len(os.listdir(directory)) == 1
+
+    cached = compile_cached(to_definition(system), directory)
+    assert len(os.listdir(directory)) == 1
+    assert cached.model.run({"service": 3, "food": 8}, (0, 25))["tip"] == pytest.approx(
+        engine.run({"service": 3, "food": 8}, (0, 25))["tip"])
+    cached.close()
+
+    sugeno = serializable_sugeno_system
+    assert compile_cached(sugeno, directory).model.run({"service": 4.5, "food": 3}) == \
+        pytest.approx(sugeno.run({"service": 4.5, "food": 3}))
+    assert len(os.listdir(directory)) == 2
+
+
+def test_cached_engine_holds_tables_of_given_universes(tmp_path, tipping_system):
+    system = tipping_system()
+    directory = str(tmp_path / "cache")
+
+    cached = compile_cached(system, directory, universes=[(0, 25)])
+    again = compile_cached(to_definition(system), directory, universes=[(0., 25.)])
+
+    assert len(os.listdir(directory)) == 1
+    assert len(again.model.grids) == 1
+    samples = next(iter(again.model.grids.values())).samples
+    assert not samples.flags.writeable and not samples.flags.owndata
+    assert again.model.run({"service": 3, "food": 8}, (0, 25))["tip"] == pytest.approx(
+        system.run({"service": 3, "food": 8}, (0, 25))["tip"])
+    assert len(again.model.grids) == 1
+    assert not compile_cached(system, directory).model.grids
+    cached.close()
+    again.close()
+
+
+def test_cached_engine_depends_on_library(tmp_path, monkeypatch, tipping_system):
+    system = tipping_system()
+    directory = str(tmp_path / "cache")
+    compile_cached(system, directory)
+
+    monkeypatch.setattr("yvain.serialization._library_tag", lambda: "other library")
+    compile_cached(system, directory)
+
+    assert len(os.listdir(directory)) == 2
+
+
+@pytest.mark.parametrize("malformed", [
+    {"format": "yvain", "version": 1},
+    {"format": "yvain", "version": 1, "type": "sugeno", "logic": {"type": "Zadeh"}, "inputs": {}},
+    {"format": "yvain", "version": 1, "type": "sugeno", "logic": {"type": "Zadeh"}, "inputs": {},
+     "rules": [{"if": {"is": ["x"]}, "compute": {"constant": 1, "coefficients": {}}}]},
+    ["not", "a", "definition"],
+])
+def test_malformed_definition_is_rejected(malformed):
+    with pytest.raises(ValueError):
+        from_definition(malformed)
@@ -0,0 +1,109 @@
+import gc
+import multiprocessing
+
+from yvain.control_surface import tabulate
+from yvain.shared import export_shared, attach_shared
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def tipping_engine(tipping_system):
+    engine = tipping_system().compile()
+    engine.grid(0, 25)
+    return engine
+
+
+def _run_attached(name, queue):
+    shared = attach_shared(name=name)
+    queue.put(shared.model.run({"service": 3, "food": 8}, (0, 25))["tip"])
+    shared.close()
+
+
+def test_model_attached_in_other_process_gives_the_same_result(tipping_engine):
+    engine = tipping_engine
+    shared = export_shared(engine)
+    try:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_run_attached, args=(shared.name, queue))
+        process.start()
+        result = queue.get(timeout=30)
+        process.join()
+    finally:
+        shared.close()
+        shared.unlink()
+
+    assert result == pytest.approx(engine.run({"service": 3, "food": 8}, (0, 25))["tip"])
+
+
+def test_attached_arrays_are_read_only_views(tipping_engine):
+    shared = export_shared(tipping_engine)
+    attached = attach_shared(name=shared.name)
+    try:
+        samples = attached.model.grid(0, 25).samples
+        assert not samples.flags.writeable
+        assert not samples.flags.owndata
+        with pytest.raises(ValueError):
+            samples[0, 0] = 1
+    finally:
+        attached.close()
+        shared.close()
+        shared.unlink()
+
+
+def test_model_exported_to_file_is_memory_mapped(tmp_path, tipping_engine):
+    engine = tipping_engine
+    path = str(tmp_path / "engine.bin")
+    export_shared(engine, path=path).close()
+
+    attached = attach_shared(path=path)
+    try:
+        assert attached.model.run({"service": 7, "food": 2}, (0, 25))["tip"] == pytest.approx(
+            engine.run({"service": 7, "food": 2}, (0, 25))["tip"])
+    finally:
+        attached.close()
+
+
+def test_control_surface_table_is_shared(tmp_path):
+    surface = tabulate(lambda batch: {"z": np.sin(batch["x"]) * batch["y"]},
+                       {"x": (0, 3, 31), "y": (0, 2, 21)})["z"]
+    path = str(tmp_path / "surface.bin")
+    export_shared(surface, path=path).close()
+
+    attached = attach_shared(path=path)
+    try:
+        assert not attached.model.values.flags.writeable
+        assert attached.model({"x": 1.1, "y": 0.3}) == pytest.approx(surface({"x": 1.1, "y": 0.3}))
+    finally:
+        attached.close()
+
+
+def test_attach_requires_either_name_or_path():
+    with pytest.raises(ValueError):
+        attach_shared()
+    with pytest.raises(ValueError):
+        attach_shared(name="model", path="model.bin")
+
+
+@pytest.mark.parametrize("to_file", [False, True])
+def test_model_outlives_dropped_and_closed_handles(to_file, tmp_path, tipping_engine):
+    engine = tipping_engine
+    path = str(tmp_path / "engine.bin") if to_file else None
+    shared = export_shared(engine, path=path)
+    try:
+        attached = attach_shared(path=path) if to_file else attach_shared(name=shared.name)
+        dropped = (attach_shared(path=path) if to_file else attach_shared(name=shared.name)).model
+        model = attached.model
+        attached.close()
+        del attached
+        gc.collect()
+
+        for worker_engine in (model, dropped):
+            assert worker_engine.grid(0, 25).samples.sum() == pytest.approx(
+                engine.grid(0, 25).samples.sum())
+            assert worker_engine.run({"service": 3, "food": 8}, (0, 25))["tip"] == pytest.approx(
+                engine.run({"service": 3, "food": 8}, (0, 25))["tip"])
+    finally:
+        shared.close()
+        shared.unlink()
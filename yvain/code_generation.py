@@ -0,0 +1,216 @@
+"""
+Generating python source of inference functions. Formulas of predefined membership
+functions and norms of `Zadeh` and `Product` logics are inlined as plain python
+expressions, other functions are bound as constants and called. Generated source is
+compiled once - running it costs single function call, without any calls between
+nodes of compiled rules.
+"""
+
+from contextlib import contextmanager
+from math import exp, inf, isclose
+from typing import Any, Dict, Iterator, List, Sequence
+
+from yvain.logical_systems import LogicalSystem, Zadeh, Product
+from yvain.membership_functions import MembershipFunction, Triangle, Trapezoid, Gaussian, \
+    Bell, Sigmoid, PiecewiseLinear, support
+
+MAX_INLINED_BREAKPOINTS = 16
+
+_BUILTINS = {"exp": exp, "inf": inf, "isclose": isclose}
+
+
+class GeneratedFunction:
+    """
+    Function compiled from generated source. Source is kept in `source` for auditing,
+    objects which cannot be inlined are kept in `constants`. Calling `run` directly
+    avoids one level of indirection of calling the object itself.
+    """
+
+    def __call__(self, *args: Any) -> Any:
+        return self.run(*args)
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "source": self.source, "constants": self.constants}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["name"], state["source"], state["constants"])
+
+    def __init__(self, name: str, source: str, constants: Dict[str, Any]):
+        """
+        :param name: Name of function defined by source
+        :param source: Python source defining the function
+        :param constants: Objects referred by the source
+        """
+
+        namespace = dict(_BUILTINS, **constants)
+        exec(compile(source, f"<generated {name}>", "exec"), namespace)
+
+        self.name = name
+        self.source = source
+        self.constants = constants
+        self.run = namespace[name]
+
+
+class SourceBuilder:
+    """
+    Source of single function built line by line
+    """
+
+    def line(self, text: str):
+        self.lines.append("    " * self.indent + text)
+
+    @contextmanager
+    def block(self, header: str) -> Iterator[None]:
+        """
+        :param header: Statement opening indented block, e.g. `if x:`
+        """
+
+        self.line(header)
+        self.indent += 1
+        yield
+        self.indent -= 1
+
+    def assign(self, expression: str, prefix: str = "t") -> str:
+        """
+        :param expression: Expression evaluated once
+        :param prefix: Prefix of variable name
+        :return: Name of new variable holding result of expression
+        """
+
+        name = f"{prefix}{self._variables.get(prefix, 0)}"
+        self._variables[prefix] = self._variables.get(prefix, 0) + 1
+        self.line(f"{name} = {expression}")
+        return name
+
+    def constant(self, value: Any, prefix: str = "c") -> str:
+        """
+        :param value: Object referred by the source, bound once no matter how many times referred
+        :param prefix: Prefix of constant name
+        :return: Name of constant
+        """
+
+        name = self._bound.get(id(value))
+        if name is None:
+            name = f"{prefix}{len(self.constants)}"
+            self._bound[id(value)] = name
+            self.constants[name] = value
+
+        return name
+
+    @staticmethod
+    def literal(value: float) -> str:
+        """
+        :return: Source of float literal, infinities included
+        """
+
+        value = float(value)
+        if value == inf:
+            return "inf"
+        if value == -inf:
+            return "(-inf)"
+        return repr(value)
+
+    def membership(self, function: MembershipFunction, x: str) -> str:
+        """
+        Membership of single value. Out of function support membership is equal to 0,
+        as during fuzzification of compiled engine.
+
+        :param function: Membership function
+        :param x: Name of variable holding crisp value
+        :return: Expression computing membership
+        """
+
+        literal = self.literal
+        if isinstance(function, Triangle):
+            a, b, c = function.a, function.b, function.c
+            return (f"({x} - {literal(a)}) / {literal(b - a)} "
+                    f"if {literal(a)} <= {x} <= {literal(b)} else "
+                    f"({literal(c)} - {x}) / {literal(c - b)} "
+                    f"if {literal(b)} <= {x} <= {literal(c)} else 0")
+        if isinstance(function, Trapezoid):
+            a, b, c, d = function.a, function.b, function.c, function.d
+            return (f"({x} - {literal(a)}) / {literal(b - a)} "
+                    f"if {literal(a)} <= {x} <= {literal(b)} else "
+                    f"1 if {literal(b)} <= {x} <= {literal(c)} else "
+                    f"({literal(d)} - {x}) / {literal(d - c)} "
+                    f"if {literal(c)} <= {x} <= {literal(d)} else 0")
+        if isinstance(function, PiecewiseLinear) and len(function.xs) <= MAX_INLINED_BREAKPOINTS:
+            xs, ys = function.xs, function.ys
+            parts = [f"0 if {x} < {literal(xs[0])} else"]
+            for x0, x1, y0, y1 in zip(xs[:-1], xs[1:], ys[:-1], ys[1:]):
+                parts.append(f"{literal(y0)} + {literal(y1 - y0)} * ({x} - {literal(x0)}) / "
+                             f"{literal(x1 - x0)} if {x} < {literal(x1)} else")
+            parts.append(f"{literal(ys[-1])} if {x} == {literal(xs[-1])} else 0")
+            return " ".join(parts)
+
+        if isinstance(function, Gaussian):
+            expression = (f"exp(-0.5 * ((({x} - {literal(function.mu)}) / "
+                          f"{literal(function.sigma)}) ** 2))")
+        elif isinstance(function, Bell):
+            expression = (f"1 / (1 + (abs(({x} - {literal(function.mu)}) / "
+                          f"{literal(function.sigma)}) ** {literal(2 * function.gamma)}))")
+        elif isinstance(function, Sigmoid):
+            expression = f"1 / (1 + exp({literal(-function.b)} * ({x} - {literal(function.a)})))"
+        else:
+            expression = f"{self.constant(function, 'f')}({x})"
+
+        low, high = support(function)
+        if low == -inf and high == inf:
+            return expression
+        bounds = (f"{literal(low)} <= " if low != -inf else "") + x + \
+                 (f" <= {literal(high)}" if high != inf else "")
+        return f"({expression}) if {bounds} else 0."
+
+    def t_norm(self, logic: LogicalSystem, operands: Sequence[str]) -> str:
+        """
+        :param logic: Logical system providing t-norm
+        :param operands: Names of variables holding memberships
+        :return: Name of variable holding t-norm of all operands
+        """
+
+        if type(logic) is Zadeh:
+            return self.assign(f"min({', '.join(operands)})", "s")
+        if type(logic) is Product:
+            return self.assign(" * ".join(operands), "s")
+
+        return self._reduce(self.constant(logic.t_norm_values, "t_norm"), operands)
+
+    def t_conorm(self, logic: LogicalSystem, operands: Sequence[str]) -> str:
+        """
+        :param logic: Logical system providing t-conorm
+        :param operands: Names of variables holding memberships
+        :return: Name of variable holding t-conorm of all operands
+        """
+
+        if type(logic) is Zadeh:
+            return self.assign(f"max({', '.join(operands)})", "s")
+        if type(logic) is Product:
+            result = operands[0]
+            for operand in operands[1:]:
+                result = self.assign(f"{result} + {operand} - {result} * {operand}", "s")
+            return result
+
+        return self._reduce(self.constant(logic.t_conorm_values, "t_conorm"), operands)
+
+    def _reduce(self, norm: str, operands: Sequence[str]) -> str:
+        expression = operands[0]
+        for operand in operands[1:]:
+            expression = f"{norm}({expression}, {operand})"
+        return self.assign(expression, "s")
+
+    def build(self, name: str, parameters: Sequence[str]) -> GeneratedFunction:
+        """
+        :param name: Name of generated function
+        :param parameters: Names of function parameters
+        :return: Function compiled from lines added so far
+        """
+
+        source = "\n".join([f"def {name}({', '.join(parameters)}):"] + self.lines) + "\n"
+        return GeneratedFunction(name, source, dict(self.constants))
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.indent = 1
+        self.constants: Dict[str, Any] = {}
+        self._bound: Dict[int, str] = {}
+        self._variables: Dict[str, int] = {}
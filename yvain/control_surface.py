@@ -0,0 +1,202 @@
+"""
+Control surfaces - fuzzy systems with few inputs precomputed over grid of inputs.
+Surface answers queries with multilinear interpolation between grid nodes, so
+inference costs constant time and does not involve any fuzzy machinery.
+"""
+
+from array import array
+from itertools import product
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+GridSpec = Dict[str, Tuple[float, float, int]]
+Inputs = Dict[str, Union[float, np.ndarray]]
+
+
+class ControlSurface:
+    """
+    Output of system sampled on regular grid of inputs. Values out of grid are
+    clamped to its bounds. Interpolation error measured at centers of grid cells
+    is stored in `error`.
+    """
+
+    def __call__(self, values: Inputs) -> Union[float, np.ndarray]:
+        """
+        :param values: Crisp value (or array of values) of each input variable
+        :raise KeyError: When value of some input variable is not given
+        :return: Interpolated output, array when any input is array
+        """
+
+        if any(isinstance(values[name], np.ndarray) for name in self.names):
+            return self._interpolate_batch(values)
+
+        offsets = []
+        for name, start, scale, count, stride in zip(
+                self.names, self.starts, self.scales, self.counts, self.strides):
+            position = min(max((values[name] - start) * scale, 0.), count - 1.)
+            i = min(int(position), count - 2)
+            offsets.append((i * stride, (i + 1) * stride, position - i))
+
+        result = 0.
+        for corner in product((0, 1), repeat=len(offsets)):
+            weight, offset = 1., 0
+            for upper, (lower_offset, upper_offset, ratio) in zip(corner, offsets):
+                if upper:
+                    weight *= ratio
+                    offset += upper_offset
+                else:
+                    weight *= 1 - ratio
+                    offset += lower_offset
+            result += weight * self.table[offset]
+
+        return result
+
+    def _interpolate_batch(self, values: Inputs) -> np.ndarray:
+        """
+        :return: Interpolated output for each sample
+        """
+
+        columns = np.broadcast_arrays(
+            *[np.asarray(values[name], dtype=float) for name in self.names])
+        offsets = []
+        for column, start, scale, count, stride in zip(
+                columns, self.starts, self.scales, self.counts, self.strides):
+            position = np.clip((column - start) * scale, 0., count - 1.)
+            i = np.minimum(position.astype(int), count - 2)
+            offsets.append((i * stride, (i + 1) * stride, position - i))
+
+        result = np.zeros(columns[0].shape)
+        for corner in product((0, 1), repeat=len(offsets)):
+            weight, offset = 1., 0
+            for upper, (lower_offset, upper_offset, ratio) in zip(corner, offsets):
+                weight = weight * (ratio if upper else 1 - ratio)
+                offset = offset + (upper_offset if upper else lower_offset)
+            result += weight * self.values[offset]
+
+        return result
+
+    def to_array(self) -> np.ndarray:
+        """
+        Flat representation: number of inputs, `start, end, count` of each input,
+        measured error and sampled values.
+
+        :return: Flat array of floats describing whole surface
+        """
+
+        header = [len(self.names)]
+        for start, end, count in zip(self.starts, self.ends, self.counts):
+            header.extend([start, end, count])
+        header.append(self.error)
+
+        return np.concatenate([np.array(header, dtype=float), self.values])
+
+    @classmethod
+    def from_array(cls, flat: np.ndarray, names: Sequence[str]) -> 'ControlSurface':
+        """
+        :param flat: Array created by `to_array`
+        :param names: Name of each input, in the same order as during tabulation
+        :raise ValueError: When array is malformed or number of names does not match it
+        :return: Surface described by array
+        """
+
+        flat = np.asarray(flat, dtype=float)
+        if len(flat) == 0 or int(flat[0]) != len(names):
+            raise ValueError(f"Array does not describe surface of {len(names)} inputs")
+
+        axes = flat[1:1 + 3 * len(names)].reshape(len(names), 3)
+        counts = tuple(int(count) for count in axes[:, 2])
+        values = flat[2 + 3 * len(names):]
+        if len(values) != np.prod(counts, dtype=int):
+            raise ValueError(f"Expected {np.prod(counts, dtype=int)} values, got {len(values)}")
+
+        return cls({name: (start, end, count) for name, (start, end, _), count
+                    in zip(names, axes, counts)},
+                   values.reshape(counts), float(flat[1 + 3 * len(names)]))
+
+    def save(self, path: str):
+        """
+        :param path: File to which flat array of float64 values is written
+        """
+
+        self.to_array().tofile(path)
+
+    @classmethod
+    def load(cls, path: str, names: Sequence[str]) -> 'ControlSurface':
+        """
+        :param path: File written by `save`
+        :param names: Name of each input, in the same order as during tabulation
+        :return: Surface read from file
+        """
+
+        return cls.from_array(np.fromfile(path, dtype=float), names)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["values"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.values = np.frombuffer(self.table)
+
+    def __init__(self, grid_spec: GridSpec, values: np.ndarray, error: float):
+        """
+        :param grid_spec: Lowest value, highest value and number of nodes for each input
+        :param values: Output at each grid node, one axis for each input
+        :param error: Measured interpolation error
+        :raise ValueError: When any input has less than 2 nodes or empty range, or values
+                           do not match the grid
+        """
+
+        for name, (start, end, count) in grid_spec.items():
+            if count < 2 or start >= end:
+                raise ValueError(
+                    f"Grid of {name} requires at least 2 nodes and non-empty range, "
+                    f"got {count} nodes in [{start}, {end}]")
+
+        self.names = tuple(grid_spec)
+        self.starts = tuple(float(start) for start, _, _ in grid_spec.values())
+        self.ends = tuple(float(end) for _, end, _ in grid_spec.values())
+        self.counts = tuple(int(count) for _, _, count in grid_spec.values())
+        if np.shape(values) != self.counts:
+            raise ValueError(f"Values of shape {np.shape(values)} do not match grid {self.counts}")
+
+        self.scales = tuple((count - 1) / (end - start)
+                            for start, end, count in zip(self.starts, self.ends, self.counts))
+        self.strides = tuple(int(np.prod(self.counts[i + 1:], dtype=int))
+                             for i in range(len(self.counts)))
+        self.table = array("d", np.ravel(values).astype(float))
+        self.values = np.frombuffer(self.table)
+        self.error = error
+
+
+def tabulate(function: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]],
+             grid_spec: GridSpec) -> Dict[str, ControlSurface]:
+    """
+    Evaluate function in batch over grid nodes and over centers of grid cells,
+    the latter ones are used to measure interpolation error.
+
+    :param function: Function computing each output for batch of inputs
+    :param grid_spec: Lowest value, highest value and number of nodes for each input
+    :raise ValueError: When grid is invalid
+    :return: Surface interpolating each output over the grid
+    """
+
+    axes = [np.linspace(start, end, count) for start, end, count in grid_spec.values()]
+    nodes = np.meshgrid(*axes, indexing="ij")
+    centers = np.meshgrid(*[(axis[:-1] + axis[1:]) / 2 for axis in axes], indexing="ij")
+    centers = {name: center.ravel() for name, center in zip(grid_spec, centers)}
+
+    outputs = function({name: node.ravel() for name, node in zip(grid_spec, nodes)})
+    exact = function(centers)
+
+    surfaces = {}
+    for name, values in outputs.items():
+        surface = ControlSurface(
+            grid_spec, np.asarray(values, dtype=float).reshape(nodes[0].shape), 0.)
+        difference = np.abs(np.asarray(exact[name], dtype=float) - surface(centers))
+        surface.error = float(np.nanmax(difference)) if np.any(~np.isnan(difference)) else 0.
+        surfaces[name] = surface
+
+    return surfaces
@@ -3,42 +3,191 @@ Fuzzy set abstractions and utilities
 """
 
 from math import ceil
-from typing import Callable
+from typing import Callable, Tuple, Optional, Sequence, Dict
 
-from yvain.logical_systems import LogicalSystem, Zadeh
-from yvain.membership_functions import MembershipFunction
+import numpy as np
 
+from yvain.logical_systems import LogicalSystem, Zadeh, Product
+from yvain.membership_functions import MembershipFunction, evaluate, Polygon, Numeric, Interval, \
+    Tabulated, PiecewiseLinear, support
 
-def _integrate(function: Callable[[float, ], float],
-               start: float, end: float, n: int) -> float:
-    """
-    Calculate defined integral of given `function` in range of
-    [start, end]
 
-    :param function: Function to integrate
-    :param start: Left bound
-    :param end: Right bound
-    :param n: Number of parabolas used to compute integral
-    :raise ValueError: When n is not even
-    :raise ValueError: When start is greater or equal to end
-    :return: Field of area under given `function`
-    """
-    if n % 2 != 0:
-        raise ValueError("In Simpson rule n have to be even")
+SAMPLES_BUDGET = 2 ** 21
+"""
+Maximal number of floats sampled at once by vectorized computations (16 MB),
+larger ones are split into chunks.
+"""
+
+
+def _validate_bounds(start: float, end: float):
     if start >= end:
         raise ValueError(
             f"Upper bound ({end}) is lesser or equal to lower ({start})")
 
-    step = (end - start) / n
 
-    _sum = function(start) + function(end)
-    for i in range(1, n):
-        if i % 2 == 0:
-            _sum += 2 * function(start + i * step)
-        else:
-            _sum += 4 * function(start + i * step)
+class Integrator:
+    """
+    Numerical integration used by defuzzification. Integrator computes area under
+    membership function together with its first moment (integral of :math:`x\\mu(x)`)
+    from the same membership samples.
+    """
+
+    def moments(self, function: MembershipFunction, start: float, end: float) \
+            -> Tuple[float, float]:
+        """
+        :param function: Function to integrate
+        :param start: Left bound
+        :param end: Right bound
+        :raise ValueError: When start is greater or equal to end
+        :return: Integral of :math:`\\mu(x)` and :math:`x\\mu(x)` in range of [start, end]
+        """
+
+        raise NotImplementedError
+
+
+class Simpson(Integrator):
+    """
+    Simpson rule over fixed grid. Whole grid is evaluated with single
+    (vectorized if possible) membership function call.
+    """
+
+    def grid(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points and weights of Simpson rule, integral of function is equal to
+        weighted sum of function values at returned points.
+
+        :param start: Left bound
+        :param end: Right bound
+        :raise ValueError: When start is greater or equal to end
+        :return: Points and they'r weights
+        """
+
+        _validate_bounds(start, end)
+        n = self.resolution(start, end)
+        step = (end - start) / n
+
+        weights = np.full(n + 1, 2.)
+        weights[1::2] = 4.
+        weights[0] = weights[-1] = 1.
+
+        return start + step * np.arange(n + 1), weights * (step / 3)
+
+    def resolution(self, start: float, end: float) -> int:
+        """
+        :param start: Left bound
+        :param end: Right bound
+        :return: Number of parabolas used to integrate over [start, end]
+        """
+
+        return self.n if self.n is not None else int(ceil(end - start)) * self.per_unit
+
+    def moments(self, function: MembershipFunction, start: float, end: float) \
+            -> Tuple[float, float]:
+        points, weights = self.grid(start, end)
+        memberships = evaluate(function, points)
+
+        return float(memberships @ weights), float(memberships @ (weights * points))
+
+    def __init__(self, n: Optional[int] = None, per_unit: int = 100):
+        """
+        :param n: Number of parabolas used to compute integral
+        :param per_unit: Number of parabolas per unit of universe width, used when
+                         `n` is not given
+        :raise ValueError: When n is not even
+        """
+
+        if n is not None and n % 2 != 0:
+            raise ValueError("In Simpson rule n have to be even")
+        if n is None and per_unit % 2 != 0:
+            raise ValueError("In Simpson rule per_unit have to be even")
+
+        self.n = n
+        self.per_unit = per_unit
+
+
+class AdaptiveSimpson(Integrator):
+    """
+    Adaptive Simpson rule. Intervals are bisected until estimated error is within
+    `tolerance`, so flat parts of membership function cost few evaluations regardless
+    of universe width. All intervals on the same level of bisection are evaluated
+    with single (vectorized if possible) membership function call.
+    """
+
+    def moments(self, function: MembershipFunction, start: float, end: float) \
+            -> Tuple[float, float]:
+        _validate_bounds(start, end)
+
+        n = self.initial_intervals
+        edges = np.linspace(start, end, n + 1)
+        a, b = edges[:-1], edges[1:]
+        m = (a + b) / 2
+        samples = evaluate(function, np.concatenate([edges, m]))
+        fa, fb, fm = samples[:n], samples[1:n + 1], samples[n + 1:]
+        whole = self._simpson(a, b, fa, fm, fb)
+        tolerance = np.full(n, self.tolerance / n)
+        scale = np.array([1., max(abs(start), abs(end), 1.)])
 
-    return (step / 3) * _sum
+        area, moment = 0., 0.
+        for depth in range(self.max_depth):
+            left_m, right_m = (a + m) / 2, (m + b) / 2
+            samples = evaluate(function, np.concatenate([left_m, right_m]))
+            f_left_m, f_right_m = samples[:len(a)], samples[len(a):]
+
+            left = self._simpson(a, m, fa, f_left_m, fm)
+            right = self._simpson(m, b, fm, f_right_m, fb)
+            error = left + right - whole
+            done = np.all(np.abs(error) <= 15 * tolerance[:, np.newaxis] * scale, axis=1)
+            if depth == self.max_depth - 1:
+                done[:] = True
+
+            accepted = (left + right + error / 15)[done].sum(axis=0)
+            area += accepted[0]
+            moment += accepted[1]
+
+            todo = ~done
+            if not todo.any():
+                break
+
+            a, m, b = (np.concatenate([a[todo], m[todo]]),
+                       np.concatenate([left_m[todo], right_m[todo]]),
+                       np.concatenate([m[todo], b[todo]]))
+            fa, fm, fb = (np.concatenate([fa[todo], fm[todo]]),
+                          np.concatenate([f_left_m[todo], f_right_m[todo]]),
+                          np.concatenate([fm[todo], fb[todo]]))
+            whole = np.concatenate([left[todo], right[todo]])
+            tolerance = np.concatenate([tolerance[todo], tolerance[todo]]) / 2
+
+        return float(area), float(moment)
+
+    @staticmethod
+    def _simpson(a: np.ndarray, b: np.ndarray,
+                 fa: np.ndarray, fm: np.ndarray, fb: np.ndarray) -> np.ndarray:
+        """
+        :return: Simpson estimation of area and first moment for each interval as columns
+        """
+
+        width = (b - a) / 6
+        return np.stack([
+            width * (fa + 4 * fm + fb),
+            width * (a * fa + 2 * (a + b) * fm + b * fb)
+        ], axis=1)
+
+    def __init__(self, tolerance: float = 1e-6, initial_intervals: int = 64,
+                 max_depth: int = 30):
+        """
+        :param tolerance: Maximal absolute error of integrated area. Error of first moment
+                          is scaled by the largest absolute value of the bounds
+        :param initial_intervals: Number of intervals sampled before adaptation starts.
+                                  Features narrower than single interval may be missed
+        :param max_depth: Maximal number of bisections of initial interval
+        """
+
+        if tolerance <= 0:
+            raise ValueError(f"Tolerance have to be positive, got {tolerance}")
+
+        self.tolerance = tolerance
+        self.initial_intervals = initial_intervals
+        self.max_depth = max_depth
 
 
 class FuzzySet:
@@ -92,6 +241,32 @@ class FuzzySet:
             self.logic.t_conorm(self.membership_function, other_set.membership_function),
             self.logic)
 
+    def tabulated(self, start: float, end: float, resolution: Optional[int] = None,
+                  max_error: Optional[float] = None) -> 'FuzzySet':
+        """
+        Freeze membership function (e.g. one composed of many unions and intersections)
+        into lookup table. See `Tabulated`.
+
+        :param start: Lowest tabulated value
+        :param end: Highest tabulated value
+        :param resolution: Number of samples
+        :param max_error: Maximal measured approximation error
+        :return: Fuzzy set which membership is interpolated from lookup table
+        """
+
+        return FuzzySet(Tabulated(self.membership_function, start, end, resolution, max_error),
+                        self.logic)
+
+    def discretize(self, universe: np.ndarray) -> 'DiscreteFuzzySet':
+        """
+        :param universe: Increasing grid of elements
+        :return: Fuzzy set with memberships sampled at each element of `universe`
+        """
+
+        universe = np.asarray(universe, dtype=float)
+        return DiscreteFuzzySet(universe, evaluate(self.membership_function, universe),
+                                self.logic)
+
     __invert__ = complement
     __or__ = union
     __and__ = intersection
@@ -107,20 +282,523 @@ class FuzzySet:
         self.logic = logic
 
 
+class DiscreteFuzzySet:
+    """
+    Fuzzy set sampled on grid of elements. Memberships are kept in array, so
+    complement, intersection and union are single elementwise operations instead of
+    new functions wrapping old ones. Sets combined with each other have to share the
+    same universe.
+    """
+
+    def membership(self, x: Numeric) -> Numeric:
+        """
+        :param x: Element or array of elements
+        :return: Membership interpolated linearly between grid elements, 0 out of the grid
+        """
+
+        return np.interp(x, self.universe, self.memberships, left=0., right=0.)
+
+    def complement(self) -> 'DiscreteFuzzySet':
+        """
+        :return: Complementary fuzzy set where all memberships are reversed
+        """
+
+        return DiscreteFuzzySet(self.universe, self.logic.complement_values(self.memberships),
+                                self.logic)
+
+    def intersection(self, other_set: 'DiscreteFuzzySet') -> 'DiscreteFuzzySet':
+        """
+        :param other_set: Second fuzzy set, sampled on the same universe
+        :raise ValueError: When universes of sets differ
+        :return: Common part of `self` and `other_set`
+        """
+
+        self._validate_universe(other_set)
+        return DiscreteFuzzySet(
+            self.universe, self.logic.t_norm_values(self.memberships, other_set.memberships),
+            self.logic)
+
+    def union(self, other_set: 'DiscreteFuzzySet') -> 'DiscreteFuzzySet':
+        """
+        :param other_set: Second fuzzy set, sampled on the same universe
+        :raise ValueError: When universes of sets differ
+        :return: Union of `self` and `other_set`
+        """
+
+        self._validate_universe(other_set)
+        return DiscreteFuzzySet(
+            self.universe, self.logic.t_conorm_values(self.memberships, other_set.memberships),
+            self.logic)
+
+    def centroid(self) -> float:
+        """
+        :return: Center of mass of the set, integrated with trapezoidal rule over the grid
+        """
+
+        steps = np.diff(self.universe)
+        weights = np.zeros(len(self.universe))
+        weights[:-1] += steps / 2
+        weights[1:] += steps / 2
+        field = self.memberships @ weights
+        self._validate_not_empty(field)
+
+        return float((self.memberships * self.universe) @ weights / field)
+
+    def bisector(self) -> float:
+        """
+        :return: Element dividing area under the set into two equal parts
+        """
+
+        steps = np.diff(self.universe)
+        segments = steps * (self.memberships[:-1] + self.memberships[1:]) / 2
+        area = np.concatenate([[0.], np.cumsum(segments)])
+        self._validate_not_empty(area[-1])
+
+        i = min(int(np.searchsorted(area, area[-1] / 2)), len(area) - 1)
+        if i == 0:
+            return float(self.universe[0])
+        ratio = (area[-1] / 2 - area[i - 1]) / (area[i] - area[i - 1])
+        return float(self.universe[i - 1] + ratio * steps[i - 1])
+
+    def maxima(self) -> np.ndarray:
+        """
+        :return: Elements with the highest membership
+        """
+
+        peak = self.memberships.max()
+        self._validate_not_empty(peak)
+
+        return self.universe[np.isclose(self.memberships, peak, rtol=0., atol=1e-12)]
+
+    def mean_of_maxima(self) -> float:
+        """
+        :return: Mean of elements with the highest membership
+        """
+
+        return float(self.maxima().mean())
+
+    def smallest_of_maxima(self) -> float:
+        """
+        :return: Smallest element with the highest membership
+        """
+
+        return float(self.maxima()[0])
+
+    def largest_of_maxima(self) -> float:
+        """
+        :return: Largest element with the highest membership
+        """
+
+        return float(self.maxima()[-1])
+
+    def weighted_average(self) -> float:
+        """
+        :return: Mean of grid elements weighted by they'r memberships
+        """
+
+        total = self.memberships.sum()
+        self._validate_not_empty(total)
+
+        return float(self.memberships @ self.universe / total)
+
+    @staticmethod
+    def _validate_not_empty(measure: float):
+        if measure <= 0:
+            raise ValueError("Empty fuzzy set cannot be defuzzified")
+
+    def to_fuzzy_set(self) -> FuzzySet:
+        """
+        :return: Functional fuzzy set with membership interpolated linearly between grid elements
+        """
+
+        return FuzzySet(PiecewiseLinear(self.universe, np.clip(self.memberships, 0., 1.)),
+                        self.logic)
+
+    def _validate_universe(self, other_set: 'DiscreteFuzzySet'):
+        if other_set.universe is not self.universe \
+                and not np.array_equal(other_set.universe, self.universe):
+            raise ValueError("Fuzzy sets sampled on different universes cannot be combined")
+
+    __invert__ = complement
+    __or__ = union
+    __and__ = intersection
+
+    def __init__(self, universe: np.ndarray, memberships: np.ndarray,
+                 logic: LogicalSystem = Zadeh()):
+        """
+        :param universe: Strictly increasing grid of elements
+        :param memberships: Membership of each element of `universe`
+        :param logic: Norms used to perform intersection, union and negation
+        :raise ValueError: When arrays shapes differ or universe is not strictly increasing
+        """
+
+        if np.shape(universe) != np.shape(memberships) or np.ndim(universe) != 1:
+            raise ValueError(
+                f"Universe and memberships have to be 1-D arrays of the same shape, "
+                f"got {np.shape(universe)} and {np.shape(memberships)}")
+        if np.any(np.diff(universe) <= 0):
+            raise ValueError("Universe have to be strictly increasing")
+
+        self.universe = universe
+        self.memberships = memberships
+        self.logic = logic
+
+
+class Aggregation:
+    """
+    Membership function of union of fuzzy sets implied by rules, i.e.
+    t-conorm of all t-norms of firing strength and consequent membership.
+    Implied sets are kept in flat collection and reduced in single pass, so
+    evaluation cost does not depend on the order in which rules were added and
+    stack depth does not grow with number of rules. Each distinct consequent is
+    evaluated only once per call.
+    """
+
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            memberships = [evaluate(consequent, x) for consequent in self.consequents]
+        else:
+            memberships = [consequent(x) for consequent in self.consequents]
+
+        return self.logic.t_conorm_many(
+            self.logic.t_norm_values(strength, memberships[index])
+            for strength, index in zip(self.strengths, self.indices)
+        )
+
+    def __init__(self, implied: Sequence[Tuple[float, MembershipFunction]],
+                 logic: LogicalSystem):
+        """
+        :param implied: Firing strength and consequent membership function of each rule
+        :param logic: Norms used for implication and aggregation
+        """
+
+        positions = {}
+        self.consequents = []
+        self.indices = []
+        self.strengths = []
+        for strength, consequent in implied:
+            if id(consequent) not in positions:
+                positions[id(consequent)] = len(self.consequents)
+                self.consequents.append(consequent)
+            self.indices.append(positions[id(consequent)])
+            self.strengths.append(strength)
+
+        self.logic = logic
+
+
 DefuzzificationMethod = Callable[[FuzzySet, float, float], float]
 
 
-def centroid(fuzzy_set: FuzzySet, start: float, end: float) -> float:
+class Centroid:
+    """
+    Center of mass of fuzzy set, computed with chosen integrator.
+    """
+
+    def __call__(self, fuzzy_set: FuzzySet, start: float, end: float) -> float:
+        """
+        :param fuzzy_set: Set to defuzzify
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :return: Center of mass for given fuzzy set
+        """
+
+        field, x_field = self.integrator.moments(fuzzy_set.membership, start, end)
+
+        return x_field / field
+
+    def over(self, fuzzy_set: FuzzySet, intervals: Sequence[Interval],
+             start: float, end: float) -> float:
+        """
+        Center of mass of fuzzy set which membership is equal to 0 out of given
+        intervals (e.g. supports of implied sets). Only they'r union is integrated.
+
+        :param fuzzy_set: Set to defuzzify
+        :param intervals: Possibly overlapping intervals covering support of `fuzzy_set`
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :return: Center of mass for given fuzzy set
+        """
+
+        _validate_bounds(start, end)
+        union = []
+        for low, high in sorted(intervals):
+            low, high = max(low, start), min(high, end)
+            if low >= high:
+                continue
+            if union and low <= union[-1][1]:
+                union[-1][1] = max(union[-1][1], high)
+            else:
+                union.append([low, high])
+
+        field, x_field = 0., 0.
+        for low, high in union:
+            interval_field, interval_x_field = self.integrator.moments(
+                fuzzy_set.membership, low, high)
+            field += interval_field
+            x_field += interval_x_field
+
+        return x_field / field
+
+    def __init__(self, integrator: Integrator = Simpson()):
+        """
+        :param integrator: Integrator used to compute area and moment of fuzzy set
+        """
+
+        self.integrator = integrator
+
+
+centroid = Centroid()
+
+
+class SampledDefuzzification:
+    """
+    Defuzzification computed from memberships sampled on grid of universe. Many methods
+    can share single sampling pass, see `defuzzify_many`.
+    """
+
+    def __call__(self, fuzzy_set: FuzzySet, start: float, end: float) -> float:
+        """
+        :param fuzzy_set: Set to defuzzify
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :raise ValueError: When fuzzy set is empty within universe
+        :return: Crisp value representing fuzzy set
+        """
+
+        points, _ = self.grid.grid(start, end)
+        return self.from_samples(fuzzy_set.discretize(points))
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        """
+        :param sampled: Fuzzy set sampled on grid of universe
+        :raise ValueError: When fuzzy set is empty
+        :return: Crisp value representing fuzzy set
+        """
+
+        raise NotImplementedError
+
+    def __init__(self, grid: Simpson = Simpson()):
+        """
+        :param grid: Grid on which fuzzy set is sampled
+        """
+
+        self.grid = grid
+
+
+class Bisector(SampledDefuzzification):
+    """
+    Element dividing area under fuzzy set into two equal parts.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.bisector()
+
+
+class MeanOfMaxima(SampledDefuzzification):
     """
+    Mean of elements with the highest membership.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.mean_of_maxima()
+
+
+class SmallestOfMaxima(SampledDefuzzification):
+    """
+    Smallest element with the highest membership.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.smallest_of_maxima()
+
+
+class LargestOfMaxima(SampledDefuzzification):
+    """
+    Largest element with the highest membership.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.largest_of_maxima()
+
+
+class WeightedAverage(SampledDefuzzification):
+    """
+    Mean of grid elements weighted by they'r memberships.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.weighted_average()
+
+
+class SampledCentroid(SampledDefuzzification):
+    """
+    Center of mass computed from samples with trapezoidal rule, allows to compute
+    centroid in the same pass as other sampled methods.
+    """
+
+    def from_samples(self, sampled: DiscreteFuzzySet) -> float:
+        return sampled.centroid()
+
+
+bisector = Bisector()
+mean_of_maxima = MeanOfMaxima()
+smallest_of_maxima = SmallestOfMaxima()
+largest_of_maxima = LargestOfMaxima()
+weighted_average = WeightedAverage()
+
+
+def defuzzify_many(fuzzy_set: FuzzySet, start: float, end: float,
+                   methods: Dict[str, SampledDefuzzification],
+                   grid: Simpson = Simpson()) -> Dict[str, float]:
+    """
+    Compute many crisp values of the same fuzzy set evaluating it only once, e.g.
+    `defuzzify_many(output, 0, 25, {"centroid": SampledCentroid(), "mom": mean_of_maxima})`.
+
     :param fuzzy_set: Set to defuzzify
     :param start: Universe lowest value
     :param end: Universe highest value
-    :return: Center of mass for given fuzzy set
+    :param methods: Methods with names under which they'r results are returned
+    :param grid: Grid on which fuzzy set is sampled, grids of methods are ignored
+    :raise ValueError: When fuzzy set is empty within universe
+    :return: Result of each method
     """
 
-    n = int(ceil(end - start)) * 100
+    points, _ = grid.grid(start, end)
+    sampled = fuzzy_set.discretize(points)
+
+    return {name: method.from_samples(sampled) for name, method in methods.items()}
 
-    field = _integrate(fuzzy_set.membership, start, end, n)
-    x_field = _integrate(lambda x: x * fuzzy_set.membership(x), start, end, n)
+
+def moments_within(membership: MembershipFunction, start: float, end: float) \
+        -> Tuple[float, float]:
+    """
+    Area and first moment of membership function within universe. They'r computed
+    analytically when function provides `moments` and its support lies within universe,
+    otherwise they'r integrated numerically over common part of support and universe.
+
+    :param membership: Membership function
+    :param start: Universe lowest value
+    :param end: Universe highest value
+    :raise ValueError: When start is greater or equal to end
+    :return: Integral of :math:`\\mu(x)` and :math:`x\\mu(x)` in range of [start, end]
+    """
+
+    _validate_bounds(start, end)
+    low, high = support(membership)
+    if hasattr(membership, "moments") and start <= low and high <= end:
+        return membership.moments()
+
+    low, high = max(low, start), min(high, end)
+    if low >= high:
+        return 0., 0.
+
+    return AdaptiveSimpson(1e-9).moments(membership, low, high)
+
+
+def piecewise_linear_centroid(implied: Sequence[Tuple[float, Polygon]], logic: LogicalSystem,
+                              start: float, end: float) -> float:
+    """
+    Exact center of mass of union of piecewise-linear fuzzy sets implied by
+    rules with given firing strengths. With `Zadeh` logic sets are clipped at
+    firing strength and joined with `max`, with `Product` logic they are scaled
+    by firing strength and joined with probabilistic sum. No sampling is done,
+    so result does not carry any integration error.
+
+    :param implied: Firing strength and breakpoints of each implied set
+    :param logic: Either `Zadeh` or `Product`
+    :param start: Universe lowest value
+    :param end: Universe highest value
+    :raise ValueError: When logic is neither `Zadeh` nor `Product`
+    :return: Center of mass of union of implied sets
+    """
+
+    _validate_bounds(start, end)
+    if not isinstance(logic, (Zadeh, Product)):
+        raise ValueError(f"Exact centroid is not known for {type(logic).__name__} logic")
+    zadeh = isinstance(logic, Zadeh)
+
+    if zadeh:
+        strongest = {}
+        for strength, (xs, ys) in implied:
+            key = (tuple(xs), tuple(ys))
+            strongest[key] = max(strongest.get(key, 0.), strength)
+        implied = [(strength, key) for key, strength in strongest.items()]
+
+    polygons = []
+    for strength, (xs, ys) in implied:
+        if strength <= 0:
+            continue
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        polygons.append(_clip(xs, ys, strength) if zadeh else (xs, ys * strength))
+
+    points = np.concatenate([[start, end]] + [xs for xs, _ in polygons])
+    points = np.unique(points[(points >= start) & (points <= end)])
+
+    if zadeh:
+        values = _sample_polygons(polygons, points)
+        crossings = [points]
+        rows = max(SAMPLES_BUDGET // (max(len(polygons), 1) * len(points)), 1)
+        for i in range(0, len(polygons), rows):
+            difference = values[i:i + rows, np.newaxis, :] - values[np.newaxis, :, :]
+            left, right = difference[..., :-1], difference[..., 1:]
+            crossing = left * right < 0
+            _, _, interval = np.nonzero(crossing)
+            ratio = left[crossing] / (left[crossing] - right[crossing])
+            crossings.append(points[interval] + ratio * (points[interval + 1] - points[interval]))
+        points = np.unique(np.concatenate(crossings))
+
+        envelope = _sample_polygons(polygons, points).max(axis=0, initial=0.)
+        x0, x1, y0, y1 = points[:-1], points[1:], envelope[:-1], envelope[1:]
+        width = x1 - x0
+        field = float(np.sum(width * (y0 + y1) / 2))
+        x_field = float(np.sum(width * (x0 * (2 * y0 + y1) + x1 * (y0 + 2 * y1)) / 6))
+    else:
+        lows = np.sort([xs[0] for xs, _ in polygons])
+        highs = np.sort([xs[-1] for xs, _ in polygons])
+        # Union of k sets overlapping elementary interval is polynomial of degree k there,
+        # Gauss-Legendre rule with k // 2 + 2 nodes integrates it and its moment exactly
+        overlapping = np.searchsorted(lows, points[1:]) \
+            - np.searchsorted(highs, points[:-1], "right")
+        nodes, node_weights = np.polynomial.legendre.leggauss(
+            int(overlapping.max(initial=0)) // 2 + 2)
+        chunk = max(SAMPLES_BUDGET // (max(len(polygons), 1) * len(nodes)), 1)
+
+        field, x_field = 0., 0.
+        for i in range(0, len(points) - 1, chunk):
+            part = points[i:i + chunk + 1]
+            active = [(xs, ys) for xs, ys in polygons if xs[0] < part[-1] and xs[-1] > part[0]]
+            half_width = (part[1:] - part[:-1])[:, np.newaxis] / 2
+            x = (part[:-1] + part[1:])[:, np.newaxis] / 2 + half_width * nodes
+            union = 1 - np.prod(1 - _sample_polygons(active, x), axis=0, initial=1.)
+            field += float(np.sum(half_width * node_weights * union))
+            x_field += float(np.sum(half_width * node_weights * union * x))
 
     return x_field / field
+
+
+def _clip(xs: np.ndarray, ys: np.ndarray, level: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :return: Breakpoints of :math:`min(level, \\mu(x))` where :math:`\\mu` is
+             piecewise-linear function with breakpoints `xs`, `ys`
+    """
+
+    above = ys - level
+    crossing = above[:-1] * above[1:] < 0
+    ratio = above[:-1][crossing] / (above[:-1][crossing] - above[1:][crossing])
+    crossings = xs[:-1][crossing] + ratio * (xs[1:][crossing] - xs[:-1][crossing])
+
+    clipped_xs = np.concatenate([xs, crossings])
+    clipped_ys = np.concatenate([np.minimum(ys, level), np.full(len(crossings), level)])
+    order = np.argsort(clipped_xs, kind="stable")
+
+    return clipped_xs[order], clipped_ys[order]
+
+
+def _sample_polygons(polygons: Sequence[Tuple[np.ndarray, np.ndarray]], x: np.ndarray) \
+        -> np.ndarray:
+    """
+    :return: Values of each piecewise-linear function at `x`, one function per row
+    """
+
+    return np.array([np.interp(x, xs, ys, left=0., right=0.) for xs, ys in polygons]) \
+        .reshape((len(polygons),) + x.shape)
@@ -1,30 +1,302 @@
 from abc import ABC
-from math import isclose
-from typing import List, Dict, Tuple, Callable
-
-from yvain.fuzzy_set import FuzzySet, centroid, DefuzzificationMethod
-from yvain.logical_systems import LogicalSystem, Zadeh
-from yvain.membership_functions import MembershipFunction
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import isclose, inf
+from operator import itemgetter
+from typing import List, Dict, Tuple, Callable, NamedTuple, Union, Sequence, Optional, Iterable, \
+    Set, TypeVar
+
+import numpy as np
+
+from yvain.fuzzy_set import FuzzySet, centroid, DefuzzificationMethod, Centroid, Simpson, \
+    piecewise_linear_centroid, Aggregation, moments_within, SAMPLES_BUDGET, \
+    SampledDefuzzification, DiscreteFuzzySet
+from yvain.code_generation import GeneratedFunction, SourceBuilder
+from yvain.control_surface import ControlSurface, GridSpec, tabulate
+from yvain.logical_systems import LogicalSystem, Zadeh, Product
+from yvain.membership_functions import MembershipFunction, Numeric, Polygon, \
+    Interval, support, MembershipBank, evaluate
+
+Batch = Union[Dict[str, Sequence[float]], np.ndarray]
+T = TypeVar("T")
+
+EXACT_BATCH_RESOLUTION = 10000
+"""
+Number of grid intervals above which batch of piecewise-linear Mamdani outputs is
+defuzzified exactly sample by sample rather than on the grid
+"""
 
 
 class FuzzyVariable:
-    def __init__(self, name: str, fuzzy_set: Dict[str, FuzzySet]):
+    def __init__(self, name: str, fuzzy_set: Dict[str, FuzzySet],
+                 bank: Optional[MembershipBank] = None):
+        """
+        :param name: Variable name
+        :param fuzzy_set: Fuzzy set of each state
+        :param bank: Bank evaluating memberships of all states at once, rows in order of states
+        """
+
         self.name = name
         self.fuzzy_set = fuzzy_set
+        self.bank = bank
 
 
 class InvalidRuleError(Exception):
     pass
 
 
+class IntervalIndex:
+    """
+    Index of intervals (e.g. supports of terms of single variable). Real line is
+    split at bounds of all intervals, and for each bound and each part between bounds
+    overlapping intervals are stored - lookup costs single bisection no matter
+    how many intervals are indexed.
+    """
+
+    def __call__(self, x: float) -> Tuple[int, ...]:
+        """
+        :param x: Crisp value
+        :return: Positions of intervals containing `x`
+        """
+
+        i = bisect_left(self.bounds, x)
+        if i < len(self.bounds) and self.bounds[i] == x:
+            return self.at_bound[i]
+
+        return self.between[i]
+
+    def __init__(self, intervals: Sequence[Interval]):
+        """
+        :param intervals: Closed intervals, position in sequence identifies interval
+        """
+
+        self.bounds = sorted({bound for interval in intervals for bound in interval
+                              if abs(bound) != inf})
+        edges = [-inf] + self.bounds + [inf]
+        self.at_bound = [
+            tuple(i for i, (low, high) in enumerate(intervals) if low <= bound <= high)
+            for bound in self.bounds
+        ]
+        self.between = [
+            tuple(i for i, (low, high) in enumerate(intervals) if low < right and high > left)
+            for left, right in zip(edges[:-1], edges[1:])
+        ]
+
+
+class Fuzzification:
+    """
+    Table of input terms referenced by rules. Each term is registered once
+    during compilation, no matter how many rules do refer to it, and is fuzzified
+    once per sample (or once per batch). Rules read memberships from the table.
+
+    For single sample only terms which support contains input value are evaluated,
+    memberships of other terms are equal to 0. For batch of samples all terms of
+    each variable are evaluated at once with `MembershipBank`.
+    """
+
+    def register(self, variable_name: str, variable_state: str) -> int:
+        """
+        :param variable_name: Input variable name
+        :param variable_state: Name of fuzzy set of input variable
+        :raise InvalidRuleError: When variable or state is unknown
+        :return: Position of term membership in fuzzified table
+        """
+
+        key = (variable_name, variable_state)
+        if key not in self.positions:
+            state = _find_state(self.inputs, variable_name, variable_state)
+            self.positions[key] = len(self.terms)
+            self.terms.append((variable_name, state.membership_function))
+            self._indexes = None
+
+        return self.positions[key]
+
+    def __call__(self, values: Dict[str, Numeric]) -> List[Numeric]:
+        """
+        :param values: Crisp value (or array of values) of each input variable
+        :raise ValueError: When value of referenced variable is unknown
+        :return: Membership of each registered term
+        """
+
+        if self._indexes is None:
+            self._indexes = self._build_indexes()
+
+        memberships = [0.] * len(self.terms)
+        for variable_name, (positions, index, bank) in self._indexes.items():
+            value = values.get(variable_name)
+            if value is None:
+                raise ValueError(
+                    f"Input value for variable named {variable_name} is unknown"
+                )
+            if isinstance(value, np.ndarray):
+                for position, row in zip(positions, bank(value)):
+                    memberships[position] = row
+            else:
+                for i in index(value):
+                    memberships[positions[i]] = self.terms[positions[i]][1](value)
+
+        return memberships
+
+    def _build_indexes(self) -> Dict[str, Tuple[List[int], IntervalIndex, MembershipBank]]:
+        """
+        Bank of variable added from arrays is reused when rules refer to all of its
+        (unchanged) terms.
+
+        :return: Positions of terms of each variable, index of they'r supports and
+                 bank evaluating all of them at once
+        """
+
+        positions = {}
+        for (variable_name, variable_state), position in self.positions.items():
+            positions.setdefault(variable_name, {})[variable_state] = position
+
+        indexes = {}
+        for variable_name, states in positions.items():
+            variable = self.inputs[variable_name]
+            bank = variable.bank
+            if bank is not None and len(states) == len(bank) == len(variable.fuzzy_set) and all(
+                    fuzzy_set.membership_function is function
+                    for fuzzy_set, function in zip(variable.fuzzy_set.values(), bank.functions)):
+                variable_positions = [states[state] for state in variable.fuzzy_set]
+            else:
+                variable_positions = list(states.values())
+                bank = MembershipBank([self.terms[position][1] for position in variable_positions])
+            indexes[variable_name] = (
+                variable_positions,
+                IntervalIndex([support(self.terms[position][1])
+                               for position in variable_positions]),
+                bank
+            )
+
+        return indexes
+
+    def __init__(self, inputs: Dict[str, FuzzyVariable]):
+        """
+        :param inputs: System inputs with symbolic names as dictionary key
+        """
+
+        self.inputs = inputs
+        self.terms: List[Tuple[str, MembershipFunction]] = []
+        self.positions: Dict[Tuple[str, str], int] = {}
+        self._indexes: Optional[Dict[str, Tuple[List[int], IntervalIndex, MembershipBank]]] = None
+
+
+def _trigger_table(triggers: Sequence[Set[int]], terms: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    :param triggers: Positions of triggering terms of each rule
+    :param terms: Number of terms in fuzzified table
+    :return: Positions of rules triggered by each term
+    """
+
+    table = [[] for _ in range(terms)]
+    for rule, positions in enumerate(triggers):
+        for position in positions:
+            table[position].append(rule)
+
+    return tuple(tuple(rules) for rules in table)
+
+
+def _fired_rules(table: Tuple[Tuple[int, ...], ...], memberships: Sequence[float]) -> List[int]:
+    """
+    :return: Positions (in order) of rules triggered by terms with non-zero membership
+    """
+
+    return sorted({rule for position, membership in enumerate(memberships) if membership
+                   for rule in table[position]})
+
+
+def _generate_fuzzification(builder: SourceBuilder, fuzzification: Fuzzification,
+                            names: Sequence[str] = ()) -> Dict[str, str]:
+    """
+    Generate statements reading input values and computing membership of each registered
+    term, membership of term at position `i` is stored in variable `m{i}`.
+
+    :param builder: Source to which statements are added
+    :param fuzzification: Table of input terms
+    :param names: Input variables read besides variables of registered terms
+    :return: Name of variable holding value of each input variable
+    """
+
+    inputs = {}
+    for name in list(dict.fromkeys(name for name, _ in fuzzification.terms)) + list(names):
+        if name not in inputs:
+            inputs[name] = builder.assign(f"values[{name!r}]", "x")
+
+    for position, (name, membership) in enumerate(fuzzification.terms):
+        builder.line(f"m{position} = {builder.membership(membership, inputs[name])}")
+
+    return inputs
+
+
+def _find_state(variables: Dict[str, FuzzyVariable], variable_name: str,
+                variable_state: str) -> FuzzySet:
+    variable = variables.get(variable_name)
+    if variable is None:
+        raise InvalidRuleError(
+            f"System input does not contain variable named {variable_name}"
+        )
+
+    state = variable.fuzzy_set.get(variable_state)
+    if state is None:
+        raise InvalidRuleError(
+            f"Fuzzy variable {variable_name} cannot be member of set {variable_state}"
+        )
+
+    return state
+
+
 class FuzzyRule:
-    def compile(self, inputs: Dict[str, FuzzyVariable]) -> Callable[[Dict[str, float], ], FuzzySet]:
+    def compile(self, inputs: Dict[str, FuzzyVariable], logic: LogicalSystem = Zadeh()) \
+            -> Callable[[Dict[str, float], ], float]:
         """
-        Compile rule to plain python function with applies fuzzy on system inputs
-        and outputs
+        Compile rule to plain python function computing degree to with rule is
+        fulfilled by given input values
 
         :param inputs: System inputs with symbolic names as dictionary key
-        :return: Fuzzy set resulting from rule application
+        :param logic: Logical system providing t-norm and t-conorm
+        :return: Firing strength of the rule
+        """
+
+        fuzzification = Fuzzification(inputs)
+
+        return _RuleStrength(fuzzification, self.compile_strength(fuzzification, logic))
+
+    def compile_strength(self, fuzzification: Fuzzification, logic: LogicalSystem) \
+            -> Callable[[Sequence[Numeric], ], Numeric]:
+        """
+        Compile rule to plain python function computing degree to with rule is
+        fulfilled. Function reads memberships of input terms from fuzzified table,
+        when those memberships are arrays degree is computed for each sample.
+
+        :param fuzzification: Table of input terms, terms used by rule are registered in it
+        :param logic: Logical system providing t-norm and t-conorm
+        :return: Firing strength of the rule
+        """
+
+        raise NotImplementedError
+
+    def generate_strength(self, fuzzification: Fuzzification, logic: LogicalSystem,
+                          builder: SourceBuilder) -> str:
+        """
+        Generate statements computing degree to which rule is fulfilled by single sample.
+        Membership of term at position `i` of fuzzified table is read from variable `m{i}`.
+
+        :param fuzzification: Table of input terms, terms used by rule are registered in it
+        :param logic: Logical system providing t-norm and t-conorm
+        :param builder: Source to which statements are added
+        :return: Name of variable holding firing strength of the rule
+        """
+
+        raise NotImplementedError
+
+    def triggers(self, fuzzification: Fuzzification) -> Set[int]:
+        """
+        Terms from which at least one has to have non-zero membership to fire the rule.
+        When all of them are equal to 0, rule is provably not fired and can be skipped.
+
+        :param fuzzification: Table of input terms, terms used by rule are registered in it
+        :return: Positions of terms in fuzzified table
         """
 
         raise NotImplementedError
@@ -41,33 +313,54 @@ class Is(UnaryFuzzyRule):
     IF `variable_name` IS `variable_state`
     """
 
-    def compile(self, inputs: Dict[str, FuzzyVariable]) \
-            -> Callable[[Dict[str, float], ], FuzzySet]:
-        variable = inputs.get(self.variable_name)
-        if variable is None:
-            raise InvalidRuleError(
-                f"System input does not contain variable named {self.variable_name}"
-            )
+    def compile_strength(self, fuzzification: Fuzzification, logic: LogicalSystem) \
+            -> Callable[[Sequence[Numeric], ], Numeric]:
+        return itemgetter(fuzzification.register(self.variable_name, self.variable_state))
 
-        state = variable.fuzzy_set.get(self.variable_state)
-        if state is None:
-            raise InvalidRuleError(
-                f"Fuzzy variable {self.variable_name} cannot be member of set {self.variable_state}"
-            )
+    def generate_strength(self, fuzzification: Fuzzification, logic: LogicalSystem,
+                          builder: SourceBuilder) -> str:
+        return f"m{fuzzification.register(self.variable_name, self.variable_state)}"
 
-        def output_membership(values: Dict[str, float]) -> FuzzySet:
-            value = values.get(self.variable_name)
-            if value is None:
-                raise ValueError(
-                    f"Input value for variable named {self.variable_name} is unknown"
-                )
-            membership = state.membership(value)
-            return FuzzySet(lambda x: membership, state.logic)
-
-        return output_membership
+    def triggers(self, fuzzification: Fuzzification) -> Set[int]:
+        return {fuzzification.register(self.variable_name, self.variable_state)}
 
 
 class BinaryFuzzyRule(FuzzyRule, ABC):
+    def operands(self) -> List[FuzzyRule]:
+        """
+        Chain of nested rules of the same type is flattened, e.g.
+        `(a AND b) AND (c AND d)` has operands `a, b, c, d`
+
+        :return: Operands of n-ary rule equivalent to this one
+        """
+
+        operands = []
+        pending = [self.right_rule, self.left_rule]
+        while pending:
+            rule = pending.pop()
+            if type(rule) is type(self):
+                pending.extend([rule.right_rule, rule.left_rule])
+            else:
+                operands.append(rule)
+
+        return operands
+
+    def _compile_operands(self, fuzzification: Fuzzification, logic: LogicalSystem) \
+            -> Callable[[Sequence[Numeric], ], Iterable[Numeric]]:
+        """
+        :return: Function lazily computing firing strength of each operand
+        """
+
+        operands = self.operands()
+        if all(isinstance(operand, Is) for operand in operands):
+            return itemgetter(*[
+                fuzzification.register(operand.variable_name, operand.variable_state)
+                for operand in operands
+            ])
+
+        return _LazyStrengths([operand.compile_strength(fuzzification, logic)
+                               for operand in operands])
+
     def __init__(self, left_rule: FuzzyRule, right_rule: FuzzyRule):
         self.left_rule = left_rule
         self.right_rule = right_rule
@@ -78,14 +371,18 @@ class And(BinaryFuzzyRule):
     `IF left_rule AND right_rule`
     """
 
-    def compile(self, inputs: Dict[str, FuzzyVariable]) \
-            -> Callable[[Dict[str, float], ], FuzzySet]:
-        def output_membership(values: Dict[str, float]) -> FuzzySet:
-            left = self.left_rule.compile(inputs)
-            right = self.right_rule.compile(inputs)
-            return left(values) & right(values)
+    def compile_strength(self, fuzzification: Fuzzification, logic: LogicalSystem) \
+            -> Callable[[Sequence[Numeric], ], Numeric]:
+        return _Reduction(logic.t_norm_many, self._compile_operands(fuzzification, logic))
 
-        return output_membership
+    def generate_strength(self, fuzzification: Fuzzification, logic: LogicalSystem,
+                          builder: SourceBuilder) -> str:
+        return builder.t_norm(logic, [operand.generate_strength(fuzzification, logic, builder)
+                                      for operand in self.operands()])
+
+    def triggers(self, fuzzification: Fuzzification) -> Set[int]:
+        # Conjunction is not fired when any operand is not, so triggers of one operand suffice
+        return min((operand.triggers(fuzzification) for operand in self.operands()), key=len)
 
 
 class Or(BinaryFuzzyRule):
@@ -93,14 +390,17 @@ class Or(BinaryFuzzyRule):
     `IF left_rule OR right_rule`
     """
 
-    def compile(self, inputs: Dict[str, FuzzyVariable]) \
-            -> Callable[[Dict[str, float], ], FuzzySet]:
-        def output_membership(values: Dict[str, float]):
-            left = self.left_rule.compile(inputs)
-            right = self.right_rule.compile(inputs)
-            return left(values) | right(values)
+    def compile_strength(self, fuzzification: Fuzzification, logic: LogicalSystem) \
+            -> Callable[[Sequence[Numeric], ], Numeric]:
+        return _Reduction(logic.t_conorm_many, self._compile_operands(fuzzification, logic))
+
+    def generate_strength(self, fuzzification: Fuzzification, logic: LogicalSystem,
+                          builder: SourceBuilder) -> str:
+        return builder.t_conorm(logic, [operand.generate_strength(fuzzification, logic, builder)
+                                        for operand in self.operands()])
 
-        return output_membership
+    def triggers(self, fuzzification: Fuzzification) -> Set[int]:
+        return set().union(*(operand.triggers(fuzzification) for operand in self.operands()))
 
 
 class Implication:
@@ -110,6 +410,17 @@ class Implication:
 
     def compile(self, inputs: Dict[str, FuzzyVariable], outputs: Dict[str, FuzzyVariable]) \
             -> Callable[[Dict[str, float], ], FuzzySet]:
+        state = self.consequent(outputs)
+
+        return _ImpliedSet(self.rule.compile(inputs, state.logic), state)
+
+    def consequent(self, outputs: Dict[str, FuzzyVariable]) -> FuzzySet:
+        """
+        :param outputs: System outputs with symbolic names as dictionary key
+        :raise InvalidRuleError: When output variable or state is unknown
+        :return: Fuzzy set implied by the rule
+        """
+
         variable = outputs.get(self.variable_name)
         if variable is None:
             raise InvalidRuleError(
@@ -122,11 +433,7 @@ class Implication:
                 f"Fuzzy variable {self.variable_name} cannot be member of set {self.variable_state}"
             )
 
-        def output_membership(values: Dict[str, float]) -> FuzzySet:
-            left = self.rule.compile(inputs)
-            return left(values) & state
-
-        return output_membership
+        return state
 
     def __init__(self, rule: FuzzyRule, variable_name: str, variable_state: str):
         self.rule = rule
@@ -134,6 +441,61 @@ class Implication:
         self.variable_state = variable_state
 
 
+class _RuleStrength:
+    """
+    Firing strength of rule computed from crisp input values
+    """
+
+    def __call__(self, values: Dict[str, float]) -> float:
+        return self.strength(self.fuzzification(values))
+
+    def __init__(self, fuzzification: Fuzzification,
+                 strength: Callable[[Sequence[Numeric], ], Numeric]):
+        self.fuzzification = fuzzification
+        self.strength = strength
+
+
+class _LazyStrengths:
+    """
+    Firing strengths of operands of n-ary rule, computed only when consumed
+    """
+
+    def __call__(self, memberships: Sequence[Numeric]) -> Iterable[Numeric]:
+        return (strength(memberships) for strength in self.strengths)
+
+    def __init__(self, strengths: List[Callable[[Sequence[Numeric], ], Numeric]]):
+        self.strengths = strengths
+
+
+class _Reduction:
+    """
+    Firing strength of n-ary rule - n-ary norm of strengths of its operands
+    """
+
+    def __call__(self, memberships: Sequence[Numeric]) -> Numeric:
+        return self.reduce(self.operands(memberships))
+
+    def __init__(self, reduce: Callable[[Iterable[Numeric], ], Numeric],
+                 operands: Callable[[Sequence[Numeric], ], Iterable[Numeric]]):
+        self.reduce = reduce
+        self.operands = operands
+
+
+class _ImpliedSet:
+    """
+    Consequent of single rule implied by its firing strength
+    """
+
+    def __call__(self, values: Dict[str, float]) -> FuzzySet:
+        implied = Aggregation([(self.strength(values), self.state.membership_function)],
+                              self.state.logic)
+        return FuzzySet(implied, self.state.logic)
+
+    def __init__(self, strength: Callable[[Dict[str, float], ], float], state: FuzzySet):
+        self.strength = strength
+        self.state = state
+
+
 class FuzzyRuleBuilder:
     def and_is(self, variable: str, state: str) -> 'FuzzyRuleBuilder':
         self.rule = And(self.rule, Is(variable, state))
@@ -158,10 +520,10 @@ def when(variable: str, state: str) -> FuzzyRuleBuilder:
     return FuzzyRuleBuilder(Is(variable, state))
 
 
-class MamdaniSystem:
-    @classmethod
-    def empty(cls, logic: LogicalSystem = Zadeh()):
-        return cls({}, {}, [], logic)
+class _SystemInputs:
+    """
+    Input variables shared by Mamdani and Sugeno systems
+    """
 
     def add_input(self, name: str, memberships: Dict[str, MembershipFunction]):
         self.inputs[name] = FuzzyVariable(name, {
@@ -169,6 +531,34 @@ class MamdaniSystem:
             for state, membership in memberships.items()
         })
 
+    def add_input_from_arrays(self, name: str, states: Sequence[str], kind: type,
+                              *parameters: Sequence[float]):
+        """
+        Add input variable with many terms of the same kind at once, e.g.
+        `add_input_from_arrays("x", names, Triangle, a, b, c)`.
+
+        :param name: Input variable name
+        :param states: Name of each term
+        :param kind: `Triangle`, `Trapezoid` or `Gaussian`
+        :param parameters: Array of each constructor parameter, one element per term
+        :raise ValueError: When number of terms and parameters differ or parameters are invalid
+        """
+
+        bank = MembershipBank.from_arrays(kind, *parameters)
+        if len(bank) != len(states):
+            raise ValueError(f"Got {len(states)} state names for {len(bank)} terms")
+
+        self.inputs[name] = FuzzyVariable(name, {
+            state: FuzzySet(membership, self.logic)
+            for state, membership in zip(states, bank.functions)
+        }, bank)
+
+
+class MamdaniSystem(_SystemInputs):
+    @classmethod
+    def empty(cls, logic: LogicalSystem = Zadeh(), additive: bool = False):
+        return cls({}, {}, [], logic, additive=additive)
+
     def add_output(self, name: str, memberships: Dict[str, MembershipFunction]):
         self.outputs[name] = FuzzyVariable(name, {
             state: FuzzySet(membership, self.logic)
@@ -178,52 +568,670 @@ class MamdaniSystem:
     def add_rule(self, fuzzy_rule: Implication):
         self.rule_set.append(fuzzy_rule)
 
+    def compile(self) -> 'MamdaniEngine':
+        """
+        Validate rule base and resolve all variables and states used by rules.
+        Resulting engine is immutable - changes made to the system after compilation
+        are not visible to it.
+
+        :raise InvalidRuleError: When rule refers to unknown variable or state
+        :return: Inference engine ready to be run multiple times
+        """
+
+        fuzzification = Fuzzification(self.inputs)
+        implications = tuple(
+            (rule.variable_name,
+             rule.rule.compile_strength(fuzzification, self.logic),
+             rule.consequent(self.outputs))
+            for rule in self.rule_set
+        )
+        triggers = [rule.rule.triggers(fuzzification) for rule in self.rule_set]
+
+        piecewise_linear = {}
+        if isinstance(self.defuzzify, Centroid) and type(self.logic) in (Zadeh, Product) \
+                and not self.additive:
+            for variable_name, _, state in implications:
+                piecewise_linear[variable_name] = piecewise_linear.get(variable_name, True) \
+                    and hasattr(state.membership_function, "breakpoints")
+
+        return MamdaniEngine(
+            fuzzification=fuzzification,
+            implications=implications,
+            variables=tuple(dict.fromkeys(variable_name for variable_name, _, _ in implications)),
+            triggers=_trigger_table(triggers, len(fuzzification.terms)),
+            breakpoints={
+                state: state.membership_function.breakpoints()
+                for variable_name, _, state in implications if piecewise_linear.get(variable_name)
+            },
+            logic=self.logic,
+            defuzzify=self.defuzzify,
+            grids={},
+            additive=self.additive,
+            moments={}
+        )
+
     def run(self, values: Dict[str, float], universe: Tuple[float, float]) \
             -> Dict[str, float]:
+        """
+        Compile system and run it on single sample. When system is run multiple times
+        it's cheaper to `compile` it once and run resulting engine.
+
+        :param values: Crisp value of each input variable
+        :param universe: Lowest and highest value of output universe
+        :return: Crisp value of each output variable
+        """
+
+        return self.compile().run(values, universe)
+
+    def run_many(self, values: Dict[str, float], universe: Tuple[float, float],
+                 methods: Dict[str, SampledDefuzzification],
+                 grid: Simpson = Simpson()) -> Dict[str, Dict[str, float]]:
+        """
+        Compile system and compute many crisp values of each output from single inference
+        pass. See `MamdaniEngine.run_many`.
+
+        :param values: Crisp value of each input variable
+        :param universe: Lowest and highest value of output universe
+        :param methods: Methods with names under which they'r results are returned
+        :param grid: Grid on which output sets are sampled
+        :return: Result of each method for each output variable
+        """
+
+        return self.compile().run_many(values, universe, methods, grid)
+
+    def run_batch(self, values: Batch, universe: Tuple[float, float],
+                  columns: Optional[Sequence[str]] = None,
+                  chunk_size: int = 4096, workers: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Compile system and run it on batch of samples. See `MamdaniEngine.run_batch`.
+
+        :param values: Equal-length arrays of crisp values for each input variable or
+                       2-D array with one sample per row
+        :param universe: Lowest and highest value of output universe
+        :param columns: Input variable of each column when `values` is 2-D array
+        :param chunk_size: Maximal number of samples aggregated at once
+        :param workers: Number of processes sharing the batch
+        :return: Array of crisp values for each output variable
+        """
+
+        return self.compile().run_batch(values, universe, columns, chunk_size, workers)
+
+    def tabulate(self, grid_spec: GridSpec, universe: Tuple[float, float]) \
+            -> Dict[str, ControlSurface]:
+        """
+        Run system in batch over regular grid of inputs and build lookup table of each
+        output, answering queries with multilinear interpolation.
+
+        :param grid_spec: Lowest value, highest value and number of nodes for each input
+        :param universe: Lowest and highest value of output universe
+        :raise ValueError: When grid is invalid
+        :return: Control surface of each output variable
+        """
+
+        engine = self.compile()
+        return tabulate(lambda batch: engine.run_batch(batch, universe), grid_spec)
+
+    def generate(self, universe: Tuple[float, float]) -> GeneratedFunction:
+        """
+        Compile system to straight-line python source running single sample: membership
+        formulas and norms are inlined and only rules triggered by non-zero memberships
+        are evaluated. Output of additive system is computed inline as well, other systems
+        pass fired consequents to defuzzification of compiled engine.
+
+        :param universe: Lowest and highest value of output universe
+        :raise ValueError: When universe is empty
+        :raise InvalidRuleError: When rule refers to unknown variable or state
+        :return: Function taking crisp value of each input variable (it raises `KeyError`
+                 when any of them is missing) and returning crisp value of each output
+                 variable. Generated code is available as its `source`
+        """
+
         start, end = universe
 
         if start >= end:
             raise ValueError(
                 f"Upper bound of universe ({end}) is lower than lower bound ({start})")
 
-        output_sets = {}
-        for rule in self.rule_set:
-            fuzzy_result = rule.compile(self.inputs, self.outputs)(values)
-            if rule.variable_name not in output_sets:
-                output_sets[rule.variable_name] = fuzzy_result
+        engine = self.compile()
+        builder = SourceBuilder()
+        _generate_fuzzification(builder, engine.fuzzification)
+        moments = engine.consequent_moments(start, end) if self.additive else {}
+
+        for i in range(len(engine.variables)):
+            if self.additive:
+                builder.line(f"area{i} = 0.")
+                builder.line(f"moment{i} = 0.")
             else:
-                output_sets[rule.variable_name] |= fuzzy_result
+                builder.line(f"fired{i} = []")
 
-        return {
-            variable_name: self.defuzzify(fuzzy_set, start, end)
-            for variable_name, fuzzy_set in output_sets.items()
-        }
+        for rule in self.rule_set:
+            i = engine.variables.index(rule.variable_name)
+            state = rule.consequent(self.outputs)
+            positions = sorted(rule.rule.triggers(engine.fuzzification))
+            with builder.block(f"if {' or '.join(f'm{position}' for position in positions)}:"):
+                strength = rule.rule.generate_strength(engine.fuzzification, self.logic, builder)
+                if self.additive:
+                    area, moment = moments[state]
+                    builder.line(f"area{i} += {strength} * {builder.literal(area)}")
+                    builder.line(f"moment{i} += {strength} * {builder.literal(moment)}")
+                else:
+                    builder.line(
+                        f"fired{i}.append(({strength}, {builder.constant(state, 'state')}))")
+
+        if self.additive:
+            outputs = [f"moment{i} / area{i}" for i in range(len(engine.variables))]
+        else:
+            defuzzify = builder.constant(engine._defuzzify, "defuzzify")
+            outputs = [f"{defuzzify}(fired{i}, {builder.literal(start)}, {builder.literal(end)})"
+                       for i in range(len(engine.variables))]
+        builder.line("return {" + ", ".join(
+            f"{variable_name!r}: {output}"
+            for variable_name, output in zip(engine.variables, outputs)) + "}")
+
+        return builder.build("run", ["values"])
 
     def __init__(self, inputs: Dict[str, FuzzyVariable], outputs: Dict[str, FuzzyVariable],
                  rules: List[Implication], logic: LogicalSystem,
-                 defuzzification_method: DefuzzificationMethod = centroid):
+                 defuzzification_method: DefuzzificationMethod = centroid,
+                 additive: bool = False):
+        """
+        :param inputs: System inputs with symbolic names as dictionary key
+        :param outputs: System outputs with symbolic names as dictionary key
+        :param rules: Fuzzy rules
+        :param logic: Logical system used to evaluate rules, implication and aggregation
+        :param defuzzification_method: Method of defuzzification of aggregated output sets
+        :param additive: Use standard additive model - consequents are scaled by firing
+                         strength and summed, output is centroid of the sum computed from
+                         area and centroid of each consequent. Defuzzification method is
+                         not used in this mode
+        """
+
         self.inputs = inputs
         self.outputs = outputs
         self.rule_set = rules
         self.logic = logic
         self.defuzzify = defuzzification_method
+        self.additive = additive
+
+
+class MamdaniEngine(NamedTuple):
+    """
+    Compiled Mamdani system. All lookups are resolved at compile time, so
+    running engine costs only evaluation of memberships and norms.
+    For single sample only rules triggered by terms with non-zero membership
+    are evaluated, and centroid is integrated only over supports of fired consequents.
+
+    When centroid is integrated with `Simpson` rule, all consequents are sampled once
+    per universe and kept in `grids` - each run only combines rows of sampled matrix.
+
+    Additive engine sums consequents scaled by firing strengths. Centroid of such sum
+    is weighted average of consequents centroids, so only area and moment of each
+    consequent is computed (once per universe) and no integration is done at run time.
+    """
+
+    fuzzification: Fuzzification
+    implications: Tuple[Tuple[str, Callable[[Sequence[Numeric], ], Numeric], FuzzySet], ...]
+    variables: Tuple[str, ...]
+    triggers: Tuple[Tuple[int, ...], ...]
+    breakpoints: Dict[FuzzySet, Polygon]
+    logic: LogicalSystem
+    defuzzify: DefuzzificationMethod
+    grids: Dict[Tuple[float, float, int], 'ConsequentGrid']
+    additive: bool
+    moments: Dict[Tuple[float, float], Dict[FuzzySet, Tuple[float, float]]]
+
+    def run(self, values: Dict[str, float], universe: Tuple[float, float]) \
+            -> Dict[str, float]:
+        """
+        :param values: Crisp value of each input variable
+        :param universe: Lowest and highest value of output universe
+        :raise ValueError: When universe is empty
+        :return: Crisp value of each output variable
+        """
+
+        start, end = universe
+
+        if start >= end:
+            raise ValueError(
+                f"Upper bound of universe ({end}) is lower than lower bound ({start})")
+
+        return {
+            variable_name: self._defuzzify(fired, start, end)
+            for variable_name, fired in self._fire(values).items()
+        }
+
+    def run_many(self, values: Dict[str, float], universe: Tuple[float, float],
+                 methods: Dict[str, SampledDefuzzification],
+                 grid: Simpson = Simpson()) -> Dict[str, Dict[str, float]]:
+        """
+        Run single inference pass and compute many crisp values of each output, e.g.
+        `run_many(values, (0, 25), {"centroid": SampledCentroid(), "mom": mean_of_maxima})`.
+        Aggregated output set of each variable is sampled once and shared by all methods.
+
+        :param values: Crisp value of each input variable
+        :param universe: Lowest and highest value of output universe
+        :param methods: Methods with names under which they'r results are returned
+        :param grid: Grid on which output sets are sampled, grids of methods are ignored
+        :raise ValueError: When universe is empty or output set is empty within it
+        :return: Result of each method for each output variable
+        """
+
+        start, end = universe
+
+        if start >= end:
+            raise ValueError(
+                f"Upper bound of universe ({end}) is lower than lower bound ({start})")
+
+        points, _ = grid.grid(start, end)
+        results = {}
+        for variable_name, fired in self._fire(values).items():
+            union = np.zeros(len(points))
+            for strength, state in fired:
+                union = self.logic.t_conorm_values(union, self.logic.t_norm_values(
+                    strength, evaluate(state.membership_function, points)))
+            sampled = DiscreteFuzzySet(points, union, self.logic)
+            results[variable_name] = {
+                name: method.from_samples(sampled) for name, method in methods.items()
+            }
+
+        return results
+
+    def _fire(self, values: Dict[str, float]) -> Dict[str, List[Tuple[float, FuzzySet]]]:
+        """
+        :param values: Crisp value of each input variable
+        :return: Firing strength and consequent of each fired rule, for each output variable
+        """
+
+        memberships = self.fuzzification(values)
+        implied = {variable_name: [] for variable_name in self.variables}
+        for rule in _fired_rules(self.triggers, memberships):
+            variable_name, strength, state = self.implications[rule]
+            implied[variable_name].append((strength(memberships), state))
+
+        return implied
+
+    def _defuzzify(self, fired: List[Tuple[float, FuzzySet]], start: float, end: float) -> float:
+        """
+        Aggregate implied sets of single output variable and defuzzify the result.
+        Centroid of piecewise-linear sets is computed exactly from they'r breakpoints.
+
+        :param fired: Firing strength and consequent of each rule
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :return: Crisp value of output variable
+        """
+
+        if self.additive:
+            moments = self.consequent_moments(start, end)
+            area, moment = 0., 0.
+            for strength, state in fired:
+                area += strength * moments[state][0]
+                moment += strength * moments[state][1]
+            return moment / area
+
+        if all(state in self.breakpoints for _, state in fired):
+            return piecewise_linear_centroid(
+                [(strength, self.breakpoints[state]) for strength, state in fired],
+                self.logic, start, end)
+
+        supports = [support(state.membership_function) for strength, state in fired if strength]
+        if self._samples_consequents() and supports:
+            grid = self.grid(start, end)
+            low = max(np.searchsorted(grid.points, min(low for low, _ in supports), "right") - 1, 0)
+            high = np.searchsorted(grid.points, max(high for _, high in supports), "left") + 1
+
+            rows = [grid.rows[state] for _, state in fired]
+            strengths = np.array([strength for strength, _ in fired])[:, np.newaxis]
+            union = self.logic.t_conorm_many(
+                self.logic.t_norm_values(strengths, grid.samples[rows, low:high]))
+
+            return float(union @ grid.x_weights[low:high]) / float(union @ grid.weights[low:high])
+
+        output_set = FuzzySet(Aggregation(
+            [(strength, state.membership_function) for strength, state in fired], self.logic
+        ), self.logic)
+
+        if isinstance(self.defuzzify, Centroid) and supports:
+            return self.defuzzify.over(output_set, supports, start, end)
+
+        return self.defuzzify(output_set, start, end)
+
+    def grid(self, start: float, end: float) -> 'ConsequentGrid':
+        """
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :return: Simpson grid of universe with all consequents sampled on it, computed once
+                 for each universe and resolution
+        """
+
+        integrator = self.defuzzify.integrator
+        key = (start, end, integrator.resolution(start, end))
+        grid = self.grids.get(key)
+        if grid is None:
+            points, weights = integrator.grid(start, end)
+            states = list(dict.fromkeys(state for _, _, state in self.implications))
+            grid = ConsequentGrid(
+                points=points,
+                weights=weights,
+                x_weights=weights * points,
+                samples=MembershipBank([state.membership_function for state in states])(points),
+                rows={state: i for i, state in enumerate(states)}
+            )
+            self.grids[key] = grid
+
+        return grid
+
+    def consequent_moments(self, start: float, end: float) -> Dict[FuzzySet, Tuple[float, float]]:
+        """
+        :param start: Universe lowest value
+        :param end: Universe highest value
+        :return: Area and first moment of each consequent within universe, computed once
+                 for each universe
+        """
+
+        moments = self.moments.get((start, end))
+        if moments is None:
+            moments = {
+                state: moments_within(state.membership_function, start, end)
+                for _, _, state in self.implications
+            }
+            self.moments[(start, end)] = moments
+
+        return moments
+
+    def prepare(self, universe: Tuple[float, float]):
+        """
+        Compute tables used by runs over universe (sampled consequents or they'r moments)
+        ahead of time, e.g. before engine is exported or cached.
+
+        :param universe: Lowest and highest value of output universe
+        :raise ValueError: When universe is empty
+        """
+
+        start, end = universe
+
+        if start >= end:
+            raise ValueError(
+                f"Upper bound of universe ({end}) is lower than lower bound ({start})")
+
+        if self.additive:
+            self.consequent_moments(start, end)
+        elif self._samples_consequents():
+            self.grid(start, end)
+
+    def _samples_consequents(self) -> bool:
+        return isinstance(self.defuzzify, Centroid) \
+            and isinstance(self.defuzzify.integrator, Simpson)
+
+    def run_batch(self, values: Batch, universe: Tuple[float, float],
+                  columns: Optional[Sequence[str]] = None,
+                  chunk_size: int = 4096, workers: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Run engine on many samples at once. Fuzzification, rule firing, aggregation
+        and defuzzification are vectorized over the whole batch. Only centroid computed
+        with `Simpson` integrator is vectorized, other methods are applied sample by sample.
+        Samples are aggregated in chunks holding at most `SAMPLES_BUDGET` grid values.
+        When grid is finer than `EXACT_BATCH_RESOLUTION` and all consequents are
+        piecewise-linear, exact centroid of each sample is cheaper and it's used instead.
+
+        :param values: Equal-length arrays of crisp values for each input variable or
+                       2-D array with one sample per row
+        :param universe: Lowest and highest value of output universe
+        :param columns: Input variable of each column when `values` is 2-D array
+        :param chunk_size: Maximal number of samples aggregated at once, it's lowered
+                           further to fit aggregated output sets in `SAMPLES_BUDGET`
+        :param workers: Number of processes sharing the batch. Batch is split into equal
+                        shards run in process pool, engine is pickled and sent to each of them
+        :raise ValueError: When universe is empty or batch is malformed
+        :return: Array of crisp values for each output variable. Samples where no rule
+                 is fired are defuzzified to `nan`
+        """
+
+        start, end = universe
+
+        if start >= end:
+            raise ValueError(
+                f"Upper bound of universe ({end}) is lower than lower bound ({start})")
+
+        batch, size = _as_batch(values, columns)
+
+        if workers > 1 and size > 1:
+            results = _run_sharded(
+                partial(self.run_batch, universe=universe, chunk_size=chunk_size),
+                batch, size, workers)
+            return {
+                variable_name: np.concatenate([result[variable_name] for result in results])
+                for variable_name in self.variables
+            }
+
+        if self.additive:
+            return self._run_additive_batch(batch, size, start, end)
+
+        if not self._samples_consequents() or (
+                len(self.breakpoints) == len({state for _, _, state in self.implications})
+                and self.defuzzify.integrator.resolution(start, end) > EXACT_BATCH_RESOLUTION):
+            return self._run_batch_by_sample(batch, size, start, end)
+
+        grid = self.grid(start, end)
+        spans = {}
+        for state, row in grid.rows.items():
+            nonzero = np.flatnonzero(grid.samples[row])
+            spans[state] = (nonzero[0], nonzero[-1] + 1) if len(nonzero) else (0, 0)
+
+        chunk_size = max(min(chunk_size, SAMPLES_BUDGET // len(grid.points)), 1)
+        outputs = {variable_name: [] for variable_name, _, _ in self.implications}
+        for chunk_start in range(0, size, chunk_size):
+            chunk = {name: column[chunk_start:chunk_start + chunk_size]
+                     for name, column in batch.items()}
+            chunk_length = min(chunk_size, size - chunk_start)
+            memberships = self.fuzzification(chunk)
+
+            # Maximum of clipped rows is a row clipped by maximal strength, so with Zadeh
+            # logic strengths of rules implying the same consequent are reduced first
+            reduced = {}
+            output_sets = {variable_name: np.zeros((chunk_length, len(grid.points)))
+                           for variable_name in outputs}
+            for variable_name, strength, state in self.implications:
+                fired = np.broadcast_to(strength(memberships), (chunk_length,))
+                if type(self.logic) is not Zadeh:
+                    self._imply(output_sets[variable_name], fired, grid, state, spans[state])
+                elif (variable_name, state) in reduced:
+                    np.maximum(reduced[variable_name, state], fired,
+                               out=reduced[variable_name, state])
+                else:
+                    reduced[variable_name, state] = np.array(fired, dtype=float)
+            for (variable_name, state), fired in reduced.items():
+                self._imply(output_sets[variable_name], fired, grid, state, spans[state])
+
+            for variable_name, memberships in output_sets.items():
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    outputs[variable_name].append(
+                        (memberships @ grid.x_weights) / (memberships @ grid.weights))
+
+        return {
+            variable_name: np.concatenate(results) if results else np.empty(0)
+            for variable_name, results in outputs.items()
+        }
+
+    def _imply(self, output_set: np.ndarray, fired: np.ndarray, grid: 'ConsequentGrid',
+               state: FuzzySet, span: Tuple[int, int]):
+        """
+        Aggregate consequent clipped (or scaled) by firing strengths into output sets of
+        chunk, in place. Only samples which fired the rule and grid points within
+        consequent support are updated.
+
+        :param output_set: Aggregated output set of each sample
+        :param fired: Firing strength of the rule for each sample
+        :param grid: Grid with sampled consequents
+        :param state: Consequent of the rule
+        :param span: Range of grid points where consequent is non-zero
+        """
+
+        low, high = span
+        samples = np.flatnonzero(fired)
+        if low == high or not len(samples):
+            return
+        if len(samples) == len(fired):
+            samples = slice(None)
+
+        output_set[samples, low:high] = self.logic.t_conorm_values(
+            output_set[samples, low:high],
+            self.logic.t_norm_values(fired[samples, np.newaxis],
+                                     grid.samples[grid.rows[state], low:high]))
+
+    def _run_batch_by_sample(self, batch: Dict[str, np.ndarray], size: int,
+                             start: float, end: float) -> Dict[str, np.ndarray]:
+        """
+        :return: Crisp value of each output variable computed sample by sample,
+                 `nan` for samples where no rule is fired
+        """
+
+        outputs = {variable_name: np.full(size, np.nan)
+                   for variable_name, _, _ in self.implications}
+        for i in range(size):
+            for variable_name, fired in self._fire(
+                    {name: column[i] for name, column in batch.items()}).items():
+                if variable_name in outputs and any(strength for strength, _ in fired):
+                    outputs[variable_name][i] = self._defuzzify(fired, start, end)
+
+        return outputs
+
+    def _run_additive_batch(self, batch: Dict[str, np.ndarray], size: int,
+                            start: float, end: float) -> Dict[str, np.ndarray]:
+        """
+        :return: Weighted average of consequents centroids for each output variable and sample
+        """
+
+        moments = self.consequent_moments(start, end)
+        memberships = self.fuzzification(batch)
+        areas = {variable_name: np.zeros(size) for variable_name in self.variables}
+        x_areas = {variable_name: np.zeros(size) for variable_name in self.variables}
+        for variable_name, strength, state in self.implications:
+            fired = strength(memberships)
+            areas[variable_name] += fired * moments[state][0]
+            x_areas[variable_name] += fired * moments[state][1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                variable_name: x_areas[variable_name] / areas[variable_name]
+                for variable_name in self.variables
+            }
+
+
+class ConsequentGrid(NamedTuple):
+    """
+    Integration grid of output universe with memberships of all consequents sampled on it
+    """
+
+    points: np.ndarray
+    weights: np.ndarray
+    x_weights: np.ndarray
+    samples: np.ndarray
+    rows: Dict[FuzzySet, int]
+
+
+def _run_sharded(run: Callable[[Dict[str, np.ndarray], ], T], batch: Dict[str, np.ndarray],
+                 size: int, workers: int) -> List[T]:
+    """
+    :param run: Picklable function running batch of samples
+    :param batch: Array for each input variable
+    :param size: Number of samples
+    :param workers: Number of processes
+    :return: Result of each shard, in order of samples
+    """
+
+    bounds = np.linspace(0, size, min(workers, size) + 1).astype(int)
+    shards = [{name: column[start:end] for name, column in batch.items()}
+              for start, end in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(len(shards)) as pool:
+        return list(pool.map(run, shards))
+
+
+def _as_batch(values: Batch, columns: Optional[Sequence[str]]) \
+        -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Normalize batch of samples to dictionary of equal-length float arrays.
+
+    :param values: Arrays for each input variable or 2-D array with one sample per row
+    :param columns: Input variable of each column when `values` is 2-D array
+    :raise ValueError: When columns do not match array or arrays lengths differ
+    :return: Array for each input variable and number of samples
+    """
+
+    if isinstance(values, np.ndarray):
+        if values.ndim != 2:
+            raise ValueError(f"Batch have to be 2-D array, got {values.ndim}-D one")
+        if columns is None or len(columns) != values.shape[1]:
+            raise ValueError(
+                f"Batch with {values.shape[1]} columns requires the same number of column names")
+        values = {name: values[:, i] for i, name in enumerate(columns)}
+
+    batch = {name: np.asarray(column, dtype=float) for name, column in values.items()}
+    sizes = {len(column) for column in batch.values()}
+    if len(sizes) > 1:
+        raise ValueError(
+            f"All input arrays have to be of equal length, got lengths {sorted(sizes)}")
+
+    return batch, sizes.pop() if sizes else 0
+
+
+class Linear:
+    """
+    Linear (Takagi-Sugeno-Kang) output function
+    :math:`f(x) = constant + \\sum_i coefficient_i * x_i`.
+    Contrary to arbitrary python function it can be evaluated for whole batch
+    of samples with single matrix product.
+    """
+
+    def __call__(self, values: Dict[str, float]) -> float:
+        return self.constant + sum(
+            coefficient * values[name] for name, coefficient in self.coefficients.items())
+
+    def __init__(self, constant: float, coefficients: Dict[str, float]):
+        """
+        :param constant: Output when all inputs are equal to 0
+        :param coefficients: Coefficient of each input variable, variables
+                             without coefficient do not affect the output
+        """
+
+        self.constant = constant
+        self.coefficients = coefficients
 
 
 class OutputFunction:
     """IF rule THEN f(x)"""
 
-    def compile(self, inputs: Dict[str, FuzzyVariable]) -> Callable[[Dict[str, float]], Tuple[float, float]]:
-        rule_weight = self.rule.compile(inputs)
+    def compile(self, inputs: Dict[str, FuzzyVariable], logic: LogicalSystem = Zadeh()) \
+            -> Callable[[Dict[str, float]], Tuple[float, float]]:
+        """
+        :param inputs: System inputs with symbolic names as dictionary key
+        :param logic: Logical system providing t-norm and t-conorm
+        :return: Function computing rule weight and output for given input values
+        """
 
-        #  TODO: Code smell - we assume that rule is going to return constant function
-        return lambda outs: (rule_weight(outs).membership(0), self.output_function(outs))
+        return _WeightedOutput(self.rule.compile(inputs, logic), self.output_function)
 
     def __init__(self, rule: FuzzyRule, output_function: Callable[[Dict[str, float]], float]):
         self.rule = rule
         self.output_function = output_function
 
 
-class SugenoSystem:
+class _WeightedOutput:
+    """
+    Firing strength and output of Sugeno rule
+    """
+
+    def __call__(self, values: Dict[str, float]) -> Tuple[float, float]:
+        return self.rule_weight(values), self.output_function(values)
+
+    def __init__(self, rule_weight: Callable[[Dict[str, float], ], float],
+                 output_function: Callable[[Dict[str, float]], float]):
+        self.rule_weight = rule_weight
+        self.output_function = output_function
+
+
+class SugenoSystem(_SystemInputs):
     @classmethod
     def empty(cls, logic: LogicalSystem = Zadeh()):
         return cls({}, [], logic)
@@ -231,28 +1239,217 @@ class SugenoSystem:
     def add_rule(self, fuzzy_rule: OutputFunction):
         self.rule_set.append(fuzzy_rule)
 
-    def add_input(self, name: str, memberships: Dict[str, MembershipFunction]):
-        self.inputs[name] = FuzzyVariable(name, {
-            state: FuzzySet(membership, self.logic)
-            for state, membership in memberships.items()
-        })
+    def compile(self) -> 'SugenoEngine':
+        """
+        Validate rule base and resolve all variables and states used by rules.
+        Resulting engine is immutable - changes made to the system after compilation
+        are not visible to it.
+
+        :raise InvalidRuleError: When rule refers to unknown variable or state
+        :return: Inference engine ready to be run multiple times
+        """
+
+        for rule in self.rule_set:
+            if isinstance(rule.output_function, Linear):
+                unknown = set(rule.output_function.coefficients) - set(self.inputs)
+                if unknown:
+                    raise InvalidRuleError(
+                        f"Linear output function refers to unknown variables {sorted(unknown)}")
+
+        # Batch requires only inputs read by antecedents and by `Linear` output functions
+        names = tuple(name for name in self.inputs if any(
+            name in rule.output_function.coefficients
+            for rule in self.rule_set if isinstance(rule.output_function, Linear)))
+        fuzzification = Fuzzification(self.inputs)
+        strengths = tuple(
+            rule.rule.compile_strength(fuzzification, self.logic) for rule in self.rule_set)
+        triggers = [rule.rule.triggers(fuzzification) for rule in self.rule_set]
+        return SugenoEngine(
+            fuzzification=fuzzification,
+            strengths=strengths,
+            triggers=_trigger_table(triggers, len(fuzzification.terms)),
+            output_functions=tuple(rule.output_function for rule in self.rule_set),
+            names=names,
+            coefficients=np.array([
+                [rule.output_function.constant] + [
+                    rule.output_function.coefficients.get(name, 0.) for name in names]
+                if isinstance(rule.output_function, Linear) else [np.nan] * (len(names) + 1)
+                for rule in self.rule_set
+            ]).reshape(len(self.rule_set), len(names) + 1)
+        )
 
     def run(self, values: Dict[str, float]) -> float:
+        """
+        Compile system and run it on single sample. When system is run multiple times
+        it's cheaper to `compile` it once and run resulting engine.
+
+        :param values: Crisp value of each input variable
+        :return: Weighted average of rule outputs
+        """
+
+        return self.compile().run(values)
+
+    def run_batch(self, values: Batch, columns: Optional[Sequence[str]] = None,
+                  workers: int = 1) -> np.ndarray:
+        """
+        Compile system and run it on batch of samples. See `SugenoEngine.run_batch`.
+
+        :param values: Equal-length arrays of crisp values for each input variable or
+                       2-D array with one sample per row
+        :param columns: Input variable of each column when `values` is 2-D array
+        :param workers: Number of processes sharing the batch
+        :return: Weighted average of rule outputs for each sample
+        """
+
+        return self.compile().run_batch(values, columns, workers)
+
+    def tabulate(self, grid_spec: GridSpec) -> ControlSurface:
+        """
+        Run system in batch over regular grid of inputs and build lookup table of its
+        output, answering queries with multilinear interpolation.
+
+        :param grid_spec: Lowest value, highest value and number of nodes for each input
+        :raise ValueError: When grid is invalid
+        :return: Control surface of system output
+        """
+
+        engine = self.compile()
+        return tabulate(lambda batch: {"output": engine.run_batch(batch)}, grid_spec)["output"]
+
+    def generate(self) -> GeneratedFunction:
+        """
+        Compile system to straight-line python source running single sample: membership
+        formulas, norms and `Linear` output functions are inlined and only rules triggered
+        by non-zero memberships are evaluated.
+
+        :raise InvalidRuleError: When rule refers to unknown variable or state
+        :return: Function taking crisp value of each input variable (it raises `KeyError`
+                 when any of them is missing) and returning weighted average of rule
+                 outputs. Generated code is available as its `source`
+        """
+
+        engine = self.compile()
+        builder = SourceBuilder()
+        inputs = _generate_fuzzification(builder, engine.fuzzification, [
+            name for rule in self.rule_set if isinstance(rule.output_function, Linear)
+            for name in rule.output_function.coefficients])
+
+        builder.line("sum_of_weights = 0")
+        builder.line("sum_of_results = 0")
+        for rule in self.rule_set:
+            positions = sorted(rule.rule.triggers(engine.fuzzification))
+            with builder.block(f"if {' or '.join(f'm{position}' for position in positions)}:"):
+                weight = rule.rule.generate_strength(engine.fuzzification, self.logic, builder)
+                if isinstance(rule.output_function, Linear):
+                    output = " + ".join(
+                        f"{builder.literal(coefficient)} * {inputs[name]}"
+                        for name, coefficient in rule.output_function.coefficients.items()) or "0"
+                    output = f"{builder.literal(rule.output_function.constant)} + ({output})"
+                else:
+                    output = f"{builder.constant(rule.output_function, 'f')}(values)"
+                # Single triggering term was already checked to be non-zero
+                if [weight] == [f"m{position}" for position in positions]:
+                    builder.line(f"sum_of_weights += {weight}")
+                    builder.line(f"sum_of_results += {weight} * ({output})")
+                    continue
+                with builder.block(f"if {weight}:"):
+                    builder.line(f"sum_of_weights += {weight}")
+                    builder.line(f"sum_of_results += {weight} * ({output})")
+
+        with builder.block("if isclose(sum_of_weights, 0):"):
+            builder.line("return 0")
+        builder.line("return sum_of_results / sum_of_weights")
+
+        return builder.build("run", ["values"])
+
+    def __init__(self, inputs: Dict[str, FuzzyVariable], rules: List[OutputFunction],
+                 logic: LogicalSystem):
+        self.inputs = inputs
+        self.rule_set = rules
+        self.logic = logic
+
+
+class SugenoEngine(NamedTuple):
+    """
+    Compiled Sugeno system. All lookups are resolved at compile time, so
+    running engine costs only evaluation of memberships, norms and output functions.
+    For single sample only rules triggered by terms with non-zero membership are evaluated.
+    """
+
+    fuzzification: Fuzzification
+    strengths: Tuple[Callable[[Sequence[Numeric], ], Numeric], ...]
+    triggers: Tuple[Tuple[int, ...], ...]
+    output_functions: Tuple[Callable[[Dict[str, float]], float], ...]
+    names: Tuple[str, ...]
+    coefficients: np.ndarray
+
+    def run(self, values: Dict[str, float]) -> float:
+        """
+        :param values: Crisp value of each input variable
+        :return: Weighted average of rule outputs
+        """
+
+        memberships = self.fuzzification(values)
         sum_of_weights = 0
         sum_of_results = 0
 
-        for rule in self.rule_set:
-            weight, result = rule.compile(self.inputs)(values)
-            sum_of_weights += weight
-            sum_of_results += weight * result
+        for rule in _fired_rules(self.triggers, memberships):
+            weight = self.strengths[rule](memberships)
+            if weight:
+                sum_of_weights += weight
+                sum_of_results += weight * self.output_functions[rule](values)
 
         if isclose(sum_of_weights, 0):
             return 0
         else:
             return sum_of_results / sum_of_weights
 
-    def __init__(self, inputs: Dict[str, FuzzyVariable], rules: List[OutputFunction],
-                 logic: LogicalSystem):
-        self.inputs = inputs
-        self.rule_set = rules
-        self.logic = logic
+    def run_batch(self, values: Batch, columns: Optional[Sequence[str]] = None,
+                  workers: int = 1) -> np.ndarray:
+        """
+        Run engine on many samples at once. Outputs of all `Linear` rules are computed
+        with single matrix product, other output functions are called sample by sample.
+
+        :param values: Equal-length arrays of crisp values for each input variable or
+                       2-D array with one sample per row
+        :param columns: Input variable of each column when `values` is 2-D array
+        :param workers: Number of processes sharing the batch. Batch is split into equal
+                        shards run in process pool, engine is pickled and sent to each of them
+        :raise ValueError: When batch is malformed or lacks input variable read by
+                           antecedents or `Linear` output functions
+        :return: Weighted average of rule outputs for each sample
+        """
+
+        batch, size = _as_batch(values, columns)
+        missing = set(self.names) - set(batch)
+        if missing:
+            raise ValueError(f"Input values for variables {sorted(missing)} are unknown")
+
+        if workers > 1 and size > 1:
+            return np.concatenate(_run_sharded(self.run_batch, batch, size, workers))
+
+        memberships = self.fuzzification(batch)
+        weights = np.empty((size, len(self.strengths)))
+        for i, strength in enumerate(self.strengths):
+            weights[:, i] = strength(memberships)
+
+        samples = np.empty((size, len(self.names) + 1))
+        samples[:, 0] = 1.
+        for i, name in enumerate(self.names):
+            samples[:, i + 1] = batch[name]
+        results = samples @ self.coefficients.T
+
+        for i, output_function in enumerate(self.output_functions):
+            if not isinstance(output_function, Linear):
+                # As in `run`, output function is called only for samples firing the rule
+                fired = np.flatnonzero(weights[:, i])
+                results[:, i] = 0.
+                results[fired, i] = [
+                    output_function({name: column[j] for name, column in batch.items()})
+                    for j in fired
+                ]
+
+        sum_of_weights = weights.sum(axis=1)
+        sum_of_results = (weights * results).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(sum_of_weights == 0, 0., sum_of_results / sum_of_weights)
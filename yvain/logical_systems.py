@@ -1,7 +1,9 @@
-from math import isclose, log
-from typing import Optional
+from math import isclose, expm1, log, log1p
+from typing import Optional, Sequence, Iterable, Callable
 
-from yvain.membership_functions import MembershipFunction
+import numpy as np
+
+from yvain.membership_functions import MembershipFunction, Numeric
 
 
 # TODO:
@@ -12,10 +14,50 @@ from yvain.membership_functions import MembershipFunction
 # Yu
 
 
+def _is_array(*values: Numeric) -> bool:
+    return any(isinstance(value, np.ndarray) for value in values)
+
+
+def _all_equal(a: Numeric, b: float) -> bool:
+    if isinstance(a, np.ndarray):
+        return bool(np.all(a == b))
+    return a == b
+
+
+def _isclose(a: np.ndarray, b: float) -> np.ndarray:
+    """
+    Elementwise counterpart of `math.isclose` with default tolerances
+    """
+
+    return np.abs(a - b) <= 1e-09 * np.maximum(np.abs(a), abs(b))
+
+
+class Combination:
+    """
+    Membership function combining memberships of other functions with value-level
+    operation of logical system. Contrary to closure it can be pickled (as long as
+    combined functions can), so fuzzy sets built with it can be sent to other processes.
+    """
+
+    def __call__(self, x: Numeric) -> Numeric:
+        return self.operation(*[membership(x) for membership in self.memberships])
+
+    def __init__(self, operation: Callable[..., Numeric], *memberships: MembershipFunction):
+        """
+        :param operation: Operation on membership values, e.g. `Zadeh().t_norm_values`
+        :param memberships: Combined membership functions
+        """
+
+        self.operation = operation
+        self.memberships = memberships
+
+
 class LogicalSystem:
     """
     Logical system describes T-Norm, T-Conorm and negation used in fuzzy set operations.
-    Instead of whole sets `LogicalSystem` operates on membership functions.
+    Norms are defined on membership values (`t_norm_values`, `t_conorm_values`,
+    `complement_values`) - those accept floats and numpy arrays. Operations on membership
+    functions (`t_norm`, `t_conorm`, `complement`) are built on top of them.
     """
 
     def complement(self, membership: MembershipFunction) -> MembershipFunction:
@@ -29,191 +71,284 @@ class LogicalSystem:
         :return: :math:`\\mu\\prime(x)=1 - \\mu(x)`
         """
 
-        return lambda x: 1 - membership(x)
+        return Combination(self.complement_values, membership)
 
     def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
             -> MembershipFunction:
-        raise NotImplementedError
-
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
         """
-        By default t-conorm is defined by they'r correlation with t-norm. For performance and
-        precision reasons it should be overridden in subclass (if possible)
-
         :param membership_a: :math:`\\mu_1`
         :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = \\neg(\\mu_1(x) and \\mu_2(x))`
+        :raise NotImplementedError: When neither `t_norm` nor `t_norm_values` is overridden
+        :return: :math:`\\mu\\prime(x) = \\mu_1(x) and \\mu_2(x)`
         """
 
-        return self.complement(
-            self.t_norm(self.complement(membership_a), self.complement(membership_b)))
+        if not self._overrides("t_norm_values"):
+            raise NotImplementedError
 
+        return Combination(self.t_norm_values, membership_a, membership_b)
 
-class Zadeh(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
+    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
             -> MembershipFunction:
         """
         :param membership_a: :math:`\\mu_1`
         :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=min(\\mu_1(x), \\mu2(x))`
+        :return: :math:`\\mu\\prime(x) = \\mu_1(x) or \\mu_2(x)`
         """
 
-        return lambda x: min(membership_a(x), membership_b(x))
+        return Combination(self.t_conorm_values, membership_a, membership_b)
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def complement_values(self, a: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=max(\\mu_1(x), \\mu2(x))`
+        Complement of membership values instead of membership function.
+
+        :param a: Membership degree or array of membership degrees
+        :return: :math:`1 - a`
         """
 
-        return lambda x: max(membership_a(x), membership_b(x))
+        if self._overrides("complement"):
+            return self._apply(self.complement, a)
 
+        return 1 - a
 
-class Drastic(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)` = If :math:`\\mu_1(x) = 1`
-                 or :math:`\\mu_2(x) = 1` then return 1 else 0
+        T-norm of membership values instead of membership functions. Arrays are
+        combined elementwise (with broadcasting). Subclass have to override either this
+        method or `t_norm` - in second case each pair of values is passed through `t_norm`.
+
+        :param a: Membership degree or array of membership degrees
+        :param b: Membership degree or array of membership degrees
+        :return: Intersection of membership degrees
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if self._overrides("t_norm"):
+            return self._apply(self.t_norm, a, b)
 
-            if isclose(a, 1):
-                return b
-            elif isclose(b, 1):
-                return a
-            else:
-                return 0
+        raise NotImplementedError
 
-        return norm
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        T-conorm of membership values instead of membership functions. Arrays are
+        combined elementwise (with broadcasting). By default t-conorm is defined by they'r
+        correlation with t-norm. For performance and precision reasons it should be
+        overridden in subclass (if possible)
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+        :param a: Membership degree or array of membership degrees
+        :param b: Membership degree or array of membership degrees
+        :return: :math:`\\neg(\\neg a and \\neg b)`
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)` = If :math:`\\mu_1(x) = 0`
-                 or :math:`\\mu_2(x) = 0` then return 0 else 1
+
+        if self._overrides("t_conorm"):
+            return self._apply(self.t_conorm, a, b)
+
+        return self.complement_values(
+            self.t_norm_values(self.complement_values(a), self.complement_values(b)))
+
+    def t_norm_many(self, values: Iterable[Numeric]) -> Numeric:
         """
+        T-norm of any number of membership values. Reduction stops as soon as result
+        is equal to 0 (absorbing element of each t-norm), remaining values are not
+        consumed - they can be computed lazily.
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        :param values: Membership degrees or arrays of membership degrees
+        :return: Intersection of all membership degrees, 1 when no values are given
+        """
 
-            if isclose(a, 0):
-                return b
-            elif isclose(b, 0):
-                return a
-            else:
-                return 1
+        iterator = iter(values)
+        result = next(iterator, 1.)
+        while not _all_equal(result, 0):
+            value = next(iterator, None)
+            if value is None:
+                break
+            result = self.t_norm_values(result, value)
 
-        return norm
+        return result
 
+    def t_conorm_many(self, values: Iterable[Numeric]) -> Numeric:
+        """
+        T-conorm of any number of membership values. Reduction stops as soon as result
+        is equal to 1 (absorbing element of each t-conorm), remaining values are not
+        consumed - they can be computed lazily.
 
-class Product(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+        :param values: Membership degrees or arrays of membership degrees
+        :return: Union of all membership degrees, 0 when no values are given
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = \\mu_1(x) * \\mu_2(x)`
+
+        iterator = iter(values)
+        result = next(iterator, 0.)
+        while not _all_equal(result, 1):
+            value = next(iterator, None)
+            if value is None:
+                break
+            result = self.t_conorm_values(result, value)
+
+        return result
+
+    def _overrides(self, method: str) -> bool:
+        return getattr(type(self), method) is not getattr(LogicalSystem, method)
+
+    @staticmethod
+    def _apply(operator, *values: Numeric) -> Numeric:
         """
+        Evaluate membership function operator on constant memberships. Used for
+        logical systems defining only operations on membership functions.
 
-        return lambda x: membership_a(x) * membership_b(x)
+        :param operator: One of `complement`, `t_norm`, `t_conorm`
+        :param values: Memberships (or arrays of memberships) passed as operator arguments
+        :return: Result of operator for each element
+        """
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+        def scalar(*memberships):
+            return operator(*[_constant(membership) for membership in memberships])(0)
+
+        if _is_array(*values):
+            return np.vectorize(scalar, otypes=[float])(*values)
+
+        return scalar(*values)
+
+
+def _constant(value: float) -> MembershipFunction:
+    return lambda x: value
+
+
+class Zadeh(LogicalSystem):
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = \\mu_1(x) + \\mu_2(x) - \\mu_1(x) * \\mu_2(x)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`min(\\mu_1(x), \\mu2(x))`
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b):
+            return np.minimum(a, b)
+        return min(a, b)
 
-            return a + b - a * b
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`max(\\mu_1(x), \\mu2(x))`
+        """
 
-        return norm
+        if _is_array(a, b):
+            return np.maximum(a, b)
+        return max(a, b)
 
 
-class Lukasiewicz(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+class Drastic(LogicalSystem):
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = max(0, \\mu_1(x)) + \\mu_2(x) - 1)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: If :math:`\\mu_1(x) = 1` then return :math:`\\mu_2(x)`,
+                 if :math:`\\mu_2(x) = 1` then return :math:`\\mu_1(x)` else 0
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b):
+            return np.where(_isclose(a, 1), b, np.where(_isclose(b, 1), a, 0.))
+
+        if isclose(a, 1):
+            return b
+        elif isclose(b, 1):
+            return a
+        else:
+            return 0
 
-            return max(0., a + b - 1)
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: If :math:`\\mu_1(x) = 0` then return :math:`\\mu_2(x)`,
+                 if :math:`\\mu_2(x) = 0` then return :math:`\\mu_1(x)` else 1
+        """
 
-        return norm
+        if _is_array(a, b):
+            return np.where(_isclose(a, 0), b, np.where(_isclose(b, 0), a, 1.))
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+        if isclose(a, 0):
+            return b
+        elif isclose(b, 0):
+            return a
+        else:
+            return 1
+
+
+class Product(LogicalSystem):
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = min(\\mu_1(x)) + \\mu_2(x), 1)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\mu_1(x) * \\mu_2(x)`
         """
 
-        return lambda x: min(membership_a(x) + membership_b(x), 1)
+        return a * b
+
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\mu_1(x) + \\mu_2(x) - \\mu_1(x) * \\mu_2(x)`
+        """
+
+        return a + b - a * b
+
+
+class Lukasiewicz(LogicalSystem):
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`max(0, \\mu_1(x) + \\mu_2(x) - 1)`
+        """
+
+        if _is_array(a, b):
+            return np.maximum(0., a + b - 1)
+        return max(0., a + b - 1)
+
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`min(\\mu_1(x) + \\mu_2(x), 1)`
+        """
+
+        if _is_array(a, b):
+            return np.minimum(a + b, 1)
+        return min(a + b, 1)
 
 
 class Fodor(LogicalSystem):
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1(x)`
-        :param membership_b: :math:`\\mu_2(x)`
-        :return: :math:`\\mu\\prime(x)` = If :math:`\\mu_1(x) + \\mu_2(x) > 1`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: If :math:`\\mu_1(x) + \\mu_2(x) > 1`
                 then return :math:`min(\\mu_1(x), \\mu_2(x))` else 0
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
-
-            if a + b > 1:
-                return min(a, b)
-            else:
-                return 0
+        if _is_array(a, b):
+            return np.where(a + b > 1, np.minimum(a, b), 0.)
 
-        return norm
+        if a + b > 1:
+            return min(a, b)
+        else:
+            return 0
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1(x)`
-        :param membership_b: :math:`\\mu_2(x)`
-        :return: :math:`\\mu\\prime(x)` = If :math:`\\mu_1(x) + \\mu_2(x) < 1`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: If :math:`\\mu_1(x) + \\mu_2(x) < 1`
                 then return :math:`max(\\mu_1(x), \\mu_2(x))` else 1
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
-
-            if a + b < 1:
-                return max(a, b)
-            else:
-                return 1
+        if _is_array(a, b):
+            return np.where(a + b < 1, np.maximum(a, b), 1.)
 
-        return norm
+        if a + b < 1:
+            return max(a, b)
+        else:
+            return 1
 
 
 class ParametrizedLogicalSystem(LogicalSystem):
@@ -221,65 +356,115 @@ class ParametrizedLogicalSystem(LogicalSystem):
     def p(self) -> float:
         return self._p
 
-    def t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
         Most of the time parametrized logical systems equations would not work for edge
         values of `p` (like 0, 1, inf, -inf). Such systems are inheriting non-parametrised
         system behaviours in such cases.
 
-        :param membership_a: :math:`\\mu_1(x)`
-        :param membership_b: :math:`\\mu_2(x)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
         :return: :math:`\\mu\\prime(x)`
         """
 
         if self.__logic is not None:
-            return self.__logic.t_norm(membership_a, membership_b)
+            return self.__logic.t_norm_values(a, b)
         else:
-            return self._t_norm(membership_a, membership_b)
+            return self._t_norm_values(a, b)
 
-    def t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
         Most of the time parametrized logical systems equations would not work for edge
         values of `p` (like 0, 1, inf, -inf). Such systems are inheriting non-parametrised
         system behaviours in such cases.
 
-        :param membership_a: :math:`\\mu_1(x)`
-        :param membership_b: :math:`\\mu_2(x)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
         :return: :math:`\\mu\\prime(x)`
         """
 
         if self.__logic is not None:
-            return self.__logic.t_conorm(membership_a, membership_b)
+            return self.__logic.t_conorm_values(a, b)
         else:
-            return self._t_conorm(membership_a, membership_b)
+            return self._t_conorm_values(a, b)
 
-    def _t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
         Implementation of t-norm covering cases when t-norm is not inherited from
         non-parametrised logic.
 
-        :param membership_a: :math:`\\mu_1(x)`
-        :param membership_b: :math:`\\mu_2(x)`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
         :return: :math:`\\mu\\prime(x)`
         """
 
         raise NotImplementedError
 
-    def _t_conorm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
         Implementation of t-conorm covering cases when t-conorm is not inherited from
         non-parametrised logic. It defaults to general equation derived from t-norm/conorm relation
 
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x) = \\neg(\\mu_1(x) and \\mu_2(x))`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\neg(\\neg \\mu_1(x) and \\neg \\mu_2(x))`
+        """
+
+        return self.complement_values(
+            self._t_norm_values(self.complement_values(a), self.complement_values(b)))
+
+    @classmethod
+    def t_norm_sweep(cls, ps: Sequence[float], a: Numeric, b: Numeric) -> np.ndarray:
+        """
+        Evaluate t-norm for many values of `p` at once, e.g. to compare designs
+        with different parameters. Equation is evaluated once for all values of `p`.
+
+        :param ps: Values of parameter `p`
+        :param a: Membership degree or array of membership degrees
+        :param b: Membership degree or array of membership degrees
+        :return: Array where i-th row is t-norm of `a` and `b` with `p = ps[i]`
+        """
+
+        return cls._sweep(ps, a, b, conorm=False)
+
+    @classmethod
+    def t_conorm_sweep(cls, ps: Sequence[float], a: Numeric, b: Numeric) -> np.ndarray:
+        """
+        Evaluate t-conorm for many values of `p` at once, e.g. to compare designs
+        with different parameters. Equation is evaluated once for all values of `p`.
+
+        :param ps: Values of parameter `p`
+        :param a: Membership degree or array of membership degrees
+        :param b: Membership degree or array of membership degrees
+        :return: Array where i-th row is t-conorm of `a` and `b` with `p = ps[i]`
         """
 
-        return super(ParametrizedLogicalSystem, self).t_conorm(membership_a, membership_b)
+        return cls._sweep(ps, a, b, conorm=True)
+
+    @classmethod
+    def _sweep(cls, ps: Sequence[float], a: Numeric, b: Numeric, conorm: bool) -> np.ndarray:
+        ps = np.asarray(ps, dtype=float)
+        systems = [cls(p) for p in ps]
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+        vector = cls.__new__(cls)
+        vector._p = ps.reshape((len(ps),) + (1,) * a.ndim)
+        with np.errstate(all="ignore"):
+            vector._prepare()
+            norm = vector._t_conorm_values if conorm else vector._t_norm_values
+            result = np.array(np.broadcast_to(norm(a, b), (len(ps),) + a.shape))
+
+        for i, system in enumerate(systems):
+            if system.__logic is not None:
+                result[i] = system.t_conorm_values(a, b) if conorm else system.t_norm_values(a, b)
+
+        return result
+
+    def _prepare(self):
+        """
+        Precompute constants depending on `p` used by norms. It's called only when
+        norms are not inherited from non-parametrised logic, `p` may be numpy array.
+        """
 
     def _inherit_logic(self) -> Optional[LogicalSystem]:
         """
@@ -295,26 +480,47 @@ class ParametrizedLogicalSystem(LogicalSystem):
     def __init__(self, p: float):
         self._p = p
         self.__logic = self._inherit_logic()
+        if self.__logic is None:
+            self._prepare()
 
 
 class Frank(ParametrizedLogicalSystem):
-    def _t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=\\log_p(1 + \\frac{(p^{\\mu_1(x)} - 1) * (p^{\\mu_2(x)} - 1)}{p - 1})`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\log_p(1 + \\frac{(p^{\\mu_1(x)} - 1) * (p^{\\mu_2(x)} - 1)}{p - 1})`
+        """
+
+        if _is_array(a, b, self._p):
+            pa = np.expm1(a * self._log_p)
+            pb = np.expm1(b * self._log_p)
+            return np.log1p((pa * pb) / self._p_minus_one) / self._log_p
+
+        pa = expm1(a * self._log_p)
+        pb = expm1(b * self._log_p)
+        return log1p((pa * pb) / self._p_minus_one) / self._log_p
+
+    def _t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`1 - \\log_p(1 +
+                    \\frac{(p^{1 - \\mu_1(x)} - 1) * (p^{1 - \\mu_2(x)} - 1)}{p - 1})`
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b, self._p):
+            pa = np.expm1((1 - a) * self._log_p)
+            pb = np.expm1((1 - b) * self._log_p)
+            return 1 - np.log1p((pa * pb) / self._p_minus_one) / self._log_p
 
-            pa = (self.p ** a) - 1
-            pb = (self.p ** b) - 1
-            return log(1 + ((pa * pb) / (self.p - 1)), self.p)
+        pa = expm1((1 - a) * self._log_p)
+        pb = expm1((1 - b) * self._log_p)
+        return 1 - log1p((pa * pb) / self._p_minus_one) / self._log_p
 
-        return norm
+    def _prepare(self):
+        self._log_p = np.log(self._p) if _is_array(self._p) else log(self._p)
+        self._p_minus_one = self._p - 1
 
     def _inherit_logic(self) -> Optional[LogicalSystem]:
         if self.p < 0:
@@ -329,21 +535,39 @@ class Frank(ParametrizedLogicalSystem):
 
 
 class ShweizerSklar(ParametrizedLogicalSystem):
-    def _t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=max(0, \\mu_1(x)^p + \\mu_2(x)^p - 1)^{1/p}`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`max(0, \\mu_1(x)^p + \\mu_2(x)^p - 1)^{1/p}`
+        """
+
+        if _is_array(a, b, self._p):
+            with np.errstate(divide="ignore"):
+                return np.maximum(0., (a ** self._p) + (b ** self._p) - 1) ** self._inverse_p
+
+        if self._p < 0 and (a == 0 or b == 0):
+            return 0.
+        return max(0., ((a ** self._p) + (b ** self._p) - 1)) ** self._inverse_p
+
+    def _t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`1 - max(0, (1 - \\mu_1(x))^p + (1 - \\mu_2(x))^p - 1)^{1/p}`
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b, self._p):
+            with np.errstate(divide="ignore"):
+                return 1 - np.maximum(0., ((1 - a) ** self._p) + ((1 - b) ** self._p) - 1) \
+                    ** self._inverse_p
 
-            return max(0., ((a ** self.p) + (b ** self.p) - 1)) ** (1 / self.p)
+        if self._p < 0 and (a == 1 or b == 1):
+            return 1.
+        return 1 - max(0., ((1 - a) ** self._p) + ((1 - b) ** self._p) - 1) ** self._inverse_p
 
-        return norm
+    def _prepare(self):
+        self._inverse_p = 1 / self._p
 
     def _inherit_logic(self) -> Optional[LogicalSystem]:
         if self.p == float("-inf"):
@@ -355,21 +579,30 @@ class ShweizerSklar(ParametrizedLogicalSystem):
 
 
 class Yager(ParametrizedLogicalSystem):
-    def _t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=max(0, 1 - ((1 - \\mu_1(x))^p + (1 - \\mu_2(x))^p))^{1/p}`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`max(0, 1 - ((1 - \\mu_1(x))^p + (1 - \\mu_2(x))^p))^{1/p}`
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b, self._p):
+            return np.maximum(0., 1 - ((1 - a) ** self._p + (1 - b) ** self._p) ** self._inverse_p)
+        return max(0., 1 - ((1 - a) ** self._p + (1 - b) ** self._p) ** self._inverse_p)
 
-            return max(0., 1 - ((1 - a) ** self.p + (1 - b) ** self.p) ** (1 / self.p))
+    def _t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`min(1, (\\mu_1(x)^p + \\mu_2(x)^p)^{1/p})`
+        """
 
-        return norm
+        if _is_array(a, b, self._p):
+            return np.minimum(1., (a ** self._p + b ** self._p) ** self._inverse_p)
+        return min(1., (a ** self._p + b ** self._p) ** self._inverse_p)
+
+    def _prepare(self):
+        self._inverse_p = 1 / self._p
 
     def _inherit_logic(self) -> Optional[LogicalSystem]:
         if self.p < 0:
@@ -382,27 +615,56 @@ class Yager(ParametrizedLogicalSystem):
 
 
 class Dombi(ParametrizedLogicalSystem):
-    def _t_norm(self, membership_a: MembershipFunction, membership_b: MembershipFunction) \
-            -> MembershipFunction:
+    def _t_norm_values(self, a: Numeric, b: Numeric) -> Numeric:
         """
-        :param membership_a: :math:`\\mu_1`
-        :param membership_b: :math:`\\mu_2`
-        :return: :math:`\\mu\\prime(x)=\\frac{1}{1 +
-                    (((\\frac{1 - \\mu_1(x)}{\\mu_1(x)})^p + (\\frac{1 - \\mu_2(x)}{\\mu_2(x)})^p)^p)^{1/p}}`
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\frac{1}{1 +
+                    (((\\frac{1 - \\mu_1(x)}{\\mu_1(x)})^p +
+                    (\\frac{1 - \\mu_2(x)}{\\mu_2(x)})^p)^p)^{1/p}}`
         """
 
-        def norm(x):
-            a = membership_a(x)
-            b = membership_b(x)
+        if _is_array(a, b, self._p):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ap = ((1 / a) - 1) ** self._p
+                bp = ((1 / b) - 1) ** self._p
+                norm = 1 / (1 + ((ap + bp) ** self._inverse_p))
+            return np.where(_isclose(a, 0) | _isclose(b, 0), 0., norm)
+
+        if isclose(a, 0) or isclose(b, 0):
+            return 0
+        else:
+            ap = ((1 / a) - 1) ** self._p
+            bp = ((1 / b) - 1) ** self._p
+            return 1 / (1 + ((ap + bp) ** self._inverse_p))
 
-            if isclose(a, 0) or isclose(b, 0):
-                return 0
-            else:
-                ap = ((1 / a) - 1) ** self.p
-                bp = ((1 / b) - 1) ** self.p
-                return 1 / (1 + ((ap + bp) ** (1 / self.p)))
+    def _t_conorm_values(self, a: Numeric, b: Numeric) -> Numeric:
+        """
+        :param a: :math:`\\mu_1(x)`
+        :param b: :math:`\\mu_2(x)`
+        :return: :math:`\\frac{1}{1 +
+                    ((\\frac{\\mu_1(x)}{1 - \\mu_1(x)})^p +
+                    (\\frac{\\mu_2(x)}{1 - \\mu_2(x)})^p)^{-1/p}}`
+        """
 
-        return norm
+        if _is_array(a, b, self._p):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ap = (a / (1 - a)) ** self._p
+                bp = (b / (1 - b)) ** self._p
+                norm = 1 / (1 + ((ap + bp) ** -self._inverse_p))
+            return np.where(_isclose(1 - a, 0) | _isclose(1 - b, 0), 1., norm)
+
+        if isclose(1 - a, 0) or isclose(1 - b, 0):
+            return 1
+        else:
+            ap = (a / (1 - a)) ** self._p
+            bp = (b / (1 - b)) ** self._p
+            if ap + bp == 0:
+                return 0.
+            return 1 / (1 + ((ap + bp) ** -self._inverse_p))
+
+    def _prepare(self):
+        self._inverse_p = 1 / self._p
 
     def _inherit_logic(self) -> Optional[LogicalSystem]:
         if self.p < 0:
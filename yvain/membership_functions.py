@@ -1,12 +1,82 @@
 """
 Predefined membership functions. Collection of parametrised functions
 greatly simplifies design of fuzzy applications.
+
+Every predefined membership function accepts either single crisp value or
+numpy array of values. In second case memberships of all elements are
+computed in single vectorized pass and returned as array of the same shape.
+
+Each predefined membership function describes also interval out of which
+it's equal to 0 (`support`) and interval where it's equal to 1 (`core`).
+Support of functions which never reach 0 (e.g. `Gaussian`) is whole real line,
+unless `epsilon` is given - then they report ε-support, interval out of which
+membership is lower than `epsilon`.
 """
 
-from math import exp
-from typing import Callable
+from array import array
+from bisect import bisect_right
+from math import ceil, exp, floor, inf, log, sqrt, pi
+from typing import Callable, Union, Tuple, Sequence, Optional
+
+import numpy as np
+
+Numeric = Union[float, np.ndarray]
+MembershipFunction = Callable[[Numeric, ], Numeric]
+Polygon = Tuple[Sequence[float], Sequence[float]]
+Interval = Tuple[float, float]
+
+
+def polygon_moments(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """
+    :param xs: Increasing `x` of breakpoints
+    :param ys: Membership at each breakpoint
+    :return: Area under piecewise-linear function and its first moment
+    """
+
+    area, moment = 0., 0.
+    for x0, x1, y0, y1 in zip(xs[:-1], xs[1:], ys[:-1], ys[1:]):
+        area += (x1 - x0) * (y0 + y1) / 2
+        moment += (x1 - x0) * (x0 * (2 * y0 + y1) + x1 * (y0 + 2 * y1)) / 6
+
+    return area, moment
+
+
+def support(membership: MembershipFunction, epsilon: float = 0.) -> Interval:
+    """
+    :param membership: Membership function, predefined or not
+    :param epsilon: Memberships lower than epsilon are treated as 0, support is exact
+                    when it's equal to 0
+    :return: Support of membership function, whole real line when it's unknown
+    """
+
+    if hasattr(membership, "support"):
+        return membership.support(epsilon)
+
+    return -inf, inf
+
+
+def evaluate(membership: MembershipFunction, x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate any membership function on array of values. Vectorized membership
+    functions are called once with whole array, other ones are called for each
+    element separately.
+
+    :param membership: Membership function, vectorized or not
+    :param x: Array of crisp values
+    :return: Array of memberships with the same shape as `x`
+    """
+
+    try:
+        result = membership(x)
+    except (TypeError, ValueError):
+        result = None
 
-MembershipFunction = Callable[[float, ], float]
+    if isinstance(result, np.ndarray) and result.shape == x.shape:
+        return result.astype(float, copy=False)
+    if isinstance(result, (int, float)):
+        return np.full(x.shape, float(result))
+
+    return np.vectorize(membership, otypes=[float])(x)
 
 
 class Triangle:
@@ -17,7 +87,12 @@ class Triangle:
     represent partial membership.
     """
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            left = (x - self.a) / (self.b - self.a)
+            right = (self.c - x) / (self.c - self.b)
+            return np.clip(np.minimum(left, right), 0., 1.)
+
         if self.a <= x <= self.b:
             return (x - self.a) / (self.b - self.a)
         elif self.b <= x <= self.c:
@@ -25,6 +100,35 @@ class Triangle:
         else:
             return 0
 
+    def breakpoints(self) -> Polygon:
+        """
+        :return: `x` and membership of each vertex of triangle
+        """
+
+        return (self.a, self.b, self.c), (0., 1., 0.)
+
+    def moments(self) -> Tuple[float, float]:
+        """
+        :return: Area under triangle and its first moment
+        """
+
+        return polygon_moments(*self.breakpoints())
+
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Ignored, triangle support is exact
+        :return: Interval out of which membership is equal to 0
+        """
+
+        return self.a, self.c
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: Interval where membership is equal to 1
+        """
+
+        return self.b, self.b
+
     def __init__(self, a: float, b: float, c: float):
         """
         :param a: Left corner of triangle
@@ -48,7 +152,12 @@ class Trapezoid:
     represent partial membership.
     """
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            left = (x - self.a) / (self.b - self.a)
+            right = (self.d - x) / (self.d - self.c)
+            return np.clip(np.minimum(left, right), 0., 1.)
+
         if self.a <= x <= self.b:
             return (x - self.a) / (self.b - self.a)
         elif self.b <= x <= self.c:
@@ -58,6 +167,35 @@ class Trapezoid:
         else:
             return 0
 
+    def breakpoints(self) -> Polygon:
+        """
+        :return: `x` and membership of each vertex of trapezoid
+        """
+
+        return (self.a, self.b, self.c, self.d), (0., 1., 1., 0.)
+
+    def moments(self) -> Tuple[float, float]:
+        """
+        :return: Area under trapezoid and its first moment
+        """
+
+        return polygon_moments(*self.breakpoints())
+
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Ignored, trapezoid support is exact
+        :return: Interval out of which membership is equal to 0
+        """
+
+        return self.a, self.d
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: Interval where membership is equal to 1
+        """
+
+        return self.b, self.c
+
     def __init__(self, a: float, b: float, c: float, d: float):
         """
         :param a: Left bottom corner of trapezoid
@@ -86,9 +224,40 @@ class Gaussian:
     the function.
     """
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            return np.exp(-0.5 * (((x - self.mu) / self.sigma) ** 2))
+
         return exp(-0.5 * (((x - self.mu) / self.sigma) ** 2))
 
+    def moments(self) -> Tuple[float, float]:
+        """
+        :return: Area under whole gaussian curve and its first moment
+        """
+
+        area = abs(self.sigma) * sqrt(2 * pi)
+        return area, area * self.mu
+
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Memberships lower than epsilon are treated as 0
+        :return: Interval out of which membership is lower than `epsilon`, whole real
+                 line when `epsilon` is 0
+        """
+
+        if epsilon <= 0:
+            return -inf, inf
+
+        radius = abs(self.sigma) * sqrt(-2 * log(epsilon))
+        return self.mu - radius, self.mu + radius
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: Interval where membership is equal to 1
+        """
+
+        return self.mu, self.mu
+
     def __init__(self, mu: float, sigma: float):
         """
         :param mu: Mean, function center
@@ -106,9 +275,32 @@ class Bell:
     width of bell plateau
     """
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            return 1 / (1 + (np.abs((x - self.mu) / self.sigma) ** (2 * self.gamma)))
+
         return 1 / (1 + (abs((x - self.mu) / self.sigma) ** (2 * self.gamma)))
 
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Memberships lower than epsilon are treated as 0
+        :return: Interval out of which membership is lower than `epsilon`, whole real
+                 line when `epsilon` is 0
+        """
+
+        if epsilon <= 0:
+            return -inf, inf
+
+        radius = abs(self.sigma) * (1 / epsilon - 1) ** (1 / (2 * self.gamma))
+        return self.mu - radius, self.mu + radius
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: Interval where membership is equal to 1
+        """
+
+        return self.mu, self.mu
+
     def __init__(self, mu: float, sigma: float, gamma: float):
         """
         :param mu: Function center
@@ -129,9 +321,33 @@ class Sigmoid:
     When `b > 0` then left side is not member of fuzzy set and slope increases membership to 1.
     """
 
-    def __call__(self, x: float) -> float:
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            with np.errstate(over="ignore"):
+                return 1 / (1 + np.exp(- self.b * (x - self.a)))
+
         return 1 / (1 + exp(- self.b * (x - self.a)))
 
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Memberships lower than epsilon are treated as 0
+        :return: Interval out of which membership is lower than `epsilon`, whole real
+                 line when `epsilon` is 0
+        """
+
+        if self.b == 0 or epsilon <= 0:
+            return -inf, inf
+
+        bound = self.a - log(1 / epsilon - 1) / self.b
+        return (bound, inf) if self.b > 0 else (-inf, bound)
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: None, sigmoid never reaches full membership
+        """
+
+        return None
+
     def __init__(self, a: float, b: float):
         """
         :param a: Center of slope
@@ -140,3 +356,280 @@ class Sigmoid:
 
         self.a = a
         self.b = b
+
+
+class PiecewiseLinear:
+    """
+    Membership function linearly interpolated between arbitrary number of breakpoints,
+    e.g. empirically calibrated curve. Out of range of breakpoints membership is
+    equal to 0, so shoulders have to end with breakpoint at universe bound.
+    Single value is located with binary search, arrays are interpolated in single
+    vectorized pass.
+    """
+
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray):
+            return np.interp(x, self.xs, self.ys, left=0., right=0.)
+
+        i = bisect_right(self.xs, x)
+        if i == len(self.xs):
+            return self.ys[-1] if x == self.xs[-1] else 0
+        if i == 0:
+            return 0
+
+        x0, x1, y0, y1 = self.xs[i - 1], self.xs[i], self.ys[i - 1], self.ys[i]
+        return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+    def breakpoints(self) -> Polygon:
+        """
+        :return: `x` and membership of each breakpoint
+        """
+
+        return self.xs, self.ys
+
+    def moments(self) -> Tuple[float, float]:
+        """
+        :return: Area under function and its first moment
+        """
+
+        return polygon_moments(self.xs, self.ys)
+
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        :param epsilon: Ignored, support of piecewise-linear function is exact
+        :return: Interval out of which membership is equal to 0
+        """
+
+        positive = [i for i, y in enumerate(self.ys) if y > 0]
+        if not positive:
+            return self.xs[0], self.xs[0]
+
+        return self.xs[max(positive[0] - 1, 0)], self.xs[min(positive[-1] + 1, len(self.xs) - 1)]
+
+    def core(self) -> Optional[Interval]:
+        """
+        :return: First interval where membership is equal to 1, None if membership
+                 never reaches 1
+        """
+
+        full = [i for i, y in enumerate(self.ys) if y == 1]
+        if not full:
+            return None
+
+        last = full[0]
+        while last + 1 < len(self.ys) and self.ys[last + 1] == 1:
+            last += 1
+        return self.xs[full[0]], self.xs[last]
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]):
+        """
+        :param xs: Strictly increasing `x` of breakpoints
+        :param ys: Membership at each breakpoint
+        :raise ValueError: When there are less than 2 breakpoints, `xs` and `ys` lengths differ,
+                           `xs` are not strictly increasing or `ys` are out of [0, 1] range
+        """
+
+        if len(xs) != len(ys):
+            raise ValueError(f"Got {len(xs)} x values and {len(ys)} memberships")
+        if len(xs) < 2:
+            raise ValueError(f"At least 2 breakpoints are required, got {len(xs)}")
+        if any(x0 >= x1 for x0, x1 in zip(xs[:-1], xs[1:])):
+            raise ValueError(f"Breakpoints have to be strictly increasing, got {list(xs)}")
+        if any(not 0 <= y <= 1 for y in ys):
+            raise ValueError(f"Memberships have to be in range of [0, 1], got {list(ys)}")
+
+        self.xs: Tuple[float, ...] = tuple(float(x) for x in xs)
+        self.ys: Tuple[float, ...] = tuple(float(y) for y in ys)
+
+
+class Tabulated:
+    """
+    Lookup table approximating any (e.g. expensive or deeply composed) membership function
+    within [start, end]. Function is sampled once on uniform grid and then interpolated
+    linearly - each lookup costs constant time no matter how complex the function was.
+    Out of [start, end] original function is called.
+
+    Approximation error is measured at midpoints between samples and stored in `error`.
+    """
+
+    def __call__(self, x: Numeric) -> Numeric:
+        if isinstance(x, np.ndarray) and x.ndim == 0:
+            x = x.item()
+        if isinstance(x, np.ndarray):
+            inside = (x >= self.start) & (x <= self.end)
+            position = (np.where(inside, x, self.start) - self.start) * self.scale
+            i = np.minimum(position.astype(int), len(self.table) - 2)
+            result = self.values[i] + (self.values[i + 1] - self.values[i]) * (position - i)
+            if not inside.all():
+                result[~inside] = evaluate(self.function, x[~inside])
+            return result
+
+        if not self.start <= x <= self.end:
+            return self.function(x)
+
+        position = (x - self.start) * self.scale
+        i = min(int(position), len(self.table) - 2)
+        return self.table[i] + (self.table[i + 1] - self.table[i]) * (position - i)
+
+    def support(self, epsilon: float = 0.) -> Interval:
+        """
+        Support of original function is widened to enclosing samples, as interpolation
+        between sample within and sample out of it is non-zero.
+
+        :param epsilon: Memberships lower than epsilon are treated as 0
+        :return: Support of tabulated function
+        """
+
+        low, high = support(self.function, epsilon)
+        if self.start < low <= self.end:
+            low = self.start + floor((low - self.start) * self.scale) / self.scale
+        if self.start <= high < self.end:
+            high = min(self.start + ceil((high - self.start) * self.scale) / self.scale, self.end)
+
+        return low, high
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["values"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.values = np.frombuffer(self.table)
+
+    def __init__(self, function: MembershipFunction, start: float, end: float,
+                 resolution: Optional[int] = None, max_error: Optional[float] = None,
+                 max_resolution: int = 2 ** 20 + 1):
+        """
+        Exactly one of `resolution` and `max_error` have to be given. With `max_error`
+        number of samples is doubled until measured error does not exceed it.
+
+        :param function: Membership function to tabulate
+        :param start: Lowest tabulated value
+        :param end: Highest tabulated value
+        :param resolution: Number of samples
+        :param max_error: Maximal measured approximation error
+        :param max_resolution: Maximal number of samples when `max_error` is given
+        :raise ValueError: When range is empty, resolution is lower than 2, not exactly one
+                           of `resolution` and `max_error` is given or `max_error` cannot be
+                           reached with `max_resolution` samples
+        """
+
+        if start >= end:
+            raise ValueError(f"Upper bound ({end}) is lesser or equal to lower ({start})")
+        if (resolution is None) == (max_error is None):
+            raise ValueError("Exactly one of resolution and max_error have to be given")
+        if resolution is not None and resolution < 2:
+            raise ValueError(f"At least 2 samples are required, got {resolution}")
+
+        samples = evaluate(function, np.linspace(start, end, resolution or 65))
+        while True:
+            midpoints = np.linspace(start, end, 2 * len(samples) - 1)[1::2]
+            exact = evaluate(function, midpoints)
+            error = float(np.max(np.abs(exact - (samples[:-1] + samples[1:]) / 2)))
+            if max_error is None or error <= max_error:
+                break
+            if 2 * len(samples) - 1 > max_resolution:
+                raise ValueError(
+                    f"Error of {error} measured with {len(samples)} samples exceeds {max_error}")
+
+            refined = np.empty(2 * len(samples) - 1)
+            refined[0::2], refined[1::2] = samples, exact
+            samples = refined
+
+        self.function = function
+        self.start = start
+        self.end = end
+        self.scale = (len(samples) - 1) / (end - start)
+        self.table = array("d", samples)
+        self.values = np.frombuffer(self.table)
+        self.error = error
+
+
+class MembershipBank:
+    """
+    Many membership functions (e.g. all terms of single variable) evaluated at once.
+    Parameters of `Triangle`, `Trapezoid` and `Gaussian` functions are kept in contiguous
+    arrays, each kind of function is evaluated for all terms with single vectorized
+    expression. Other functions are evaluated one by one.
+    """
+
+    _PARAMETERS = {Triangle: ("a", "b", "c"), Trapezoid: ("a", "b", "c", "d"),
+                   Gaussian: ("mu", "sigma")}
+
+    @classmethod
+    def from_arrays(cls, kind: type, *parameters: Sequence[float]) -> 'MembershipBank':
+        """
+        :param kind: `Triangle`, `Trapezoid` or `Gaussian`
+        :param parameters: Array of each constructor parameter, one element per function
+        :raise ValueError: When kind is not supported, arrays lengths differ or
+                           parameters of any function are invalid
+        :return: Bank of functions of the same kind
+        """
+
+        if kind not in cls._PARAMETERS:
+            raise ValueError(f"Bank cannot be built from arrays of {kind.__name__} parameters")
+        if len(parameters) != len(cls._PARAMETERS[kind]):
+            raise ValueError(
+                f"{kind.__name__} requires {len(cls._PARAMETERS[kind])} parameter arrays, "
+                f"got {len(parameters)}")
+        if len({len(parameter) for parameter in parameters}) > 1:
+            raise ValueError("All parameter arrays have to be of equal length")
+
+        return cls([kind(*(float(value) for value in row)) for row in zip(*parameters)])
+
+    def __call__(self, x: Numeric) -> np.ndarray:
+        """
+        :param x: Crisp value or array of values
+        :return: Membership matrix, one row for each function and one column for each value
+        """
+
+        x = np.asarray(x, dtype=float)
+        column = x[np.newaxis, ...]
+        shape = (-1,) + (1,) * x.ndim
+        result = np.empty((len(self.functions),) + x.shape)
+
+        for kind, (indices, parameters) in self.groups.items():
+            parameters = [parameter.reshape(shape) for parameter in parameters]
+            if kind is Triangle:
+                a, b, c = parameters
+                left, right = (column - a) / (b - a), (c - column) / (c - b)
+                result[indices] = np.clip(np.minimum(left, right), 0., 1.)
+            elif kind is Trapezoid:
+                a, b, c, d = parameters
+                left, right = (column - a) / (b - a), (d - column) / (d - c)
+                result[indices] = np.clip(np.minimum(left, right), 0., 1.)
+            else:
+                mu, sigma = parameters
+                result[indices] = np.exp(-0.5 * (((column - mu) / sigma) ** 2))
+
+        for i in self.others:
+            result[i] = evaluate(self.functions[i], x)
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self.functions)
+
+    def __init__(self, functions: Sequence[MembershipFunction]):
+        """
+        :param functions: Membership functions, position in sequence identifies row
+                          of membership matrix
+        """
+
+        self.functions = list(functions)
+        grouped = {}
+        self.others = []
+        for i, function in enumerate(self.functions):
+            if type(function) in self._PARAMETERS:
+                grouped.setdefault(type(function), []).append(i)
+            else:
+                self.others.append(i)
+
+        self.groups = {
+            kind: (np.array(indices), [
+                np.array([getattr(self.functions[i], name) for i in indices], dtype=float)
+                for name in self._PARAMETERS[kind]
+            ])
+            for kind, indices in grouped.items()
+        }
@@ -0,0 +1,374 @@
+"""
+Persisting fuzzy systems. System definition - variables, membership functions, rules,
+logic and defuzzification - is stored as versioned, human-readable JSON document.
+Compiled engines are stored in binary form (see `yvain.shared`) and cached on disk
+under content hash of the definition, so restart of a service can skip building
+and compiling the system.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from yvain.fuzzy_set import Centroid, Simpson, AdaptiveSimpson, Bisector, MeanOfMaxima, \
+    SmallestOfMaxima, LargestOfMaxima, WeightedAverage, SampledCentroid, DefuzzificationMethod, \
+    Integrator
+from yvain.fuzzy_system import MamdaniSystem, SugenoSystem, FuzzyRule, Is, And, Or, \
+    Implication, OutputFunction, Linear, FuzzyVariable, MamdaniEngine
+from yvain.logical_systems import LogicalSystem, Zadeh, Drastic, Product, Lukasiewicz, Fodor, \
+    ParametrizedLogicalSystem, Frank, ShweizerSklar, Yager, Dombi
+from yvain.membership_functions import MembershipFunction, Triangle, Trapezoid, Gaussian, Bell, \
+    Sigmoid, PiecewiseLinear, Tabulated
+from yvain.shared import export_shared, attach_shared, SharedModel
+
+FORMAT_VERSION = 1
+
+System = Union[MamdaniSystem, SugenoSystem]
+Definition = Dict[str, Any]
+
+_MEMBERSHIP_FUNCTIONS = {
+    kind.__name__: (kind, parameters) for kind, parameters in [
+        (Triangle, ("a", "b", "c")),
+        (Trapezoid, ("a", "b", "c", "d")),
+        (Gaussian, ("mu", "sigma")),
+        (Bell, ("mu", "sigma", "gamma")),
+        (Sigmoid, ("a", "b")),
+    ]
+}
+_LOGICS = {
+    logic.__name__: logic for logic in
+    [Zadeh, Drastic, Product, Lukasiewicz, Fodor, Frank, ShweizerSklar, Yager, Dombi]
+}
+_SAMPLED_DEFUZZIFICATIONS = {
+    method.__name__: method for method in
+    [Bisector, MeanOfMaxima, SmallestOfMaxima, LargestOfMaxima, WeightedAverage, SampledCentroid]
+}
+
+
+def to_definition(system: System) -> Definition:
+    """
+    :param system: Mamdani or Sugeno system
+    :raise ValueError: When system uses membership function, output function, logic or
+                       defuzzification method which cannot be serialized, e.g. python lambda
+    :return: JSON-compatible definition of the system
+    """
+
+    definition = {
+        "format": "yvain",
+        "version": FORMAT_VERSION,
+        "type": "mamdani" if isinstance(system, MamdaniSystem) else "sugeno",
+        "logic": _logic_to_definition(system.logic),
+        "inputs": _variables_to_definition(system.inputs),
+    }
+
+    if isinstance(system, MamdaniSystem):
+        definition.update({
+            "outputs": _variables_to_definition(system.outputs),
+            "defuzzification": _defuzzification_to_definition(system.defuzzify),
+            "additive": system.additive,
+            "rules": [{
+                "if": _rule_to_definition(implication.rule),
+                "then": [implication.variable_name, implication.variable_state]
+            } for implication in system.rule_set]
+        })
+    else:
+        rules = []
+        for rule in system.rule_set:
+            if not isinstance(rule.output_function, Linear):
+                raise ValueError(
+                    f"Only Linear output functions can be serialized, got {rule.output_function!r}")
+            rules.append({
+                "if": _rule_to_definition(rule.rule),
+                "compute": {
+                    "constant": float(rule.output_function.constant),
+                    "coefficients": {name: float(coefficient) for name, coefficient
+                                     in rule.output_function.coefficients.items()}
+                }
+            })
+        definition["rules"] = rules
+
+    return definition
+
+
+def from_definition(definition: Definition) -> System:
+    """
+    :param definition: Definition created by `to_definition`
+    :raise ValueError: When definition is malformed or written in newer version of the format
+    :return: Mamdani or Sugeno system
+    """
+
+    try:
+        return _system_from_definition(definition)
+    except (KeyError, IndexError, TypeError, AttributeError) as error:
+        raise ValueError(f"Definition is malformed: {type(error).__name__} {error}") from error
+
+
+def _system_from_definition(definition: Definition) -> System:
+    if definition.get("format") != "yvain":
+        raise ValueError("Definition is not yvain fuzzy system")
+    if not isinstance(definition.get("version"), int) or definition["version"] > FORMAT_VERSION:
+        raise ValueError(
+            f"Definition version {definition.get('version')} is not supported, "
+            f"the newest supported is {FORMAT_VERSION}")
+
+    logic = _logic_from_definition(definition["logic"])
+    if definition["type"] == "mamdani":
+        system = MamdaniSystem({}, {}, [], logic,
+                               _defuzzification_from_definition(definition["defuzzification"]),
+                               additive=definition["additive"])
+        for name, memberships in definition["outputs"].items():
+            system.add_output(name, _memberships_from_definition(memberships))
+        for rule in definition["rules"]:
+            system.add_rule(Implication(_rule_from_definition(rule["if"]), *rule["then"]))
+    elif definition["type"] == "sugeno":
+        system = SugenoSystem.empty(logic)
+        for rule in definition["rules"]:
+            system.add_rule(OutputFunction(
+                _rule_from_definition(rule["if"]),
+                Linear(rule["compute"]["constant"], rule["compute"]["coefficients"])))
+    else:
+        raise ValueError(f"Unknown system type {definition['type']}")
+
+    for name, memberships in definition["inputs"].items():
+        system.add_input(name, _memberships_from_definition(memberships))
+
+    return system
+
+
+def save(system: System, path: str):
+    """
+    :param system: Mamdani or Sugeno system
+    :param path: JSON file to which definition is written
+    :raise ValueError: When system cannot be serialized
+    """
+
+    with open(path, "w") as file:
+        json.dump(to_definition(system), file, indent=2)
+
+
+def load(path: str) -> System:
+    """
+    :param path: JSON file written by `save`
+    :raise ValueError: When file does not contain supported definition
+    :return: Mamdani or Sugeno system
+    """
+
+    with open(path) as file:
+        return from_definition(json.load(file))
+
+
+def definition_hash(definition: Definition) -> str:
+    """
+    :param definition: System definition
+    :return: SHA-256 of canonical JSON form of the definition
+    """
+
+    canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def compile_cached(system: Union[System, Definition], directory: str,
+                   universes: Sequence[Tuple[float, float]] = ()) -> SharedModel:
+    """
+    Compile system or load engine compiled earlier. Engine is cached in `directory`
+    under hash of system definition and of the library (its source, format version,
+    numpy version and pickle protocol), so any change of the system or library
+    invalidates it. Cached engine is memory-mapped - its arrays are read-only and
+    shared by all processes loading the same file.
+
+    Mamdani engine is prepared for given output universes before it's cached, so
+    sampled consequents are loaded together with it. Without universes only compiled
+    structure is cached and tables are computed by each process on first run.
+
+    Loading cached engine unpickles it, so `directory` has to be trusted - writable
+    only by the service itself.
+
+    :param system: System or its definition. When definition is given and engine is
+                   already cached, system is not built at all
+    :param directory: Directory of cached engines, created when missing
+    :param universes: Output universes of Mamdani system which tables are cached, part of
+                      cache key. Ignored for Sugeno system
+    :raise ValueError: When system cannot be serialized or definition is malformed
+    :raise InvalidRuleError: When rule refers to unknown variable or state
+    :return: Handle of memory-mapped engine, engine itself is its `model`
+    """
+
+    definition = system if isinstance(system, dict) else to_definition(system)
+    universes = sorted({(float(start), float(end)) for start, end in universes})
+    key = hashlib.sha256(
+        (definition_hash(definition) + _library_tag() + json.dumps(universes)).encode()
+    ).hexdigest()
+    path = os.path.join(directory, f"{key}.engine")
+
+    if not os.path.exists(path):
+        if isinstance(system, dict):
+            system = from_definition(definition)
+        engine = system.compile()
+        if isinstance(engine, MamdaniEngine):
+            for universe in universes:
+                engine.prepare(universe)
+
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(descriptor)
+        try:
+            export_shared(engine, path=temporary).close()
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    return attach_shared(path=path)
+
+
+@lru_cache(maxsize=None)
+def _library_tag() -> str:
+    """
+    :return: Identifier of library code and environment which cached engines depend on
+    """
+
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            with open(os.path.join(directory, name), "rb") as file:
+                digest.update(name.encode() + b"\0" + file.read())
+
+    return f"format{FORMAT_VERSION}-numpy{np.__version__}-pickle{pickle.HIGHEST_PROTOCOL}-" \
+           f"{digest.hexdigest()}"
+
+
+def _variables_to_definition(variables: Dict[str, FuzzyVariable]) -> Definition:
+    return {
+        name: {
+            state: _membership_to_definition(fuzzy_set.membership_function)
+            for state, fuzzy_set in variable.fuzzy_set.items()
+        }
+        for name, variable in variables.items()
+    }
+
+
+def _memberships_from_definition(memberships: Definition) -> Dict[str, MembershipFunction]:
+    return {state: _membership_from_definition(membership)
+            for state, membership in memberships.items()}
+
+
+def _membership_to_definition(membership: MembershipFunction) -> Definition:
+    if isinstance(membership, PiecewiseLinear):
+        return {"type": "PiecewiseLinear", "xs": list(membership.xs), "ys": list(membership.ys)}
+    if isinstance(membership, Tabulated):
+        return {"type": "Tabulated",
+                "function": _membership_to_definition(membership.function),
+                "start": float(membership.start), "end": float(membership.end),
+                "resolution": len(membership.table)}
+
+    kind = type(membership).__name__
+    if _MEMBERSHIP_FUNCTIONS.get(kind, (None,))[0] is not type(membership):
+        raise ValueError(f"Membership function {membership!r} cannot be serialized")
+
+    definition = {"type": kind}
+    for parameter in _MEMBERSHIP_FUNCTIONS[kind][1]:
+        definition[parameter] = float(getattr(membership, parameter))
+    return definition
+
+
+def _membership_from_definition(definition: Definition) -> MembershipFunction:
+    kind = definition["type"]
+    if kind == "PiecewiseLinear":
+        return PiecewiseLinear(definition["xs"], definition["ys"])
+    if kind == "Tabulated":
+        return Tabulated(_membership_from_definition(definition["function"]),
+                         definition["start"], definition["end"], definition["resolution"])
+    if kind not in _MEMBERSHIP_FUNCTIONS:
+        raise ValueError(f"Unknown membership function {kind}")
+
+    membership, parameters = _MEMBERSHIP_FUNCTIONS[kind]
+    return membership(*[definition[parameter] for parameter in parameters])
+
+
+def _rule_to_definition(rule: FuzzyRule) -> Definition:
+    if isinstance(rule, Is):
+        return {"is": [rule.variable_name, rule.variable_state]}
+    if isinstance(rule, (And, Or)):
+        return {"and" if isinstance(rule, And) else "or": [
+            _rule_to_definition(operand) for operand in rule.operands()]}
+
+    raise ValueError(f"Rule {rule!r} cannot be serialized")
+
+
+def _rule_from_definition(definition: Definition) -> FuzzyRule:
+    if "is" in definition:
+        return Is(*definition["is"])
+
+    operation = And if "and" in definition else Or
+    operands = [_rule_from_definition(operand)
+                for operand in definition["and" if operation is And else "or"]]
+    rule = operands[0]
+    for operand in operands[1:]:
+        rule = operation(rule, operand)
+    return rule
+
+
+def _logic_to_definition(logic: LogicalSystem) -> Definition:
+    if _LOGICS.get(type(logic).__name__) is not type(logic):
+        raise ValueError(f"Logical system {logic!r} cannot be serialized")
+
+    if isinstance(logic, ParametrizedLogicalSystem):
+        return {"type": type(logic).__name__, "p": float(logic.p)}
+    return {"type": type(logic).__name__}
+
+
+def _logic_from_definition(definition: Definition) -> LogicalSystem:
+    logic = _LOGICS.get(definition["type"])
+    if logic is None:
+        raise ValueError(f"Unknown logical system {definition['type']}")
+
+    if issubclass(logic, ParametrizedLogicalSystem):
+        return logic(definition["p"])
+    return logic()
+
+
+def _defuzzification_to_definition(method: DefuzzificationMethod) -> Definition:
+    if type(method) is Centroid:
+        return {"type": "Centroid", "integrator": _integrator_to_definition(method.integrator)}
+    if _SAMPLED_DEFUZZIFICATIONS.get(type(method).__name__) is type(method):
+        return {"type": type(method).__name__, "grid": _integrator_to_definition(method.grid)}
+
+    raise ValueError(f"Defuzzification method {method!r} cannot be serialized")
+
+
+def _defuzzification_from_definition(definition: Definition) -> DefuzzificationMethod:
+    kind = definition["type"]
+    if kind == "Centroid":
+        return Centroid(_integrator_from_definition(definition["integrator"]))
+    if kind in _SAMPLED_DEFUZZIFICATIONS:
+        return _SAMPLED_DEFUZZIFICATIONS[kind](_integrator_from_definition(definition["grid"]))
+
+    raise ValueError(f"Unknown defuzzification method {kind}")
+
+
+def _integrator_to_definition(integrator: Integrator) -> Definition:
+    if type(integrator) is Simpson:
+        return {"type": "Simpson", "n": integrator.n, "per_unit": integrator.per_unit}
+    if type(integrator) is AdaptiveSimpson:
+        return {"type": "AdaptiveSimpson", "tolerance": integrator.tolerance,
+                "initial_intervals": integrator.initial_intervals,
+                "max_depth": integrator.max_depth}
+
+    raise ValueError(f"Integrator {integrator!r} cannot be serialized")
+
+
+def _integrator_from_definition(definition: Definition) -> Integrator:
+    if definition["type"] == "Simpson":
+        return Simpson(definition["n"], definition["per_unit"])
+    if definition["type"] == "AdaptiveSimpson":
+        return AdaptiveSimpson(definition["tolerance"], definition["initial_intervals"],
+                               definition["max_depth"])
+
+    raise ValueError(f"Unknown integrator {definition['type']}")
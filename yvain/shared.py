@@ -0,0 +1,231 @@
+"""
+Sharing compiled models between processes. Model (e.g. compiled engine or control
+surface) is stored in single shared memory block or file: object structure is
+pickled, while numpy arrays (sampled consequents, coefficients, lookup tables) are
+stored next to it as raw data. Processes attaching to the model read arrays straight
+from shared memory - they'r not copied and cannot be modified.
+"""
+
+import io
+import json
+import mmap
+import pickle
+import sys
+from array import array
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+_ALIGNMENT = 64
+
+if shared_memory is not None:
+    class _SharedMemory(shared_memory.SharedMemory):
+        """
+        Shared memory block which mapping is not unmapped while arrays view it
+        """
+
+        def close(self):
+            try:
+                super().close()
+            except BufferError:
+                # Mapping is owned by arrays viewing it, it's unmapped with the last of them
+                self._mmap = None
+                super().close()
+
+
+class SharedModel:
+    """
+    Handle of model stored in shared memory block or memory-mapped file. Arrays of
+    `model` are views of shared memory and keep the mapping alive on they'r own, so
+    model can be used after handle is dropped or closed.
+    """
+
+    def close(self):
+        """
+        Detach handle from shared memory. While arrays of model are still referenced
+        the mapping is kept, it's released together with the last of them.
+        """
+
+        self.model = None
+        if isinstance(self._memory, mmap.mmap):
+            self._buffer.release()
+            try:
+                self._memory.close()
+            except BufferError:
+                pass
+        else:
+            self._memory.close()
+        self._buffer = None
+
+    def unlink(self):
+        """
+        Destroy shared memory block, should be called once, by process which exported model.
+        Memory-mapped file is left untouched.
+        """
+
+        if not isinstance(self._memory, mmap.mmap):
+            self._memory.unlink()
+
+    def __init__(self, model: Any, name: str, memory, buffer: memoryview):
+        """
+        :param model: Model which arrays are views of shared memory
+        :param name: Name of shared memory block or path of file
+        :param memory: Shared memory block or memory map
+        :param buffer: Buffer of shared memory
+        """
+
+        self.model = model
+        self.name = name
+        self._memory = memory
+        self._buffer = buffer
+
+
+def export_shared(model: Any, path: Optional[str] = None, min_size: int = 1024) -> SharedModel:
+    """
+    Store model in new shared memory block or, when `path` is given, in file which
+    other processes can memory-map.
+
+    :param model: Picklable model, e.g. compiled engine. Lazily computed tables
+                  should be computed before export, see `MamdaniEngine.prepare`
+    :param path: File in which model is stored, shared memory block is created when missing
+    :param min_size: Arrays smaller than this number of bytes are pickled together with model
+    :raise RuntimeError: When shared memory is not supported
+    :return: Handle of exported model, its `name` is used to attach to it
+    """
+
+    arrays: List[np.ndarray] = []
+    positions = {}
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj: Any) -> Optional[Tuple[str, int]]:
+            if isinstance(obj, array) and obj.typecode == "d":
+                obj_array = np.frombuffer(obj)
+            elif isinstance(obj, np.ndarray) and obj.dtype != object:
+                obj_array = obj
+            else:
+                return None
+            if obj_array.nbytes < min_size:
+                return None
+
+            if id(obj) not in positions:
+                positions[id(obj)] = len(arrays)
+                arrays.append(np.ascontiguousarray(obj_array))
+            return "array", positions[id(obj)]
+
+    pickled = io.BytesIO()
+    _Pickler(pickled, pickle.HIGHEST_PROTOCOL).dump(model)
+    pickled = pickled.getvalue()
+
+    offset = 0
+    blocks = []
+    for length in [len(pickled)] + [table.nbytes for table in arrays]:
+        blocks.append(offset)
+        offset = _aligned(offset + length)
+    header = json.dumps({
+        "pickle": [blocks[0], len(pickled)],
+        "arrays": [[start, table.dtype.str, list(table.shape)]
+                   for start, table in zip(blocks[1:], arrays)]
+    }).encode()
+    data_start = _aligned(8 + len(header))
+    size = data_start + max(offset, 1)
+
+    if path is None:
+        _validate_shared_memory()
+        memory = _SharedMemory(create=True, size=size)
+        buffer = memory.buf
+        name = memory.name
+    else:
+        with open(path, "wb") as file:
+            file.truncate(size)
+        with open(path, "r+b") as file:
+            memory = mmap.mmap(file.fileno(), size)
+        buffer = memoryview(memory)
+        name = path
+
+    buffer[:8] = len(header).to_bytes(8, "little")
+    buffer[8:8 + len(header)] = header
+    buffer[data_start:data_start + len(pickled)] = pickled
+    for start, table in zip(blocks[1:], arrays):
+        start += data_start
+        buffer[start:start + table.nbytes] = table.reshape(-1).view(np.uint8)
+
+    if path is not None:
+        memory.flush()
+        buffer.release()
+        memory.close()
+        return attach_shared(path=path)
+
+    return _load(memory, name, buffer)
+
+
+def attach_shared(name: Optional[str] = None, path: Optional[str] = None) -> SharedModel:
+    """
+    Attach to model exported by other process.
+
+    :param name: Name of shared memory block
+    :param path: File to which model was exported
+    :raise ValueError: When not exactly one of `name` and `path` is given
+    :raise RuntimeError: When shared memory is not supported
+    :return: Handle of model which arrays are read-only views of shared memory
+    """
+
+    if (name is None) == (path is None):
+        raise ValueError("Exactly one of name and path have to be given")
+
+    if path is not None:
+        with open(path, "rb") as file:
+            memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return _load(memory, path, memoryview(memory))
+
+    _validate_shared_memory()
+    # Attaching process does not own the block, it must not be destroyed when it exits
+    if sys.version_info >= (3, 13):
+        memory = _SharedMemory(name=name, track=False)
+    else:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            memory = _SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+    return _load(memory, name, memory.buf)
+
+
+def _load(memory, name: str, buffer: memoryview) -> SharedModel:
+    """
+    :return: Handle of model unpickled from buffer, with arrays pointing to the buffer
+    """
+
+    header_length = int.from_bytes(buffer[:8], "little")
+    header = json.loads(bytes(buffer[8:8 + header_length]))
+    data_start = _aligned(8 + header_length)
+
+    tables = []
+    for start, dtype, shape in header["arrays"]:
+        dtype = np.dtype(dtype)
+        # Array created from buffer holds it, so the mapping lives as long as the array
+        table = np.frombuffer(buffer, dtype, int(np.prod(shape)), data_start + start).reshape(shape)
+        table.flags.writeable = False
+        tables.append(table)
+
+    class _Unpickler(pickle.Unpickler):
+        def persistent_load(self, pid: Tuple[str, int]) -> np.ndarray:
+            return tables[pid[1]]
+
+    start, length = header["pickle"]
+    pickled = io.BytesIO(buffer[data_start + start:data_start + start + length])
+    return SharedModel(_Unpickler(pickled).load(), name, memory, buffer)
+
+
+def _validate_shared_memory():
+    if shared_memory is None:
+        raise RuntimeError("Shared memory requires Python 3.8 or newer, use file instead")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT